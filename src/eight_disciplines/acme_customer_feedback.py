@@ -1,13 +1,23 @@
 #!/usr/bin/env python3
 import argparse
-from dataclasses import asdict
 import json
 import os
 import sys
-from datetime import datetime, timezone
-from typing import Dict, Optional
+from typing import Dict, Iterable, Iterator, Optional, TextIO
 
+from eight_disciplines.dedup import FeedbackDeduplicator, open_deduplicator
+from eight_disciplines.defaults_store import open_defaults_store
+from eight_disciplines.eventlog import FeedbackEventLog
 from eight_disciplines.reportgenerator import ReportGenerator, is_issue_complete
+from eight_disciplines.segments import open_event_log
+from eight_disciplines.snapshots import (
+    NO_ISSUE_KEY_ERROR,
+    ReportSnapshotStore,
+    has_transitions,
+    issue_key,
+    render_delta,
+    snapshot_db_from_env,
+)
 from eight_disciplines.survey_tools import (
     CustomerFeedback,
     get_customer_contact,
@@ -15,6 +25,9 @@ from eight_disciplines.survey_tools import (
     get_eight_disciplines_inputs,
     get_issue,
 )
+from eight_disciplines.tabular import ROW_FORMATS, StatusRowWriter
+from eight_disciplines.timing import record_timings, span
+from eight_disciplines.workflow import WorkflowGraph
 
 
 class EightDisciplines:
@@ -72,12 +85,14 @@ class EightDisciplines:
         return self.congratulations
 
     def inform_scrum(self):
-        report = self.generate_machine_readable_report()
-        generator = ReportGenerator(report)
-        text = '----------- SCRUM REPORT -------------\n'
-        text += f"{generator.scrum_report()}\n"
-        text += '------- END OF SCRUM REPORT-----------\n'
-        return text
+        return ''.join(self.iter_scrum())
+
+    def iter_scrum(self) -> Iterator[str]:
+        """``inform_scrum()`` as successive fragments."""
+        return ReportGenerator(self.generate_machine_readable_report()).iter_scrum_report(framed=True)
+
+    def write_scrum(self, out: TextIO) -> None:
+        out.writelines(self.iter_scrum())
 
     def generate_machine_readable_report(self) -> Dict[str, Optional[str]]:
         if self.plan is None:
@@ -105,42 +120,58 @@ def parse_args():
     parser = argparse.ArgumentParser(description='8-Disciplines Problem Solving')
     parser.add_argument('--use-defaults', dest='use_defaults', action='store_true')
     parser.add_argument('--non-interactive', action='store_true', help='Skip prompts and run using stored defaults only.')
-    parser.add_argument('--format', choices=['scrum', 'plain', 'json'], default=os.getenv('ACME_OUTPUT_FORMAT', 'scrum'))
-    parser.add_argument('--defaults-file', default=os.getenv('ACME_DEFAULTS_FILE', 'customer_defaults.json'))
-    return parser.parse_args()
+    parser.add_argument(
+        '--format',
+        choices=['scrum', 'plain', 'json', *ROW_FORMATS],
+        default=os.getenv('ACME_OUTPUT_FORMAT', 'scrum'),
+        help='ndjson and csv print flat rows with fixed columns (also for --batch).',
+    )
+    parser.add_argument(
+        '--defaults-file',
+        default=os.getenv('ACME_DEFAULTS_FILE', 'customer_defaults.json'),
+        help='JSON file, or sqlite://PATH?customer=KEY (also issue=ID, email=ADDR) for a shared SQLite store.',
+    )
+    parser.add_argument(
+        '--batch',
+        nargs='?',
+        const='-',
+        default=None,
+        metavar='PATH',
+        help='Evaluate a JSONL stream of defaults documents (PATH or "-" for stdin) and emit one NDJSON result per line '
+        '(or one flat row with --format ndjson/csv).',
+    )
+    parser.add_argument(
+        '--timings',
+        nargs='?',
+        const='-',
+        default=os.getenv('ACME_TIMINGS') or None,
+        metavar='PATH',
+        help='Dump per-stage wall/CPU time as JSON to PATH (or stderr for "-"); also ACME_TIMINGS.',
+    )
+    parser.add_argument(
+        '--delta',
+        nargs='?',
+        const=snapshot_db_from_env(),
+        default=None,
+        metavar='PATH',
+        help='Print only the step transitions since the last --delta run of the same issue; snapshots are kept in '
+        'the SQLite database PATH (default: ACME_REPORT_SNAPSHOTS or report_snapshots.db). Also for --batch.',
+    )
+    args = parser.parse_args()
+    if args.delta and args.format == 'csv':
+        parser.error('--delta has no csv form; use --format ndjson or json')
+    return args
 
 
 def load_defaults(defaults_file):
-    if os.path.exists(defaults_file):
-        with open(defaults_file, 'r', encoding='utf-8') as file:
-            defaults = json.load(file)
-    else:
-        defaults = {
-            'name': None,
-            'phone_number': None,
-            'email': None,
-            'feedback': None,
-            'what_happened': None,
-            'when_happened': None,
-            'where_happened': None,
-            'expecting_to_happen': None,
-            'resolution_request': None,
-            'plan': None,
-            'prerequisites': None,
-            'team': None,
-            'problem_description': None,
-            'interim_containment_plan': None,
-            'root_causes': None,
-            'permanent_corrections': None,
-            'corrective_actions': None,
-            'preventive_measures': None,
-        }
-    return defaults
+    with open_defaults_store(defaults_file) as store:
+        return store.load()
 
 
-def save_defaults(defaults, defaults_file):
-    with open(defaults_file, 'w', encoding='utf-8') as file:
-        json.dump(defaults, file)
+def save_defaults(defaults, defaults_file, base=None):
+    """Save ``defaults``; with ``base`` (the loaded document) concurrent saves are merged."""
+    with open_defaults_store(defaults_file) as store:
+        store.save(defaults, base)
 
 
 def _has_issue_details(issue: Dict[str, Optional[str]]) -> bool:
@@ -168,6 +199,10 @@ def step_prereqs() -> Dict[str, list[str]]:
     }
 
 
+def workflow_graph() -> WorkflowGraph:
+    return WorkflowGraph(step_order(EightDisciplines(None)), step_prereqs())
+
+
 def ordered(steps: list[str], order: list[str]) -> list[str]:
     idx = {k: i for i, k in enumerate(order)}
     return sorted(steps, key=lambda s: idx.get(s, 10**9))
@@ -199,8 +234,196 @@ def compute_workflow_status(report: Dict[str, object], order: list[str], prereqs
     }
 
 
+def build_eight_disciplines(issue: Dict[str, Optional[str]], eight_d_data) -> EightDisciplines:
+    eight_d = EightDisciplines(issue)
+    eight_d.plan_solving_problem(eight_d_data.plan, eight_d_data.prerequisites)
+    eight_d.use_team(eight_d_data.team)
+    eight_d.define_problem(eight_d_data.problem_description)
+    eight_d.develop_interim_containment_plan(eight_d_data.interim_containment_plan)
+    eight_d.determine_root_causes(eight_d_data.root_causes)
+    eight_d.choose_permanent_corrections(eight_d_data.permanent_corrections)
+    eight_d.implement_corrective_actions(eight_d_data.corrective_actions)
+    eight_d.take_preventive_measures(eight_d_data.preventive_measures)
+    return eight_d
+
+
+def status_payload(feedback_submitted: bool, report: Dict[str, object], status: Dict[str, object]) -> Dict[str, object]:
+    return {
+        'feedback_submitted': feedback_submitted,
+        'report': report,
+        'done_steps': status['done'],
+        'missing_steps': status['missing'],
+        'available_steps': status['available'],
+        'blocked_steps': status['blocked'],
+        'doing_step': status['doing'],
+    }
+
+
+def evaluate_defaults(defaults: dict, order: Optional[list[str]] = None, prereqs: Optional[Dict[str, list[str]]] = None):
+    """Run the non-interactive pipeline for one defaults document.
+
+    Returns the same document that ``--format json`` prints. Nothing is
+    logged or saved; callers decide what to persist.
+    """
+    issue, report, status = _evaluate(defaults, order, prereqs)
+    return status_payload(_has_issue_details(issue), report, status)
+
+
+def _evaluate(defaults: dict, order: Optional[list[str]], prereqs: Optional[Dict[str, list[str]]]):
+    with span('build_report'):
+        issue = get_issue(defaults)
+        _, eight_d_data = get_eight_disciplines_inputs(defaults, interactive=False)
+        eight_d = build_eight_disciplines(issue, eight_d_data)
+        report = eight_d.generate_machine_readable_report()
+    if order is None:
+        order = step_order(eight_d)
+    if prereqs is None:
+        prereqs = step_prereqs()
+    with span('compute_workflow_status'):
+        status = compute_workflow_status(report, order, prereqs)
+    return issue, report, status
+
+
+def iter_batch_results(lines: Iterable[str]) -> Iterator[Dict[str, object]]:
+    """Evaluate a JSONL stream of defaults documents lazily, one result per input line.
+
+    Blank lines are skipped. Lines that are not a JSON object yield an
+    ``{'line': n, 'error': ...}`` record instead of aborting the stream.
+    """
+    order = step_order(EightDisciplines(None))
+    prereqs = step_prereqs()
+    for _, defaults, error in _iter_batch_documents(lines):
+        yield error if error is not None else evaluate_defaults(defaults, order, prereqs)
+
+
+def _iter_batch_documents(lines: Iterable[str]) -> Iterator[tuple]:
+    """``(line_no, defaults, None)`` for every usable input line, ``(line_no, None, error record)`` for the others."""
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            with span('batch.parse'):
+                defaults = json.loads(line)
+        except ValueError as exc:
+            yield line_no, None, {'line': line_no, 'error': f'invalid JSON: {exc}'}
+            continue
+        if not isinstance(defaults, dict):
+            yield line_no, None, {'line': line_no, 'error': 'expected a JSON object'}
+            continue
+        yield line_no, defaults, None
+
+
+def run_batch(
+    source: TextIO,
+    out: TextIO,
+    chunk_size: int = 512,
+    row_format: Optional[str] = None,
+    errors: Optional[TextIO] = None,
+    snapshots: Optional[ReportSnapshotStore] = None,
+) -> int:
+    """
+    Write the result of every input line to ``out``. With ``row_format``
+    (``ndjson`` or ``csv``) results are written as flat rows and error
+    records go to ``errors`` (default stderr) so every output row has the
+    same columns. With ``snapshots`` only the deltas of issues that changed
+    since their last snapshot are written (one compact JSON line each).
+    Returns the number of input records.
+    """
+    if snapshots is not None:
+        return _run_batch_delta(source, out, chunk_size, snapshots)
+    if row_format is not None:
+        return _run_batch_rows(source, out, chunk_size, row_format, sys.stderr if errors is None else errors)
+    encode = json.JSONEncoder().encode
+    count = 0
+    chunk = []
+    for result in iter_batch_results(source):
+        chunk.append(encode(result))
+        count += 1
+        if len(chunk) >= chunk_size:
+            chunk.append('')
+            with span('batch.write'):
+                out.write('\n'.join(chunk))
+            chunk = []
+    with span('batch.write'):
+        if chunk:
+            chunk.append('')
+            out.write('\n'.join(chunk))
+        out.flush()
+    return count
+
+
+def _run_batch_rows(source: TextIO, out: TextIO, chunk_size: int, row_format: str, errors: TextIO) -> int:
+    writer = StatusRowWriter(out, row_format, step_order(EightDisciplines(None)))
+    count = 0
+    chunk = []
+    for result in iter_batch_results(source):
+        count += 1
+        if 'error' in result:
+            errors.write(json.dumps(result) + '\n')
+            continue
+        chunk.append(result)
+        if len(chunk) >= chunk_size:
+            with span('batch.write'):
+                writer.write_many(chunk)
+            chunk = []
+    with span('batch.write'):
+        writer.write_many(chunk)
+        out.flush()
+    return count
+
+
+def _run_batch_delta(source: TextIO, out: TextIO, chunk_size: int, snapshots: ReportSnapshotStore) -> int:
+    order = step_order(EightDisciplines(None))
+    prereqs = step_prereqs()
+    encode = json.JSONEncoder(separators=(',', ':')).encode
+    count = 0
+    chunk = []
+    for line_no, defaults, record in _iter_batch_documents(source):
+        count += 1
+        if record is None:
+            key = issue_key(defaults)
+            if key is None:
+                record = {'line': line_no, 'error': NO_ISSUE_KEY_ERROR}
+            else:
+                _, report, status = _evaluate(defaults, order, prereqs)
+                with span('snapshot'):
+                    record = snapshots.record(key, report, status)
+                if record is None or not has_transitions(record):
+                    continue
+        chunk.append(encode(record))
+        if len(chunk) >= chunk_size:
+            chunk.append('')
+            with span('batch.write'):
+                out.write('\n'.join(chunk))
+            chunk = []
+    with span('batch.write'):
+        if chunk:
+            chunk.append('')
+            out.write('\n'.join(chunk))
+        out.flush()
+    return count
+
+
+def _run_batch_cli(path: str, row_format: Optional[str] = None, delta: Optional[str] = None) -> int:
+    snapshots = ReportSnapshotStore(delta) if delta else None
+    try:
+        if path == '-':
+            return run_batch(sys.stdin, sys.stdout, row_format=row_format, snapshots=snapshots)
+        with open(path, 'r', encoding='utf-8') as source:
+            return run_batch(source, sys.stdout, row_format=row_format, snapshots=snapshots)
+    finally:
+        if snapshots is not None:
+            snapshots.close()
+
+
 def customer_service_chatbot(args):
-    defaults = load_defaults(args.defaults_file)
+    if getattr(args, 'batch', None):
+        _run_batch_cli(args.batch, args.format if args.format in ROW_FORMATS else None, getattr(args, 'delta', None))
+        return
+
+    with span('load_defaults'):
+        defaults = load_defaults(args.defaults_file)
+    loaded = dict(defaults)
     issue = get_issue(defaults)
     feedback_submitted = False
 
@@ -208,10 +431,11 @@ def customer_service_chatbot(args):
     interactive_mode = not (args.non_interactive or env_non_interactive) and sys.stdin.isatty()
 
     if interactive_mode and not args.use_defaults:
-        defaults = get_customer_contact(defaults)
-        print('How can we help you today?')
-        defaults, feedback_submitted, issue = get_customer_feedback(defaults)
-        defaults, eight_d_data = get_eight_disciplines_inputs(defaults, interactive=True)
+        with span('prompt'):
+            defaults = get_customer_contact(defaults)
+            print('How can we help you today?')
+            defaults, feedback_submitted, issue = get_customer_feedback(defaults)
+            defaults, eight_d_data = get_eight_disciplines_inputs(defaults, interactive=True)
     else:
         # Non-interactive OR explicitly using defaults: never prompt.
         # "feedback_submitted" is derived strictly from stored issue completeness.
@@ -220,35 +444,53 @@ def customer_service_chatbot(args):
 
     if feedback_submitted:
         issue_blob = json.dumps(issue, sort_keys=True)
-        log_feedback(CustomerFeedback(feedback=issue_blob, rating=None))
+        with span('log_feedback'):
+            log_feedback(CustomerFeedback(feedback=issue_blob, rating=None))
 
-    save_defaults(defaults, args.defaults_file)
+    with span('save_defaults'):
+        save_defaults(defaults, args.defaults_file, base=loaded)
 
-    eight_d = EightDisciplines(issue)
-    eight_d.plan_solving_problem(eight_d_data.plan, eight_d_data.prerequisites)
-    eight_d.use_team(eight_d_data.team)
-    eight_d.define_problem(eight_d_data.problem_description)
-    eight_d.develop_interim_containment_plan(eight_d_data.interim_containment_plan)
-    eight_d.determine_root_causes(eight_d_data.root_causes)
-    eight_d.choose_permanent_corrections(eight_d_data.permanent_corrections)
-    eight_d.implement_corrective_actions(eight_d_data.corrective_actions)
-    eight_d.take_preventive_measures(eight_d_data.preventive_measures)
-    report = eight_d.generate_machine_readable_report()
+    with span('build_report'):
+        eight_d = build_eight_disciplines(issue, eight_d_data)
+        report = eight_d.generate_machine_readable_report()
 
     order = step_order(eight_d)
     prereqs = step_prereqs()
-    status = compute_workflow_status(report, order, prereqs)
+    with span('compute_workflow_status'):
+        status = compute_workflow_status(report, order, prereqs)
+
+    if getattr(args, 'delta', None):
+        key = issue_key(defaults)
+        if key is None:
+            # An error, like the --batch error record: scripts must not read it as "no changes".
+            print(f'--delta: {NO_ISSUE_KEY_ERROR}', file=sys.stderr)
+            sys.exit(2)
+        with span('snapshot'):
+            with ReportSnapshotStore(args.delta) as snapshots:
+                delta = snapshots.record(key, report, status)
+        with span('render'):
+            _print_delta(args, delta)
+        return
 
+    with span('render'):
+        _print_outcome(args, eight_d, report, status, prereqs, feedback_submitted)
+
+
+def _print_delta(args, delta) -> None:
+    if args.format in ('json', 'ndjson'):
+        # Unchanged issues print nothing, so consumers only see transitions.
+        if delta is not None and has_transitions(delta):
+            print(json.dumps(delta, separators=(',', ':')))
+        return
+    print(render_delta(delta))
+
+
+def _print_outcome(args, eight_d, report, status, prereqs, feedback_submitted) -> None:
     if args.format == 'json':
-        print(json.dumps({
-            'feedback_submitted': feedback_submitted,
-            'report': report,
-            'done_steps': status['done'],
-            'missing_steps': status['missing'],
-            'available_steps': status['available'],
-            'blocked_steps': status['blocked'],
-            'doing_step': status['doing'],
-        }))
+        print(json.dumps(status_payload(feedback_submitted, report, status)))
+        return
+    if args.format in ROW_FORMATS:
+        StatusRowWriter(sys.stdout, args.format, step_order(eight_d)).write(status_payload(feedback_submitted, report, status))
         return
 
     print('Thank you for choosing our services. We are committed to providing you with the best experience possible!')
@@ -288,21 +530,46 @@ def customer_service_chatbot(args):
         print(eight_d.congratulate_team())
 
 
-def log_feedback(feedback: CustomerFeedback):
-    log_path = os.getenv('ACME_FEEDBACK_LOG', 'feedback_events.jsonl')
-    payload = {
-        'timestamp': datetime.now(timezone.utc).isoformat(),
-        'event': 'customer_feedback_submitted',
-        'feedback': asdict(feedback),
-    }
-    with open(log_path, 'a', encoding='utf-8') as log_file:
-        log_file.write(json.dumps(payload, sort_keys=True) + '\n')
+def log_feedback(
+    feedback: CustomerFeedback,
+    event_log: Optional[FeedbackEventLog] = None,
+    dedup: Optional[FeedbackDeduplicator] = None,
+) -> bool:
+    """
+    Append ``feedback`` to the event log; False when it was suppressed as a
+    repeat. The deduplicator reserves the submission before the write and
+    releases it if ``event_log.log`` raises, so a failed write is retried by
+    the next submission. A buffered ``event_log`` only queues the record; a
+    failure when that batch is flushed later does not release it.
+    """
+    if dedup is None:
+        one_shot_dedup = open_deduplicator()
+        if one_shot_dedup is not None:
+            with one_shot_dedup:
+                return log_feedback(feedback, event_log, one_shot_dedup)
+    reservation = None
+    if dedup is not None:
+        reservation = dedup.reserve(feedback)
+        if reservation is None:
+            return False
+    try:
+        if event_log is not None:
+            event_log.log(feedback)
+        else:
+            with open_event_log(batch_size=1) as one_shot:
+                one_shot.log(feedback)
+    except BaseException:
+        if reservation is not None:
+            dedup.release(reservation)
+        raise
+    return True
 
 
 def main():
     args = parse_args()
     try:
-        customer_service_chatbot(args)
+        with record_timings(args.timings):
+            customer_service_chatbot(args)
     except KeyboardInterrupt:
         print('\nAborted by user.')
         raise SystemExit(130)
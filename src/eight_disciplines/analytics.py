@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Single-pass portfolio analytics over the feedback event log and report streams.
+
+Memory is bounded by the number of steps and the sketch size, not by the
+input: every record is folded into counters and quantile sketches and then
+dropped. Each record counts as one issue snapshot; repeated snapshots of the
+same issue are not de-duplicated, since that would need per-issue state.
+
+    python -m eight_disciplines.analytics --events feedback_events.jsonl
+    python -m eight_disciplines.analytics --reports results.jsonl --now 2025-06-01T00:00
+"""
+import argparse
+import json
+import math
+import os
+import sys
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional, TextIO
+
+from eight_disciplines.acme_customer_feedback import workflow_graph
+from eight_disciplines.binformat import is_binary, iter_records
+from eight_disciplines.eventlog import parse_timestamp
+from eight_disciplines.reportgenerator import ISSUE_REQUIRED_FIELDS
+from eight_disciplines.segments import iter_segment_events
+from eight_disciplines.workflow import WorkflowGraph
+
+DONE_STAGE = 'complete'
+BLOCKED_STAGE = 'blocked'
+
+
+class QuantileSketch:
+    """
+    DDSketch-style quantile sketch: values fall into logarithmic buckets so
+    every quantile is within ``relative_accuracy`` of a true sample value.
+    When more than ``max_bins`` buckets are in use the lowest ones are merged,
+    which only costs accuracy at the low tail.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError('relative_accuracy must be between 0 and 1')
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        if value < 0:
+            raise ValueError('QuantileSketch only accepts non-negative values')
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if value == 0:
+            self.zeros += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[key] = self.bins.get(key, 0) + 1
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def _collapse(self) -> None:
+        keys = sorted(self.bins)
+        overflow = keys[:len(keys) - self.max_bins + 1]
+        target = keys[len(overflow)]
+        self.bins[target] += sum(self.bins.pop(key) for key in overflow)
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        if other.gamma != self.gamma:
+            raise ValueError('cannot merge sketches with different accuracy')
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+        self.total += other.total
+        for bound in (other.min, other.max):
+            if bound is not None:
+                self.min = bound if self.min is None else min(self.min, bound)
+                self.max = bound if self.max is None else max(self.max, bound)
+        while len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not 0 <= q <= 1:
+            raise ValueError('q must be between 0 and 1')
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if rank < seen:
+                estimate = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def summary(self, quantiles=(0.5, 0.9, 0.99)) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else None,
+            'min': self.min,
+            'max': self.max,
+        }
+        for q in quantiles:
+            result[f'p{round(q * 100):d}'] = self.quantile(q)
+        return result
+
+
+def report_from_event(event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    The report carried by a logged feedback event, if any. The CLI and daemon
+    log the issue dict as the feedback text, which becomes ``{'issue': ...}``;
+    a full report or ``--format json`` document is used as is.
+    """
+    feedback = event.get('feedback')
+    text = feedback.get('feedback') if isinstance(feedback, dict) else None
+    if not isinstance(text, str) or not text.startswith('{'):
+        return None
+    try:
+        document = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(document, dict):
+        return None
+    if isinstance(document.get('report'), dict):
+        return document['report']
+    if 'issue' in document:
+        return document
+    if any(field in document for field in ISSUE_REQUIRED_FIELDS):
+        return {'issue': document}
+    return None
+
+
+class PortfolioAggregator:
+    """
+    Fold reports and events into per-step counts, a histogram of blocking
+    prerequisites and per-stage age sketches.
+
+    A report's stage is its ``doing`` step, ``'blocked'`` when steps are
+    missing but none is available, or ``'complete'``. Status follows
+    ``compute_workflow_status``, evaluated through the graph's bitmasks.
+    """
+
+    COUNTS = ('done', 'missing', 'available', 'blocked', 'doing')
+
+    def __init__(self, graph: Optional[WorkflowGraph] = None, *, now: Optional[datetime] = None, relative_accuracy: float = 0.01):
+        self.graph = graph or workflow_graph()
+        self.now = now or datetime.now(timezone.utc)
+        self.relative_accuracy = relative_accuracy
+        self.reports = 0
+        # Reports are tallied per distinct (done, present) bit pair and only
+        # expanded into per-step counts in summary(); real portfolios show a
+        # few hundred distinct pairs at most.
+        self.progress: Counter = Counter()
+        self.events: Counter = Counter()
+        self.invalid_lines = 0
+        self.ratings = QuantileSketch(relative_accuracy)
+        self.age_by_stage: Dict[str, QuantileSketch] = {}
+        self._stage_cache: Dict[tuple, str] = {}
+
+    def _stage(self, key: tuple) -> str:
+        stage = self._stage_cache.get(key)
+        if stage is None:
+            missing, _, _, doing = self.graph.status_masks(*key)
+            if doing:
+                stage = self.graph.steps[doing.bit_length() - 1]
+            else:
+                stage = BLOCKED_STAGE if missing else DONE_STAGE
+            self._stage_cache[key] = stage
+        return stage
+
+    def add_report(self, report: Dict[str, Any], timestamp: Any = None) -> None:
+        graph = self.graph
+        key = (graph.encode(report), graph.present_mask(report))
+        self.progress[key] += 1
+        self.reports += 1
+        if timestamp is not None:
+            try:
+                age = (self.now - parse_timestamp(timestamp)).total_seconds()
+            except (TypeError, ValueError):
+                return
+            stage = self._stage(key)
+            sketch = self.age_by_stage.get(stage)
+            if sketch is None:
+                sketch = self.age_by_stage[stage] = QuantileSketch(self.relative_accuracy)
+            sketch.add(max(age, 0.0))
+
+    def add_event(self, event: Dict[str, Any]) -> None:
+        self.events[event.get('event')] += 1
+        feedback = event.get('feedback')
+        rating = feedback.get('rating') if isinstance(feedback, dict) else None
+        if isinstance(rating, (int, float)) and not isinstance(rating, bool) and rating >= 0:
+            self.ratings.add(rating)
+        report = report_from_event(event)
+        if report is not None:
+            self.add_report(report, event.get('timestamp'))
+
+    def _consume(self, lines: Iterable[str], add) -> None:
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                self.invalid_lines += 1
+                continue
+            if isinstance(record, dict):
+                add(record)
+            else:
+                self.invalid_lines += 1
+
+    def consume_events(self, lines: Iterable[str]) -> None:
+        """Feed JSONL event-log lines (see eventlog.feedback_event)."""
+        self._consume(lines, self.add_event)
+
+    def consume_event_records(self, records: Iterable[Any]) -> None:
+        """Feed already decoded events, e.g. from ``binformat.iter_records``."""
+        for record in records:
+            if isinstance(record, dict):
+                self.add_event(record)
+            else:
+                self.invalid_lines += 1
+
+    def consume_reports(self, lines: Iterable[str]) -> None:
+        """
+        Feed JSONL report lines: bare reports, or ``--format json``/``--batch``
+        documents whose ``report`` is used. An optional top-level
+        ``timestamp`` dates the snapshot for the age sketches.
+        """
+        def add(record):
+            report = record['report'] if isinstance(record.get('report'), dict) else record
+            self.add_report(report, record.get('timestamp'))
+
+        self._consume(lines, add)
+
+    def _expand(self):
+        graph = self.graph
+        step_counts = {name: [0] * len(graph.steps) for name in self.COUNTS}
+        stages: Counter = Counter()
+        blocked_by: Counter = Counter()
+        for (done, present), n in self.progress.items():
+            missing, available, blocked, doing = graph.status_masks(done, present)
+            for name, mask in (('done', done & present), ('missing', missing), ('available', available), ('blocked', blocked), ('doing', doing)):
+                row = step_counts[name]
+                for step in graph.names(mask):
+                    row[graph.index[step]] += n
+            for step in graph.names(blocked):
+                for req in graph.names(graph.prereq_masks[graph.index[step]] & ~done):
+                    blocked_by[req] += n
+            stages[self._stage((done, present))] += n
+        return step_counts, stages, blocked_by
+
+    def summary(self) -> Dict[str, Any]:
+        step_counts, stages, blocked_by = self._expand()
+        return {
+            'reports': self.reports,
+            'events': dict(self.events),
+            'invalid_lines': self.invalid_lines,
+            'steps': {
+                step: {name: step_counts[name][i] for name in self.COUNTS}
+                for i, step in enumerate(self.graph.steps)
+            },
+            'stages': dict(stages.most_common()),
+            'blocked_by': dict(blocked_by.most_common()),
+            'age_seconds_by_stage': {stage: sketch.summary() for stage, sketch in self.age_by_stage.items()},
+            'ratings': self.ratings.summary(),
+        }
+
+
+def _open_lines(path: str) -> TextIO:
+    if path == '-':
+        return sys.stdin
+    return open(path, 'r', encoding='utf-8')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Stream portfolio statistics from the event log and report files.')
+    parser.add_argument('--events', action='append', default=[], metavar='PATH', help='Feedback event log (JSONL, binary or segment directory); repeatable, - for stdin.')
+    parser.add_argument('--reports', action='append', default=[], metavar='PATH', help='Reports or --batch output (JSONL); repeatable, - for stdin.')
+    parser.add_argument('--now', help='Reference time for ages (ISO-8601, default: current UTC time).')
+    parser.add_argument('--accuracy', type=float, default=0.01, help='Relative accuracy of the quantile sketches.')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.events and not args.reports:
+        raise SystemExit('give at least one --events or --reports input')
+    now = parse_timestamp(args.now) if args.now else None
+    aggregator = PortfolioAggregator(now=now, relative_accuracy=args.accuracy)
+    for paths, consume in ((args.events, aggregator.consume_events), (args.reports, aggregator.consume_reports)):
+        for path in paths:
+            if consume == aggregator.consume_events and path != '-':
+                if os.path.isdir(path):
+                    aggregator.consume_event_records(iter_segment_events(path))
+                    continue
+                if is_binary(path):
+                    aggregator.consume_event_records(iter_records(path))
+                    continue
+            fh = _open_lines(path)
+            try:
+                consume(fh)
+            finally:
+                if fh is not sys.stdin:
+                    fh.close()
+    json.dump(aggregator.summary(), sys.stdout, indent=2)
+    sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the hot paths, on seeded synthetic data.
+
+    python -m eight_disciplines.bench run --scale 10000 --output current.json
+    python -m eight_disciplines.bench compare baseline.json current.json
+"""
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from eight_disciplines.acme_customer_feedback import (
+    EightDisciplines,
+    compute_workflow_status,
+    evaluate_defaults,
+    load_defaults,
+    log_feedback,
+    save_defaults,
+    step_order,
+    step_prereqs,
+)
+from eight_disciplines.binformat import convert_to_binary, iter_records
+from eight_disciplines.eventlog import FeedbackEventLog, encode_event, feedback_event
+from eight_disciplines.reportgenerator import ReportGenerator
+from eight_disciplines.survey_tools import CustomerFeedback
+from eight_disciplines.synthetic import synthetic_defaults, synthetic_reports
+from eight_disciplines.tabular import StatusRowWriter
+
+# Items are generated and timed in chunks so memory stays flat at any scale.
+CHUNK_SIZE = 10_000
+DEFAULT_THRESHOLD = 0.10
+
+
+def _chunks(items: Iterable[Any], size: int = CHUNK_SIZE) -> Iterator[List[Any]]:
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _time_chunks(make_items: Callable[[], Iterable[Any]], op: Callable[[List[Any]], None]) -> float:
+    elapsed = 0.0
+    for chunk in _chunks(make_items()):
+        start = time.perf_counter()
+        op(chunk)
+        elapsed += time.perf_counter() - start
+    return elapsed
+
+
+def bench_compute_workflow_status(scale: int, seed: int, workdir: str) -> float:
+    order = step_order(EightDisciplines(None))
+    prereqs = step_prereqs()
+
+    def op(reports):
+        for report in reports:
+            compute_workflow_status(report, order, prereqs)
+
+    return _time_chunks(lambda: synthetic_reports(scale, seed), op)
+
+
+def bench_scrum_report(scale: int, seed: int, workdir: str) -> float:
+    def op(reports):
+        for report in reports:
+            ReportGenerator(report).scrum_report()
+
+    return _time_chunks(lambda: synthetic_reports(scale, seed), op)
+
+
+def _feedback_items(scale: int, seed: int) -> Iterator[CustomerFeedback]:
+    for defaults in synthetic_defaults(scale, seed):
+        yield CustomerFeedback(feedback=json.dumps(defaults, sort_keys=True), rating=None)
+
+
+def bench_log_feedback(scale: int, seed: int, workdir: str) -> float:
+    os.environ['ACME_FEEDBACK_LOG'] = os.path.join(workdir, 'log_feedback.jsonl')
+
+    def op(items):
+        for feedback in items:
+            log_feedback(feedback)
+
+    return _time_chunks(lambda: _feedback_items(scale, seed), op)
+
+
+def bench_log_feedback_buffered(scale: int, seed: int, workdir: str) -> float:
+    event_log = FeedbackEventLog(os.path.join(workdir, 'buffered.jsonl'), batch_size=256)
+
+    def op(items):
+        for feedback in items:
+            log_feedback(feedback, event_log)
+
+    try:
+        return _time_chunks(lambda: _feedback_items(scale, seed), op)
+    finally:
+        event_log.close()
+
+
+def bench_defaults_roundtrip(scale: int, seed: int, workdir: str) -> float:
+    path = os.path.join(workdir, 'customer_defaults.json')
+
+    def op(documents):
+        for defaults in documents:
+            save_defaults(defaults, path)
+            load_defaults(path)
+
+    return _time_chunks(lambda: synthetic_defaults(scale, seed), op)
+
+
+def _write_event_log(scale: int, seed: int, path: str) -> None:
+    with open(path, 'w', encoding='utf-8') as fh:
+        for feedback in _feedback_items(scale, seed):
+            fh.write(encode_event(feedback_event(feedback)))
+
+
+def _time_decode(path: str) -> float:
+    start = time.perf_counter()
+    for _ in iter_records(path):
+        pass
+    return time.perf_counter() - start
+
+
+def bench_decode_events_json(scale: int, seed: int, workdir: str) -> float:
+    path = os.path.join(workdir, 'decode.jsonl')
+    _write_event_log(scale, seed, path)
+    return _time_decode(path)
+
+
+def bench_decode_events_binary(scale: int, seed: int, workdir: str) -> float:
+    source = os.path.join(workdir, 'decode.jsonl')
+    path = os.path.join(workdir, 'decode.bin')
+    _write_event_log(scale, seed, source)
+    convert_to_binary(source, path)
+    return _time_decode(path)
+
+
+def _bench_rows(row_format: str, scale: int, seed: int, workdir: str) -> float:
+    order = step_order(EightDisciplines(None))
+    prereqs = step_prereqs()
+
+    def payloads():
+        for defaults in synthetic_defaults(scale, seed):
+            yield evaluate_defaults(defaults, order, prereqs)
+
+    with open(os.path.join(workdir, f'rows.{row_format}'), 'w', encoding='utf-8', newline='') as out:
+        writer = StatusRowWriter(out, row_format, order)
+        return _time_chunks(payloads, writer.write_many)
+
+
+def bench_rows_ndjson(scale: int, seed: int, workdir: str) -> float:
+    return _bench_rows('ndjson', scale, seed, workdir)
+
+
+def bench_rows_csv(scale: int, seed: int, workdir: str) -> float:
+    return _bench_rows('csv', scale, seed, workdir)
+
+
+BENCHMARKS: Dict[str, Callable[[int, int, str], float]] = {
+    'compute_workflow_status': bench_compute_workflow_status,
+    'scrum_report': bench_scrum_report,
+    'log_feedback': bench_log_feedback,
+    'log_feedback_buffered': bench_log_feedback_buffered,
+    'defaults_roundtrip': bench_defaults_roundtrip,
+    'decode_events_json': bench_decode_events_json,
+    'decode_events_binary': bench_decode_events_binary,
+    'rows_ndjson': bench_rows_ndjson,
+    'rows_csv': bench_rows_csv,
+}
+
+
+def run_benchmarks(
+    scale: int = 1000,
+    *,
+    seed: int = 0,
+    repeat: int = 3,
+    names: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Run each benchmark ``repeat`` times and keep the fastest run."""
+    results = {}
+    previous_log = os.environ.get('ACME_FEEDBACK_LOG')
+    try:
+        for name in names or list(BENCHMARKS):
+            timings = []
+            for _ in range(repeat):
+                with tempfile.TemporaryDirectory() as workdir:
+                    timings.append(BENCHMARKS[name](scale, seed, workdir))
+            best = min(timings)
+            results[name] = {
+                'n': scale,
+                'seconds': best,
+                'per_op_us': best / scale * 1e6,
+                'ops_per_sec': scale / best if best else None,
+            }
+    finally:
+        if previous_log is None:
+            os.environ.pop('ACME_FEEDBACK_LOG', None)
+        else:
+            os.environ['ACME_FEEDBACK_LOG'] = previous_log
+    return {
+        'meta': {
+            'scale': scale,
+            'seed': seed,
+            'repeat': repeat,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Per-benchmark comparison of ``per_op_us``. An entry is a regression when
+    the current run is slower than the baseline by more than ``threshold``
+    (a fraction, 0.10 = 10%).
+    """
+    rows = []
+    for name, base in baseline['results'].items():
+        cur = current['results'].get(name)
+        if cur is None:
+            continue
+        change = cur['per_op_us'] / base['per_op_us'] - 1 if base['per_op_us'] else 0.0
+        rows.append({
+            'name': name,
+            'baseline_us': base['per_op_us'],
+            'current_us': cur['per_op_us'],
+            'change': change,
+            'regression': change > threshold,
+        })
+    return rows
+
+
+def _load(path: str) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as fh:
+        return json.load(fh)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the 8D hot paths.')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run = sub.add_parser('run', help='Run the benchmarks and print or store JSON results.')
+    run.add_argument('--scale', type=int, default=1000, help='Synthetic records per benchmark (1k-1M).')
+    run.add_argument('--seed', type=int, default=0)
+    run.add_argument('--repeat', type=int, default=3)
+    run.add_argument('--only', action='append', choices=list(BENCHMARKS), help='Run only this benchmark (repeatable).')
+    run.add_argument('--output', help='Write results to this file instead of stdout.')
+
+    compare = sub.add_parser('compare', help='Flag regressions against a stored baseline.')
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+    compare.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='Allowed slowdown fraction (default 0.10).')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == 'run':
+        results = run_benchmarks(args.scale, seed=args.seed, repeat=args.repeat, names=args.only)
+        text = json.dumps(results, indent=2)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as fh:
+                fh.write(text + '\n')
+        else:
+            print(text)
+        return
+
+    rows = compare_results(_load(args.baseline), _load(args.current), args.threshold)
+    for row in rows:
+        flag = 'REGRESSION' if row['regression'] else 'ok'
+        print(f"{row['name']:<28} {row['baseline_us']:>10.2f}us -> {row['current_us']:>10.2f}us {row['change']:>+8.1%}  {flag}")
+    if any(row['regression'] for row in rows):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
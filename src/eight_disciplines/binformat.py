@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Compact binary records for feedback events and defaults documents.
+
+A binary file starts with ``MAGIC`` and holds length-prefixed records
+(``<I`` byte length, then the body). The first body byte tags the record:
+
+* ``TAG_EVENT``: a ``feedback_event()`` dict. Fixed header, then the
+  timestamp, the ``CustomerFeedback`` fields in dataclass order and, for
+  uncommon event names, the name itself.
+* ``TAG_DEFAULTS``: a defaults document. One type byte and length per field
+  of ``DEFAULT_FIELDS`` (contact, feedback, ``CustomerIssue`` then
+  ``EightDisciplineInputs`` order), then the values, then any extra keys as
+  JSON.
+* ``TAG_RAW``: a JSON line stored verbatim, for anything else.
+
+Records are only stored structurally when decoding them re-serialises to the
+exact same JSON text, so converting JSONL to binary and back is lossless.
+Readers sniff the magic, so JSON and binary files are read the same way.
+
+    python -m eight_disciplines.binformat to-binary feedback_events.jsonl feedback_events.bin
+    python -m eight_disciplines.binformat to-jsonl feedback_events.bin feedback_events.jsonl
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+from dataclasses import fields
+from typing import Any, Dict, Iterator, List, Optional
+
+from eight_disciplines.eventlog import FEEDBACK_EVENT, FeedbackEventLog, encode_event, fcntl
+from eight_disciplines.schema import DEFAULT_FIELDS
+from eight_disciplines.survey_tools import CustomerFeedback
+
+MAGIC = b'ACME8DB\x01'
+BINARY_SUFFIX = '.bin'
+
+TAG_RAW = 0
+TAG_EVENT = 1
+TAG_DEFAULTS = 2
+
+_LENGTH = struct.Struct('<I')
+
+# tag, event code, has rating, timestamp length, rating, feedback length, event name length
+_EVENT_HEADER = struct.Struct('<BBBBiIH')
+_EVENT_CODES = {FEEDBACK_EVENT: 1}
+_EVENT_NAMES = {code: name for name, code in _EVENT_CODES.items()}
+_EVENT_KEYS = frozenset(('timestamp', 'event', 'feedback'))
+_FEEDBACK_FIELDS = tuple(f.name for f in fields(CustomerFeedback))
+_INT32 = (-2 ** 31, 2 ** 31 - 1)
+
+# Field value types in defaults records.
+_ABSENT, _NONE, _STR, _NAMES, _JSON = range(5)
+_NAME_SEP = '\x00'
+# tag, one type byte per field, one length per field, extra-keys length
+_DEFAULT_FIELD_SET = frozenset(DEFAULT_FIELDS)
+_DEFAULTS_HEADER = struct.Struct('<B' + 'B' * len(DEFAULT_FIELDS) + 'I' * len(DEFAULT_FIELDS) + 'I')
+
+
+def _encode_event(event: Dict[str, Any]) -> Optional[bytes]:
+    if event.keys() != _EVENT_KEYS:
+        return None
+    feedback = event['feedback']
+    timestamp = event['timestamp']
+    name = event['event']
+    if not isinstance(feedback, dict) or tuple(feedback) != _FEEDBACK_FIELDS:
+        return None
+    text, rating = feedback['feedback'], feedback['rating']
+    if not isinstance(text, str) or not isinstance(timestamp, str) or not isinstance(name, str):
+        return None
+    if rating is not None and (type(rating) is not int or not _INT32[0] <= rating <= _INT32[1]):
+        return None
+    ts = timestamp.encode('utf-8')
+    if len(ts) > 255:
+        return None
+    text_bytes = text.encode('utf-8')
+    code = _EVENT_CODES.get(name, 0)
+    name_bytes = b'' if code else name.encode('utf-8')
+    if len(name_bytes) > 0xFFFF:
+        return None
+    header = _EVENT_HEADER.pack(TAG_EVENT, code, rating is not None, len(ts), rating or 0, len(text_bytes), len(name_bytes))
+    return b''.join((header, ts, text_bytes, name_bytes))
+
+
+def _decode_event(body: bytes) -> Dict[str, Any]:
+    _, code, has_rating, ts_len, rating, text_len, name_len = _EVENT_HEADER.unpack_from(body)
+    pos = _EVENT_HEADER.size
+    timestamp = body[pos:pos + ts_len].decode('utf-8')
+    pos += ts_len
+    text = body[pos:pos + text_len].decode('utf-8')
+    pos += text_len
+    name = _EVENT_NAMES[code] if code else body[pos:pos + name_len].decode('utf-8')
+    # Same key order as feedback_event(), so encode_event() reproduces the line.
+    return {'timestamp': timestamp, 'event': name, 'feedback': {'feedback': text, 'rating': rating if has_rating else None}}
+
+
+def _encode_defaults(defaults: Dict[str, Any]) -> bytes:
+    types: List[int] = []
+    values: List[bytes] = []
+    for name in DEFAULT_FIELDS:
+        if name not in defaults:
+            kind, data = _ABSENT, b''
+        else:
+            value = defaults[name]
+            if value is None:
+                kind, data = _NONE, b''
+            elif type(value) is str:
+                kind, data = _STR, value.encode('utf-8')
+            elif type(value) is list and value and all(type(v) is str and _NAME_SEP not in v for v in value):
+                kind, data = _NAMES, _NAME_SEP.join(value).encode('utf-8')
+            else:
+                kind, data = _JSON, json.dumps(value).encode('utf-8')
+        types.append(kind)
+        values.append(data)
+    extra = {k: v for k, v in defaults.items() if k not in DEFAULT_FIELDS}
+    extra_bytes = json.dumps(extra).encode('utf-8') if extra else b''
+    header = _DEFAULTS_HEADER.pack(TAG_DEFAULTS, *types, *map(len, values), len(extra_bytes))
+    return b''.join((header, *values, extra_bytes))
+
+
+def _decode_defaults(body: bytes) -> Dict[str, Any]:
+    header = _DEFAULTS_HEADER.unpack_from(body)
+    count = len(DEFAULT_FIELDS)
+    types = header[1:1 + count]
+    lengths = header[1 + count:1 + 2 * count]
+    pos = _DEFAULTS_HEADER.size
+    defaults: Dict[str, Any] = {}
+    for name, kind, length in zip(DEFAULT_FIELDS, types, lengths):
+        if kind == _NONE:
+            defaults[name] = None
+        elif kind == _STR:
+            defaults[name] = body[pos:pos + length].decode('utf-8')
+        elif kind == _NAMES:
+            defaults[name] = body[pos:pos + length].decode('utf-8').split(_NAME_SEP)
+        elif kind == _JSON:
+            defaults[name] = json.loads(body[pos:pos + length])
+        pos += length
+    extra_len = header[-1]
+    if extra_len:
+        defaults.update(json.loads(body[pos:pos + extra_len]))
+    return defaults
+
+
+def _dump_defaults(defaults: Dict[str, Any]) -> str:
+    return json.dumps(defaults)
+
+
+def encode_record(record: Dict[str, Any]) -> bytes:
+    """Length-prefixed record for one event or defaults document."""
+    body = _encode_event(record) if 'event' in record else None
+    if body is None:
+        body = _encode_defaults(record) if record.keys() & _DEFAULT_FIELD_SET else _raw(json.dumps(record))
+    return _LENGTH.pack(len(body)) + body
+
+
+def _raw(text: str) -> bytes:
+    return bytes((TAG_RAW,)) + text.encode('utf-8')
+
+
+def encode_line(line: str) -> bytes:
+    """
+    Length-prefixed record for one JSON line. Falls back to storing the line
+    verbatim unless the structured record decodes to the identical text.
+    """
+    line = line.rstrip('\n')
+    body = None
+    try:
+        record = json.loads(line)
+    except ValueError:
+        record = None
+    if isinstance(record, dict):
+        if 'event' in record:
+            body = _encode_event(record)
+            if body is not None and encode_event(_decode_event(body)) != line + '\n':
+                body = None
+        elif record.keys() & _DEFAULT_FIELD_SET:
+            body = _encode_defaults(record)
+            if _dump_defaults(_decode_defaults(body)) != line:
+                body = None
+    if body is None:
+        body = _raw(line)
+    return _LENGTH.pack(len(body)) + body
+
+
+def decode_body(body: bytes) -> Any:
+    tag = body[0]
+    if tag == TAG_EVENT:
+        return _decode_event(body)
+    if tag == TAG_DEFAULTS:
+        return _decode_defaults(body)
+    if tag == TAG_RAW:
+        return json.loads(body[1:])
+    raise ValueError(f'unknown record tag {tag}')
+
+
+def body_to_line(body: bytes) -> str:
+    """The JSON line a record was converted from (without the newline)."""
+    tag = body[0]
+    if tag == TAG_EVENT:
+        return encode_event(_decode_event(body))[:-1]
+    if tag == TAG_DEFAULTS:
+        return _dump_defaults(_decode_defaults(body))
+    return body[1:].decode('utf-8')
+
+
+def is_binary(path: str) -> bool:
+    try:
+        with open(path, 'rb') as fh:
+            return fh.read(len(MAGIC)) == MAGIC
+    except FileNotFoundError:
+        return False
+
+
+def iter_bodies(path: str) -> Iterator[bytes]:
+    """Record bodies of a binary file; a truncated trailing record is ignored."""
+    if os.path.getsize(path) <= len(MAGIC):
+        return
+    with open(path, 'rb') as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f'{path} is not a binary record file')
+        pos, size = len(MAGIC), len(mm)
+        unpack = _LENGTH.unpack_from
+        while pos + 4 <= size:
+            (length,) = unpack(mm, pos)
+            end = pos + 4 + length
+            if end > size:
+                break
+            yield mm[pos + 4:end]
+            pos = end
+
+
+def iter_records(path: str) -> Iterator[Any]:
+    """Decoded records of a JSONL or binary file, whichever ``path`` holds."""
+    if is_binary(path):
+        for body in iter_bodies(path):
+            yield decode_body(body)
+        return
+    with open(path, 'r', encoding='utf-8') as fh:
+        for line in fh:
+            if line.strip():
+                yield json.loads(line)
+
+
+class BinaryEventLog(FeedbackEventLog):
+    """FeedbackEventLog that appends binary records instead of JSON lines."""
+
+    _encode = staticmethod(encode_record)
+
+    def _open_file(self):
+        fh = super()._open_file()
+        fd = fh.fileno()
+        # Under the append lock, so concurrent writers create the header once.
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(fd).st_size == 0:
+                os.write(fd, MAGIC)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        return fh
+
+
+def load_binary_defaults(path: str) -> Dict[str, Any]:
+    for body in iter_bodies(path):
+        return decode_body(body)
+    raise ValueError(f'{path} holds no defaults record')
+
+
+def dump_binary_defaults(defaults: Dict[str, Any]) -> bytes:
+    return MAGIC + encode_record(defaults)
+
+
+def save_binary_defaults(defaults: Dict[str, Any], path: str) -> None:
+    with open(path, 'wb') as fh:
+        fh.write(dump_binary_defaults(defaults))
+
+
+def convert_to_binary(source: str, target: str) -> int:
+    count = 0
+    with open(source, 'r', encoding='utf-8') as src, open(target, 'wb') as dst:
+        dst.write(MAGIC)
+        for line in src:
+            if line.strip():
+                dst.write(encode_line(line))
+                count += 1
+    return count
+
+
+def convert_to_jsonl(source: str, target: str) -> int:
+    count = 0
+    with open(target, 'w', encoding='utf-8') as dst:
+        for body in iter_bodies(source):
+            dst.write(body_to_line(body) + '\n')
+            count += 1
+    return count
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Convert event logs and defaults between JSONL and binary records.')
+    parser.add_argument('direction', choices=['to-binary', 'to-jsonl'])
+    parser.add_argument('source')
+    parser.add_argument('target')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    convert = convert_to_binary if args.direction == 'to-binary' else convert_to_jsonl
+    count = convert(args.source, args.target)
+    print(f'{count} records written to {args.target}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+"""Memory-lean representations of issues and 8D inputs for bulk analytics."""
+from dataclasses import fields
+from operator import attrgetter
+from sys import intern
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from eight_disciplines.survey_tools import (
+    CustomerContact,
+    CustomerIssue,
+    EightDisciplineInputs,
+    normalize_names,
+    normalize_text,
+)
+
+
+class _Slotted:
+    """
+    Base for ``__slots__`` counterparts of the survey dataclasses.
+
+    ``to_dict()`` is a shallow field copy (no recursive ``asdict`` deep copy),
+    so list values such as ``team`` are shared with the instance.
+    """
+
+    __slots__ = ()
+    FIELDS: Tuple[str, ...] = ()
+    DATACLASS: Any = None
+
+    def __init__(self, *args, **kwargs):
+        values = dict(zip(self.FIELDS, args))
+        values.update(kwargs)
+        for name in self.FIELDS:
+            setattr(self, name, values.pop(name, None))
+        if values:
+            raise TypeError(f'unexpected fields for {type(self).__name__}: {", ".join(values)}')
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(zip(self.FIELDS, self._values(self)))
+
+    def to_defaults(self, defaults: dict) -> dict:
+        defaults.update(zip(self.FIELDS, self._values(self)))
+        return defaults
+
+    @classmethod
+    def from_dataclass(cls, model):
+        return cls(*(getattr(model, name) for name in cls.FIELDS))
+
+    def to_dataclass(self):
+        return self.DATACLASS(*self._values(self))
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._values(self) == self._values(other)
+
+    def __repr__(self):
+        body = ', '.join(f'{name}={value!r}' for name, value in zip(self.FIELDS, self._values(self)))
+        return f'{type(self).__name__}({body})'
+
+
+def _field_names(dataclass_type) -> Tuple[str, ...]:
+    return tuple(f.name for f in fields(dataclass_type))
+
+
+class SlottedCustomerContact(_Slotted):
+    FIELDS = _field_names(CustomerContact)
+    DATACLASS = CustomerContact
+    __slots__ = FIELDS
+    _values = staticmethod(attrgetter(*FIELDS))
+
+    @staticmethod
+    def from_defaults(defaults: dict) -> 'SlottedCustomerContact':
+        return SlottedCustomerContact(
+            normalize_text(defaults.get('name')),
+            normalize_text(defaults.get('phone_number', defaults.get('phone'))),
+            normalize_text(defaults.get('email')),
+        )
+
+    def to_defaults(self, defaults: dict) -> dict:
+        super().to_defaults(defaults)
+        defaults.pop('phone', None)
+        return defaults
+
+
+class SlottedCustomerIssue(_Slotted):
+    FIELDS = _field_names(CustomerIssue)
+    DATACLASS = CustomerIssue
+    __slots__ = FIELDS
+    _values = staticmethod(attrgetter(*FIELDS))
+
+    @staticmethod
+    def from_defaults(defaults: dict) -> 'SlottedCustomerIssue':
+        return SlottedCustomerIssue(*(normalize_text(defaults.get(name)) for name in SlottedCustomerIssue.FIELDS))
+
+
+class SlottedEightDisciplineInputs(_Slotted):
+    FIELDS = _field_names(EightDisciplineInputs)
+    DATACLASS = EightDisciplineInputs
+    __slots__ = FIELDS
+    _values = staticmethod(attrgetter(*FIELDS))
+
+    @staticmethod
+    def from_defaults(defaults: dict) -> 'SlottedEightDisciplineInputs':
+        return SlottedEightDisciplineInputs(*(
+            normalize_names(defaults.get(name)) if name == 'team' else normalize_text(defaults.get(name))
+            for name in SlottedEightDisciplineInputs.FIELDS
+        ))
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return None if value is None else intern(value)
+
+
+class IssueColumns:
+    """
+    Column store for many issues: one list per field, strings interned so
+    repeated values (team members, locations, boilerplate plans) are stored
+    once. ``team`` is kept as a tuple of interned names.
+
+    Rows are only materialised on access, through ``IssueRow`` views.
+    """
+
+    CONTACT_FIELDS = SlottedCustomerContact.FIELDS
+    ISSUE_FIELDS = SlottedCustomerIssue.FIELDS
+    EIGHT_D_FIELDS = SlottedEightDisciplineInputs.FIELDS
+    FIELDS = CONTACT_FIELDS + ISSUE_FIELDS + EIGHT_D_FIELDS
+
+    def __init__(self):
+        self.columns: Dict[str, List[Any]] = {name: [] for name in self.FIELDS}
+
+    @classmethod
+    def from_defaults(cls, documents: Iterable[dict]) -> 'IssueColumns':
+        table = cls()
+        table.extend(documents)
+        return table
+
+    def append(self, defaults: dict) -> None:
+        columns = self.columns
+        get = defaults.get
+        columns['phone_number'].append(_intern(normalize_text(get('phone_number', get('phone')))))
+        for name in ('name', 'email') + self.ISSUE_FIELDS + self.EIGHT_D_FIELDS:
+            if name == 'team':
+                team = normalize_names(get('team'))
+                columns['team'].append(None if team is None else tuple(map(intern, team)))
+            else:
+                columns[name].append(_intern(normalize_text(get(name))))
+
+    def extend(self, documents: Iterable[dict]) -> None:
+        for defaults in documents:
+            self.append(defaults)
+
+    def column(self, name: str) -> List[Any]:
+        return self.columns[name]
+
+    def __len__(self) -> int:
+        return len(self.columns['name'])
+
+    def __getitem__(self, index: int) -> 'IssueRow':
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('row index out of range')
+        return IssueRow(self, index)
+
+    def __iter__(self) -> Iterator['IssueRow']:
+        for index in range(len(self)):
+            yield IssueRow(self, index)
+
+
+class IssueRow:
+    """Lazy view of one row of an IssueColumns table."""
+
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table: IssueColumns, index: int):
+        self.table = table
+        self.index = index
+
+    def __getitem__(self, name: str) -> Any:
+        value = self.table.columns[name][self.index]
+        return list(value) if name == 'team' and value is not None else value
+
+    def get(self, name: str, default: Any = None) -> Any:
+        if name not in self.table.columns:
+            return default
+        return self[name]
+
+    def _fields(self, names: Tuple[str, ...]) -> Dict[str, Any]:
+        return {name: self[name] for name in names}
+
+    def contact(self) -> Dict[str, Any]:
+        return self._fields(IssueColumns.CONTACT_FIELDS)
+
+    def issue(self) -> Dict[str, Any]:
+        return self._fields(IssueColumns.ISSUE_FIELDS)
+
+    def eight_d(self) -> Dict[str, Any]:
+        return self._fields(IssueColumns.EIGHT_D_FIELDS)
+
+    def to_defaults(self) -> Dict[str, Any]:
+        return self._fields(IssueColumns.FIELDS)
+
+    def report(self) -> Dict[str, Any]:
+        """Same shape as EightDisciplines.generate_machine_readable_report()."""
+        report: Dict[str, Any] = {'issue': self.issue()}
+        report.update(self.eight_d())
+        return report
@@ -0,0 +1,185 @@
+"""
+Step x report completion matrices for many reports at once.
+
+Same rules as ``ReportGenerator.check_nonempty_values()`` and
+``check_empty_values()``: ``issue`` counts as done only when
+``is_issue_complete()``, a dict is missing when all of its values are
+missing, None is missing and anything else is present. A step a report does
+not contain is neither done nor missing.
+
+With NumPy installed the matrices are ``bool`` arrays of shape
+``(len(steps), len(reports))``; without it (or with ``backend='bitset'``)
+each step row is an int whose bit ``j`` stands for report ``j``.
+"""
+from itertools import repeat
+from operator import and_, contains, is_not
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from eight_disciplines.reportgenerator import ISSUE_REQUIRED_FIELDS, _is_missing, is_issue_complete
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when NumPy is absent
+    np = None
+
+BACKENDS = ('numpy', 'bitset')
+
+# Maps a bytearray of 0/1 flags to ASCII digits for int(..., 2).
+_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+
+
+def _value_done(value: Any) -> bool:
+    if value is None:
+        return False
+    if isinstance(value, dict):
+        return not _is_missing(value)
+    return True
+
+
+def _and(left: bytearray, right: bytearray) -> bytearray:
+    return bytearray(map(and_, left, right))
+
+
+def _not_none(values: Iterable[Any]) -> bytearray:
+    return bytearray(map(is_not, values, repeat(None)))
+
+
+def _done_flags(step: str, column: List[Any]) -> bytearray:
+    """
+    0/1 per value. The common cases (plain values, dict issues) run as C-level
+    ``map`` calls; only dicts outside ``issue`` and odd issue values take the
+    per-item Python path.
+    """
+    types = set(map(type, column))
+    if step == 'issue':
+        if types <= {dict, type(None)}:
+            flags = bytearray(map(is_not, column, repeat(None)))
+            dicts = [value if value is not None else {} for value in column] if type(None) in types else column
+            for field in ISSUE_REQUIRED_FIELDS:
+                flags = _and(flags, _not_none(map(dict.get, dicts, repeat(field))))
+            return flags
+        return bytearray(map(is_issue_complete, column))
+    flags = _not_none(column)
+    if any(issubclass(t, dict) for t in types):
+        for j, value in enumerate(column):
+            if isinstance(value, dict):
+                flags[j] = _value_done(value)
+    return flags
+
+
+def _pack(flags: bytearray) -> int:
+    """Bitset with bit ``j`` set when ``flags[j]`` is 1 (linear time)."""
+    if not flags:
+        return 0
+    return int(flags[::-1].translate(_DIGITS), 2)
+
+
+def _popcount(bits: int) -> int:
+    return bin(bits).count('1')
+
+
+def default_backend() -> str:
+    return 'numpy' if np is not None else 'bitset'
+
+
+class CompletionMatrix:
+    """Done/present flags for every (step, report) pair."""
+
+    def __init__(self, steps: Sequence[str], size: int, done, present, backend: str):
+        self.steps = tuple(steps)
+        self.index = {step: i for i, step in enumerate(self.steps)}
+        self.size = size
+        self.done = done
+        self.present = present
+        self.backend = backend
+
+    def _flag(self, rows, step: str, report: int) -> bool:
+        if not 0 <= report < self.size:
+            raise IndexError('report index out of range')
+        row = rows[self.index[step]]
+        if self.backend == 'numpy':
+            return bool(row[report])
+        return bool(row >> report & 1)
+
+    def is_done(self, step: str, report: int) -> bool:
+        return self._flag(self.done, step, report)
+
+    def is_missing(self, step: str, report: int) -> bool:
+        return self._flag(self.present, step, report) and not self.is_done(step, report)
+
+    def done_steps(self, report: int) -> List[str]:
+        return [step for step in self.steps if self.is_done(step, report)]
+
+    def missing_steps(self, report: int) -> List[str]:
+        return [step for step in self.steps if self.is_missing(step, report)]
+
+    def missing(self):
+        """Rows of ``present and not done``, in the backend's representation."""
+        if self.backend == 'numpy':
+            return self.present & ~self.done
+        return [present & ~done for present, done in zip(self.present, self.done)]
+
+    def done_counts(self) -> Dict[str, int]:
+        if self.backend == 'numpy':
+            return dict(zip(self.steps, self.done.sum(axis=1).tolist()))
+        return dict(zip(self.steps, map(_popcount, self.done)))
+
+    def missing_counts(self) -> Dict[str, int]:
+        rows = self.missing()
+        if self.backend == 'numpy':
+            return dict(zip(self.steps, rows.sum(axis=1).tolist()))
+        return dict(zip(self.steps, map(_popcount, rows)))
+
+
+def completion_matrix(
+    reports: Iterable[Dict[str, Any]],
+    steps: Optional[Sequence[str]] = None,
+    *,
+    backend: Optional[str] = None,
+) -> CompletionMatrix:
+    """
+    Evaluate missingness for a batch of reports column by column.
+
+    ``steps`` defaults to every key seen, in first-seen order. ``backend`` is
+    ``'numpy'``, ``'bitset'`` or None for NumPy when available.
+    """
+    backend = backend or default_backend()
+    if backend not in BACKENDS:
+        raise ValueError(f'backend must be one of {", ".join(BACKENDS)}')
+    if backend == 'numpy' and np is None:
+        raise ValueError('the numpy backend needs NumPy installed')
+
+    reports = reports if isinstance(reports, list) else list(reports)
+    # Reports usually share a handful of key layouts; knowing them lets a step
+    # every layout contains skip the per-report presence check.
+    layouts = list(dict.fromkeys(map(tuple, reports)))
+    if steps is None:
+        seen: Dict[str, None] = {}
+        for keys in layouts:
+            seen.update(dict.fromkeys(keys))
+        steps = list(seen)
+    size = len(reports)
+    everywhere = set.intersection(*map(set, layouts)) if layouts else set()
+
+    done_rows = []
+    present_rows = []
+    for step in steps:
+        if step in everywhere:
+            present = bytearray(b'\x01') * size
+        else:
+            present = bytearray(map(contains, reports, repeat(step)))
+        # Absent keys read as None, which is never done.
+        done = _done_flags(step, list(map(dict.get, reports, repeat(step))))
+        if backend == 'numpy':
+            present_rows.append(np.frombuffer(bytes(present), dtype=np.bool_, count=size))
+            done_rows.append(np.frombuffer(bytes(done), dtype=np.bool_, count=size))
+        else:
+            present_rows.append(_pack(present))
+            done_rows.append(_pack(done))
+
+    if backend == 'numpy':
+        shape = (len(steps), size)
+        done_matrix = np.array(done_rows, dtype=np.bool_).reshape(shape)
+        present_matrix = np.array(present_rows, dtype=np.bool_).reshape(shape)
+        return CompletionMatrix(steps, size, done_matrix, present_matrix, backend)
+    return CompletionMatrix(steps, size, done_rows, present_rows, backend)
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Long-running worker that answers ``--non-interactive --format json`` requests
+over a Unix domain socket, so callers skip interpreter startup per request.
+
+Wire format, both directions: a 4-byte big-endian length followed by that
+many bytes of UTF-8 JSON. A request is ``{"defaults": {...}}`` (evaluate the
+given document) or ``{"defaults_file": "..."}`` (load, evaluate and save back,
+exactly like the CLI). The response is the document the CLI prints, or
+``{"error": "..."}``.
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import struct
+from typing import Any, Dict, Optional
+
+from eight_disciplines.acme_customer_feedback import (
+    EightDisciplines,
+    evaluate_defaults,
+    load_defaults,
+    log_feedback,
+    save_defaults,
+    step_order,
+    step_prereqs,
+)
+from eight_disciplines.dedup import open_deduplicator
+from eight_disciplines.eventlog import FeedbackEventLog
+from eight_disciplines.segments import open_event_log
+from eight_disciplines.survey_tools import CustomerFeedback
+from eight_disciplines.timing import record_timings, span
+
+_HEADER = struct.Struct('>I')
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            if chunks:
+                raise ProtocolError('connection closed mid-frame')
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def read_frame(sock: socket.socket) -> Optional[Any]:
+    """Next JSON message from ``sock``, or None when the peer closed cleanly."""
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    (length,) = _HEADER.unpack(header)
+    if length > MAX_FRAME_BYTES:
+        raise ProtocolError(f'frame of {length} bytes exceeds {MAX_FRAME_BYTES}')
+    body = _recv_exact(sock, length) if length else b''
+    if body is None:
+        raise ProtocolError('connection closed mid-frame')
+    return json.loads(body)
+
+
+def write_frame(sock: socket.socket, message: Any) -> None:
+    body = json.dumps(message).encode('utf-8')
+    sock.sendall(_HEADER.pack(len(body)) + body)
+
+
+class RequestHandler:
+    """The warm part of the service: step graph and event log stay open between requests."""
+
+    def __init__(self, event_log: Optional[FeedbackEventLog] = None):
+        self.order = step_order(EightDisciplines(None))
+        self.prereqs = step_prereqs()
+        self.event_log = event_log
+        self.dedup = open_deduplicator()
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        if not isinstance(request, dict):
+            raise ValueError('request must be a JSON object')
+        defaults_file = request.get('defaults_file')
+        loaded = None
+        if 'defaults' in request:
+            defaults = request['defaults']
+            if not isinstance(defaults, dict):
+                raise ValueError('"defaults" must be a JSON object')
+        elif defaults_file:
+            with span('load_defaults'):
+                defaults = load_defaults(defaults_file)
+            loaded = dict(defaults)
+        else:
+            raise ValueError('request needs "defaults" or "defaults_file"')
+
+        result = evaluate_defaults(defaults, self.order, self.prereqs)
+        if result['feedback_submitted']:
+            issue_blob = json.dumps(result['report']['issue'], sort_keys=True)
+            with span('log_feedback'):
+                log_feedback(CustomerFeedback(feedback=issue_blob, rating=None), self.event_log, self.dedup)
+        if defaults_file:
+            with span('save_defaults'):
+                save_defaults(defaults, defaults_file, base=loaded)
+        return result
+
+
+class _StreamHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        handler: RequestHandler = self.server.request_handler
+        while True:
+            try:
+                request = read_frame(self.request)
+            except (ProtocolError, ValueError) as exc:
+                write_frame(self.request, {'error': str(exc)})
+                return
+            if request is None:
+                return
+            try:
+                response = handler.handle(request)
+            except Exception as exc:  # report per-request failures, keep serving
+                response = {'error': f'{type(exc).__name__}: {exc}'}
+            write_frame(self.request, response)
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, request_handler: RequestHandler):
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        self.request_handler = request_handler
+        super().__init__(socket_path, _StreamHandler)
+
+    def service_actions(self):
+        # Runs between polls of serve_forever(); pushes out buffered events
+        # even when no further requests arrive.
+        if self.request_handler.event_log is not None:
+            self.request_handler.event_log.flush()
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+class DaemonClient:
+    """Persistent connection to a running daemon."""
+
+    def __init__(self, socket_path: str, timeout: Optional[float] = None):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(socket_path)
+
+    def request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        write_frame(self.sock, message)
+        response = read_frame(self.sock)
+        if response is None:
+            raise ProtocolError('daemon closed the connection')
+        return response
+
+    def close(self) -> None:
+        self.sock.close()
+
+    def __enter__(self) -> 'DaemonClient':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def serve(socket_path: str, event_log: Optional[FeedbackEventLog] = None) -> None:
+    """Serve until interrupted, then flush the event log and remove the socket."""
+    if event_log is None:
+        event_log = open_event_log()
+    server = DaemonServer(socket_path, RequestHandler(event_log))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        event_log.close()
+        if server.request_handler.dedup is not None:
+            server.request_handler.dedup.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Serve 8D workflow evaluations over a Unix domain socket.')
+    parser.add_argument('--socket', default=os.getenv('ACME_DAEMON_SOCKET', 'acme_8d.sock'), help='Socket path to listen on.')
+    parser.add_argument(
+        '--timings',
+        nargs='?',
+        const='-',
+        default=os.getenv('ACME_TIMINGS') or None,
+        metavar='PATH',
+        help='On shutdown, dump per-stage wall/CPU time as JSON to PATH (or stderr for "-").',
+    )
+    return parser.parse_args(argv)
+
+
+def _exit_on_sigterm(signum, frame):
+    raise SystemExit(0)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+    with record_timings(args.timings):
+        serve(args.socket)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Suppress repeated feedback submissions before they reach the event log.
+
+Every submission is keyed on a 16-byte BLAKE2b hash of its canonical JSON
+form, kept in a small SQLite table next to suppression counters. A repeat is
+logged again only once ``window`` seconds have passed since it was last
+logged; with no window, a submission is logged once, ever.
+
+Enabled by ``ACME_FEEDBACK_DEDUP_DB`` (database path); the window comes from
+``ACME_FEEDBACK_DEDUP_WINDOW`` in seconds (default one day, ``none`` for no
+expiry).
+
+    python -m eight_disciplines.dedup dedup.db    # print logged/suppressed/unique counts
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional
+
+from eight_disciplines.survey_tools import CustomerFeedback
+
+DEFAULT_WINDOW = 24 * 60 * 60
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS feedback_hashes ('
+    'hash BLOB PRIMARY KEY, last_logged REAL NOT NULL, suppressed INTEGER NOT NULL DEFAULT 0'
+    ') WITHOUT ROWID',
+    'CREATE TABLE IF NOT EXISTS dedup_counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL) WITHOUT ROWID',
+)
+
+
+def content_hash(feedback: CustomerFeedback) -> bytes:
+    """Stable hash of a submission; key order and whitespace in JSON feedback text do not matter."""
+    text = feedback.feedback
+    if isinstance(text, str) and text.startswith('{'):
+        try:
+            text = json.loads(text)
+        except ValueError:
+            pass
+    canonical = json.dumps({'feedback': text, 'rating': feedback.rating}, sort_keys=True, separators=(',', ':'))
+    return hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).digest()
+
+
+@dataclass(frozen=True)
+class Reservation:
+    """A submission let through by ``reserve``; ``previous`` is the hash's earlier ``last_logged``, if any."""
+
+    key: bytes
+    logged_at: float
+    previous: Optional[float]
+
+
+class FeedbackDeduplicator:
+    """
+    Persistent hash index consulted by ``log_feedback``. Safe to share
+    between threads and processes: ``reserve`` checks and records a
+    submission in one ``BEGIN IMMEDIATE`` transaction, so of several
+    identical submissions arriving at once exactly one is let through.
+    """
+
+    def __init__(self, path: str, *, window: Optional[float] = DEFAULT_WINDOW):
+        self.path = path
+        self.window = window
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        for statement in _SCHEMA:
+            self.conn.execute(statement)
+
+    def should_log(self, feedback: CustomerFeedback, now: Optional[float] = None) -> bool:
+        return self.reserve(feedback, now) is not None
+
+    def reserve(self, feedback: CustomerFeedback, now: Optional[float] = None) -> Optional[Reservation]:
+        """
+        Record ``feedback`` as logged at ``now`` and return the reservation,
+        or return None (counted as suppressed) when it repeats one logged
+        inside the window. Give the reservation back with ``release`` if the
+        event cannot be written.
+        """
+        key = content_hash(feedback)
+        now = time.time() if now is None else now
+        with self._transaction() as conn:
+            conn.execute('INSERT INTO feedback_hashes (hash, last_logged) VALUES (?, ?) ON CONFLICT (hash) DO NOTHING', (key, now))
+            if conn.execute('SELECT changes()').fetchone()[0]:
+                previous = None
+            else:
+                previous = conn.execute('SELECT last_logged FROM feedback_hashes WHERE hash = ?', (key,)).fetchone()[0]
+                if self.window is None or now - previous < self.window:
+                    conn.execute('UPDATE feedback_hashes SET suppressed = suppressed + 1 WHERE hash = ?', (key,))
+                    self._count(conn, 'suppressed')
+                    return None
+                conn.execute('UPDATE feedback_hashes SET last_logged = ? WHERE hash = ?', (now, key))
+            self._count(conn, 'logged')
+        return Reservation(key, now, previous)
+
+    def release(self, reservation: Reservation) -> None:
+        """Undo ``reserve`` for an event that was not written, unless a later submission took the hash since."""
+        with self._transaction() as conn:
+            row = conn.execute('SELECT last_logged FROM feedback_hashes WHERE hash = ?', (reservation.key,)).fetchone()
+            if row is None or row[0] != reservation.logged_at:
+                return
+            if reservation.previous is None:
+                conn.execute('DELETE FROM feedback_hashes WHERE hash = ?', (reservation.key,))
+            else:
+                conn.execute('UPDATE feedback_hashes SET last_logged = ? WHERE hash = ?', (reservation.previous, reservation.key))
+            self._count(conn, 'logged', -1)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            conn = self.conn
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+
+    @staticmethod
+    def _count(conn: sqlite3.Connection, name: str, delta: int = 1) -> None:
+        conn.execute(
+            'INSERT INTO dedup_counters (name, value) VALUES (?, ?) '
+            'ON CONFLICT (name) DO UPDATE SET value = value + excluded.value',
+            (name, delta),
+        )
+
+    def suppressed_count(self, feedback: CustomerFeedback) -> int:
+        with self._lock:
+            row = self.conn.execute('SELECT suppressed FROM feedback_hashes WHERE hash = ?', (content_hash(feedback),)).fetchone()
+        return row[0] if row else 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counters = dict(self.conn.execute('SELECT name, value FROM dedup_counters'))
+            unique = self.conn.execute('SELECT COUNT(*) FROM feedback_hashes').fetchone()[0]
+        return {'logged': counters.get('logged', 0), 'suppressed': counters.get('suppressed', 0), 'unique': unique}
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> 'FeedbackDeduplicator':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def dedup_window_from_env() -> Optional[float]:
+    raw = os.getenv('ACME_FEEDBACK_DEDUP_WINDOW')
+    if raw is None or raw == '':
+        return DEFAULT_WINDOW
+    if raw.lower() == 'none':
+        return None
+    return float(raw)
+
+
+def open_deduplicator() -> Optional[FeedbackDeduplicator]:
+    """The deduplicator configured by the environment, or None when disabled."""
+    path = os.getenv('ACME_FEEDBACK_DEDUP_DB')
+    if not path:
+        return None
+    return FeedbackDeduplicator(path, window=dedup_window_from_env())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Show feedback deduplication counters.')
+    parser.add_argument('db', nargs='?', default=os.getenv('ACME_FEEDBACK_DEDUP_DB'), help='Dedup database (default: ACME_FEEDBACK_DEDUP_DB).')
+    args = parser.parse_args(argv)
+    if not args.db:
+        parser.error('no database given and ACME_FEEDBACK_DEDUP_DB is not set')
+    with FeedbackDeduplicator(args.db) as dedup:
+        print(json.dumps(dedup.stats()))
+
+
+if __name__ == '__main__':
+    main()
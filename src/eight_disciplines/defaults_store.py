@@ -0,0 +1,341 @@
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from eight_disciplines.binformat import BINARY_SUFFIX, dump_binary_defaults, is_binary, load_binary_defaults
+from eight_disciplines.schema import DEFAULT_FIELDS
+
+try:
+    import fcntl
+except ImportError:  # not on Windows; saves are then only atomic, not merged under a lock
+    fcntl = None
+
+SQLITE_PREFIX = 'sqlite:'
+SHARD_PREFIX = 'shard:'
+LOCK_SUFFIX = '.lock'
+
+_MISSING = object()
+
+
+def empty_defaults() -> Dict[str, Any]:
+    return {field: None for field in DEFAULT_FIELDS}
+
+
+def merge_defaults(current: Dict[str, Any], ours: Dict[str, Any], base: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Three-way merge for a read-modify-write save: start from what is stored
+    now (``current``) and apply the keys ``ours`` changed relative to
+    ``base``, the document it was loaded as. Keys another writer changed in
+    the meantime survive unless we changed them too. Without a ``base``,
+    every key in ``ours`` wins.
+    """
+    if base is None:
+        return {**current, **ours}
+    merged = dict(current)
+    for key in ours.keys() | base.keys():
+        value = ours.get(key, _MISSING)
+        if value == base.get(key, _MISSING):
+            continue
+        if value is _MISSING:
+            merged.pop(key, None)
+        else:
+            merged[key] = value
+    return merged
+
+
+@contextmanager
+def _locked(path: str) -> Iterator[None]:
+    """Exclusive advisory lock on the ``.lock`` file next to ``path``."""
+    if fcntl is None:
+        yield
+        return
+    with open(path + LOCK_SUFFIX, 'a') as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _replace_file(path: str, data: bytes) -> None:
+    """
+    Durably replace ``path`` with ``data``: write a unique temporary file
+    beside it, fsync it, rename it over ``path`` and fsync the directory, so
+    a crash leaves either the old or the new file, never a truncated one.
+    """
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        # mkstemp creates the file 0600; keep the mode a plain open() would give.
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _fsync_directory(directory)
+
+
+def _fsync_directory(directory: str) -> None:
+    if os.name == 'nt':  # directories cannot be opened for fsync on Windows
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class JsonDefaultsStore:
+    """
+    One document per file; the original ``customer_defaults.json`` layout.
+    Paths ending in ``.bin`` are written as a binary record (see binformat);
+    either format is recognised on load.
+
+    Saves replace the file atomically (readers never see it half-written)
+    and, under a lock on ``PATH.lock``, merge into whatever another process
+    saved since this one loaded (see ``merge_defaults``).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._loaded: Optional[Dict[str, Any]] = None
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return None
+        if is_binary(self.path):
+            return load_binary_defaults(self.path)
+        with open(self.path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+
+    def load(self) -> Dict[str, Any]:
+        defaults = self._read()
+        if defaults is None:
+            defaults = empty_defaults()
+        self._loaded = dict(defaults)
+        return defaults
+
+    def save(self, defaults: Dict[str, Any], base: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Store ``defaults``. ``base`` is the document they were loaded as
+        (default: this store's last ``load()``); only keys changed relative
+        to it overwrite concurrent saves.
+        """
+        if base is None:
+            base = self._loaded
+        with _locked(self.path):
+            current = self._read()
+            if current is not None:
+                defaults = merge_defaults(current, defaults, base)
+            if self.path.endswith(BINARY_SUFFIX):
+                data = dump_binary_defaults(defaults)
+            else:
+                data = json.dumps(defaults).encode('utf-8')
+            _replace_file(self.path, data)
+        self._loaded = dict(defaults)
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class ShardedDefaultsStore(JsonDefaultsStore):
+    """
+    One JSON file per customer (and issue) under ``directory``, spread over
+    two levels of hashed subdirectories (``ab/cd/<sha256>.json``), so workers
+    serving different customers never share a file or a lock. Without a
+    customer the email address is the key, then ``'default'``.
+    """
+
+    def __init__(self, directory: str, *, customer: Optional[str] = None, issue_id: str = '', email: Optional[str] = None):
+        self.directory = directory
+        self.customer = customer or email or 'default'
+        self.issue_id = issue_id
+        digest = hashlib.sha256(f'{self.customer}\x00{issue_id}'.encode('utf-8')).hexdigest()
+        super().__init__(os.path.join(directory, digest[:2], digest[2:4], digest + '.json'))
+
+    def save(self, defaults: Dict[str, Any], base: Optional[Dict[str, Any]] = None) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        super().save(defaults, base)
+
+
+_COLUMNS = ', '.join(f'{field} TEXT' for field in DEFAULT_FIELDS)
+_SCHEMA = (
+    f'CREATE TABLE IF NOT EXISTS customer_defaults ('
+    f'customer TEXT NOT NULL, issue_id TEXT NOT NULL DEFAULT \'\', {_COLUMNS}, '
+    f'extra TEXT, updated_at TEXT NOT NULL, PRIMARY KEY (customer, issue_id))',
+    'CREATE INDEX IF NOT EXISTS customer_defaults_email ON customer_defaults (email)',
+    'CREATE INDEX IF NOT EXISTS customer_defaults_issue ON customer_defaults (issue_id)',
+)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class SqliteDefaultsStore:
+    """
+    Defaults for many customers in one SQLite database, one row per
+    customer/issue. Field values are stored JSON-encoded in their own column so
+    single fields can be updated in place; keys outside ``DEFAULT_FIELDS`` go
+    to the ``extra`` column.
+
+    The row is selected by ``customer`` (and ``issue_id``), or looked up by
+    ``email`` through its index. Without either, the ``'default'`` row is used.
+    """
+
+    def __init__(self, path: str, *, customer: Optional[str] = None, issue_id: str = '', email: Optional[str] = None):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        with self.conn:
+            for statement in _SCHEMA:
+                self.conn.execute(statement)
+        self.issue_id = issue_id
+        if customer is None and email is not None:
+            customer = self._customer_for_email(email) or email
+        self.customer = customer or 'default'
+
+    def _customer_for_email(self, email: str) -> Optional[str]:
+        row = self.conn.execute(
+            'SELECT customer FROM customer_defaults WHERE email = ? AND issue_id = ? LIMIT 1',
+            (json.dumps(email), self.issue_id),
+        ).fetchone()
+        return row[0] if row else None
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return self.customer, self.issue_id
+
+    def load(self) -> Dict[str, Any]:
+        row = self.conn.execute(
+            f'SELECT {", ".join(DEFAULT_FIELDS)}, extra FROM customer_defaults WHERE customer = ? AND issue_id = ?',
+            self.key,
+        ).fetchone()
+        if row is None:
+            return empty_defaults()
+        defaults = {field: (None if raw is None else json.loads(raw)) for field, raw in zip(DEFAULT_FIELDS, row)}
+        if row[-1]:
+            defaults.update(json.loads(row[-1]))
+        return defaults
+
+    def save(self, defaults: Dict[str, Any], base: Optional[Dict[str, Any]] = None) -> None:
+        """Upsert the selected row; with ``base``, merge like ``JsonDefaultsStore.save``."""
+        if base is not None:
+            with self.conn:
+                # Take the write lock before reading, so the merge sees the latest row.
+                self.conn.execute('BEGIN IMMEDIATE')
+                self._upsert(merge_defaults(self.load(), defaults, base))
+            return
+        with self.conn:
+            self._upsert(defaults)
+
+    def _upsert(self, defaults: Dict[str, Any]) -> None:
+        values = [json.dumps(defaults.get(field)) for field in DEFAULT_FIELDS]
+        extra = {k: v for k, v in defaults.items() if k not in DEFAULT_FIELDS}
+        columns = ', '.join(DEFAULT_FIELDS)
+        placeholders = ', '.join('?' for _ in DEFAULT_FIELDS)
+        assignments = ', '.join(f'{field} = excluded.{field}' for field in DEFAULT_FIELDS)
+        self.conn.execute(
+            f'INSERT INTO customer_defaults (customer, issue_id, {columns}, extra, updated_at) '
+            f'VALUES (?, ?, {placeholders}, ?, ?) '
+            f'ON CONFLICT (customer, issue_id) DO UPDATE SET {assignments}, '
+            f'extra = excluded.extra, updated_at = excluded.updated_at',
+            (*self.key, *values, json.dumps(extra) if extra else None, _now()),
+        )
+
+    def update_field(self, field: str, value: Any) -> None:
+        """Set one field of the selected row in its own transaction."""
+        if field not in DEFAULT_FIELDS:
+            raise KeyError(f'unknown defaults field: {field}')
+        with self.conn:
+            updated = self.conn.execute(
+                f'UPDATE customer_defaults SET {field} = ?, updated_at = ? WHERE customer = ? AND issue_id = ?',
+                (json.dumps(value), _now(), *self.key),
+            ).rowcount
+        if not updated:
+            defaults = empty_defaults()
+            defaults[field] = value
+            self.save(defaults)
+
+    def find_by_email(self, email: str) -> List[Tuple[str, str]]:
+        rows = self.conn.execute(
+            'SELECT customer, issue_id FROM customer_defaults WHERE email = ?',
+            (json.dumps(email),),
+        )
+        return [tuple(row) for row in rows]
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _parse_location(location: str, prefix: str) -> Tuple[str, Dict[str, str]]:
+    rest = location[len(prefix):]
+    if rest.startswith('//'):
+        rest = rest[2:]
+    path, _, query = rest.partition('?')
+    # A literal '+' stays a plus (jo+acme@example.com); spaces are written as %20.
+    params = dict(parse_qsl(query.replace('+', '%2B')))
+    return path, params
+
+
+def parse_sqlite_location(location: str) -> Tuple[str, Dict[str, str]]:
+    """
+    Split ``sqlite://PATH?customer=KEY&issue=ID&email=ADDR`` into the database
+    path and the selection parameters. ``sqlite:///var/lib/acme.db`` is an
+    absolute path, ``sqlite://acme.db`` a relative one. ``shard://DIR?...``
+    locations split the same way.
+    """
+    return _parse_location(location, SQLITE_PREFIX)
+
+
+def open_defaults_store(location: str):
+    """
+    Open the defaults store named by ``--defaults-file``/``ACME_DEFAULTS_FILE``.
+
+    ``sqlite:`` locations open a SqliteDefaultsStore and ``shard:`` locations
+    a ShardedDefaultsStore; either selects its customer with the query
+    parameters or ``ACME_DEFAULTS_CUSTOMER``/``ACME_DEFAULTS_ISSUE``/
+    ``ACME_DEFAULTS_EMAIL``. Anything else is a JSON file path.
+    """
+    if location.startswith(SHARD_PREFIX):
+        store_class = ShardedDefaultsStore
+        path, params = _parse_location(location, SHARD_PREFIX)
+    elif location.startswith(SQLITE_PREFIX):
+        store_class = SqliteDefaultsStore
+        path, params = parse_sqlite_location(location)
+    else:
+        return JsonDefaultsStore(location)
+    return store_class(
+        path,
+        customer=params.get('customer', os.getenv('ACME_DEFAULTS_CUSTOMER')),
+        issue_id=params.get('issue', os.getenv('ACME_DEFAULTS_ISSUE', '')),
+        email=params.get('email', os.getenv('ACME_DEFAULTS_EMAIL')),
+    )
@@ -0,0 +1,208 @@
+import json
+import os
+import threading
+import time
+from dataclasses import asdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Union
+
+from eight_disciplines.survey_tools import CustomerFeedback
+
+try:
+    import fcntl
+except ImportError:  # not on Windows; appends are then only safe within one process
+    fcntl = None
+
+FEEDBACK_EVENT = 'customer_feedback_submitted'
+
+# none:   leave durability to the OS page cache
+# batch:  fsync once after every flushed batch
+# record: flush and fsync after every record
+DURABILITY_MODES = ('none', 'batch', 'record')
+
+
+def default_log_path() -> str:
+    return os.getenv('ACME_FEEDBACK_LOG', 'feedback_events.jsonl')
+
+
+def feedback_event(feedback: CustomerFeedback, timestamp: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        'timestamp': timestamp or datetime.now(timezone.utc).isoformat(),
+        'event': FEEDBACK_EVENT,
+        'feedback': asdict(feedback),
+    }
+
+
+_TIMESTAMP_KEY = b'"timestamp": "'
+TimeBound = Union[str, datetime, None]
+
+
+def parse_timestamp(value: Union[str, bytes, datetime]) -> datetime:
+    if isinstance(value, bytes):
+        value = value.decode('ascii')
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def line_timestamp(line: bytes) -> Optional[datetime]:
+    """Timestamp of a raw log line without decoding the JSON record."""
+    # log_feedback writes sorted keys, so the top-level "timestamp" is the
+    # last key; nested strings cannot contain an unescaped quote.
+    pos = line.rfind(_TIMESTAMP_KEY)
+    if pos < 0:
+        return None
+    start = pos + len(_TIMESTAMP_KEY)
+    end = line.find(b'"', start)
+    try:
+        return parse_timestamp(line[start:end])
+    except ValueError:
+        return None
+
+
+def encode_event(payload: Dict[str, Any]) -> str:
+    return json.dumps(payload, sort_keys=True) + '\n'
+
+
+def _encode_event_bytes(payload: Dict[str, Any]) -> bytes:
+    return encode_event(payload).encode('utf-8')
+
+
+def locked_append(fd: int, data: bytes) -> None:
+    """
+    Append ``data`` to an ``O_APPEND`` descriptor under an exclusive
+    ``flock``, so a batch from one process is never interleaved with another
+    writer's, however large. The lock is held for the write calls only.
+    """
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class FeedbackEventLog:
+    """
+    Long-lived append-only writer for the feedback event log.
+
+    Records are buffered and written as one batch once ``batch_size`` records
+    are pending or the oldest pending record is ``flush_interval`` seconds old.
+    The age is checked on every write and, while records are pending, by a
+    background thread, so a writer that goes quiet still flushes within the
+    window. ``flush()``/``close()`` write out whatever is left.
+
+    Each batch is appended with one ``locked_append``, so several processes
+    may share the same log file.
+    """
+
+    # Record encoding; subclasses writing another format override this.
+    _encode = staticmethod(_encode_event_bytes)
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        *,
+        batch_size: int = 64,
+        flush_interval: float = 1.0,
+        durability: Optional[str] = None,
+    ):
+        if durability is None:
+            durability = os.getenv('ACME_FEEDBACK_FSYNC', 'none')
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f'durability must be one of {DURABILITY_MODES}, got {durability!r}')
+        if batch_size < 1:
+            raise ValueError('batch_size must be at least 1')
+
+        self.path = path or default_log_path()
+        self.batch_size = 1 if durability == 'record' else batch_size
+        self.flush_interval = flush_interval
+        self.durability = durability
+        self._pending: List[bytes] = []
+        self._oldest_pending: Optional[float] = None
+        self._lock = threading.Lock()
+        self._due = threading.Condition(self._lock)
+        self._flusher: Optional[threading.Thread] = None
+        self._file = self._open_file()
+
+    def _open_file(self):
+        return open(self.path, 'ab', buffering=0)
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def write(self, payload: Dict[str, Any]) -> None:
+        line = self._encode(payload)
+        with self._lock:
+            if self._file.closed:
+                raise ValueError('write to closed event log')
+            self._append_locked(payload, line)
+            if (
+                len(self._pending) >= self.batch_size
+                or time.monotonic() - self._oldest_pending >= self.flush_interval
+            ):
+                self._flush_locked()
+            elif self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_when_due, name='event-log-flush', daemon=True)
+                self._flusher.start()
+
+    def _append_locked(self, payload: Dict[str, Any], line: bytes) -> None:
+        if not self._pending:
+            self._oldest_pending = time.monotonic()
+            self._due.notify()
+        self._pending.append(line)
+
+    def _flush_when_due(self) -> None:
+        """Background thread: flush a batch once its oldest record reaches ``flush_interval``."""
+        with self._due:
+            while not self._file.closed:
+                if self._oldest_pending is None:
+                    self._due.wait()
+                    continue
+                delay = self._oldest_pending + self.flush_interval - time.monotonic()
+                if delay > 0:
+                    self._due.wait(delay)
+                    continue
+                try:
+                    self._flush_locked()
+                except OSError:
+                    # The records stay pending; the next write, flush() or close() raises.
+                    self._due.wait(max(self.flush_interval, 0.1))
+
+    def log(self, feedback: CustomerFeedback) -> None:
+        self.write(feedback_event(feedback))
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._flush_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file.closed:
+                return
+            self._flush_locked()
+            self._file.close()
+            self._due.notify()
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        locked_append(self._file.fileno(), b''.join(self._pending))
+        self._pending = []
+        self._oldest_pending = None
+        self._file.flush()
+        if self.durability != 'none':
+            os.fsync(self._file.fileno())
+
+    def __enter__(self) -> 'FeedbackEventLog':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
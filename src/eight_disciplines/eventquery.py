@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""Time-range queries over the feedback event log using a sparse offset index."""
+import argparse
+import json
+import mmap
+import os
+import sys
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from eight_disciplines.binformat import body_to_line, decode_body, is_binary, iter_bodies
+from eight_disciplines.eventlog import TimeBound, default_log_path, line_timestamp, parse_timestamp
+from eight_disciplines.segments import iter_segment_lines
+
+INDEX_SUFFIX = '.idx'
+INDEX_VERSION = 1
+DEFAULT_STRIDE = 64 * 1024
+
+
+class EventLogIndex:
+    """
+    Sparse timestamp -> byte offset index stored next to the log as ``<log>.idx``.
+
+    One entry is kept for the first complete line at or after every ``stride``
+    bytes. The index is extended incrementally as the log grows and rebuilt if
+    the log shrinks. Lookups assume records were appended in time order.
+    """
+
+    def __init__(self, log_path: str, stride: int = DEFAULT_STRIDE):
+        self.log_path = log_path
+        self.index_path = log_path + INDEX_SUFFIX
+        self.stride = stride
+        self.indexed_size = 0
+        self.timestamps: List[datetime] = []
+        self.offsets: List[int] = []
+
+    @classmethod
+    def open(cls, log_path: str, stride: int = DEFAULT_STRIDE, refresh: bool = True) -> 'EventLogIndex':
+        index = cls(log_path, stride)
+        index._load()
+        if refresh:
+            index.refresh()
+        return index
+
+    def _load(self) -> None:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != INDEX_VERSION or data.get('stride') != self.stride:
+            return
+        self.indexed_size = data['indexed_size']
+        self.offsets = [offset for _, offset in data['entries']]
+        self.timestamps = [parse_timestamp(ts) for ts, _ in data['entries']]
+
+    def _save(self) -> None:
+        data = {
+            'version': INDEX_VERSION,
+            'stride': self.stride,
+            'indexed_size': self.indexed_size,
+            'entries': [[ts.isoformat(), offset] for ts, offset in zip(self.timestamps, self.offsets)],
+        }
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as fh:
+            json.dump(data, fh, separators=(',', ':'))
+        os.replace(tmp_path, self.index_path)
+
+    def refresh(self) -> None:
+        size = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+        if size == self.indexed_size:
+            return
+        if size < self.indexed_size:
+            self.indexed_size = 0
+            self.timestamps = []
+            self.offsets = []
+        if size:
+            with open(self.log_path, 'rb') as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                self._extend(mm, size)
+        self.indexed_size = size
+        self._save()
+
+    def _extend(self, mm: mmap.mmap, size: int) -> None:
+        pos = self.offsets[-1] + self.stride if self.offsets else 0
+        while pos < size:
+            start = 0 if pos == 0 else mm.find(b'\n', pos - 1) + 1
+            if (pos and start == 0) or start >= size:
+                break
+            end = mm.find(b'\n', start)
+            if end < 0:
+                break
+            ts = line_timestamp(mm[start:end])
+            if ts is not None:
+                self.timestamps.append(ts)
+                self.offsets.append(start)
+            pos = start + self.stride
+
+    def byte_range(self, start: Optional[datetime], end: Optional[datetime]) -> Tuple[int, Optional[int]]:
+        """Offsets bracketing every line with ``start <= timestamp <= end``."""
+        lo = 0
+        if start is not None:
+            i = bisect_left(self.timestamps, start)
+            lo = self.offsets[i - 1] if i > 0 else 0
+        hi = None
+        if end is not None:
+            i = bisect_right(self.timestamps, end)
+            if i < len(self.offsets):
+                hi = self.offsets[i]
+        return lo, hi
+
+
+def iter_matching_lines(
+    log_path: str,
+    start: TimeBound = None,
+    end: TimeBound = None,
+    event: Optional[str] = None,
+    *,
+    index: Optional[EventLogIndex] = None,
+) -> Iterator[bytes]:
+    """
+    Raw log lines (without the newline) in ``[start, end]``, optionally only for
+    one event type. Only the indexed byte range is scanned and lines are
+    filtered on their raw bytes; nothing is JSON-decoded. Binary logs (see
+    binformat) are scanned in full and yield the equivalent JSON lines; a
+    segment directory is read through ``segments.iter_segment_lines``.
+    """
+    if os.path.isdir(log_path):
+        yield from iter_segment_lines(log_path, start, end, event)
+        return
+    start_ts = parse_timestamp(start) if start is not None else None
+    end_ts = parse_timestamp(end) if end is not None else None
+    if not os.path.exists(log_path) or os.path.getsize(log_path) == 0:
+        return
+    if is_binary(log_path):
+        yield from _binary_lines(log_path, start_ts, end_ts, event)
+        return
+    if index is None:
+        index = EventLogIndex.open(log_path)
+    lo, hi = index.byte_range(start_ts, end_ts)
+    needle = b'"event": ' + json.dumps(event).encode('utf-8') if event is not None else None
+
+    with open(log_path, 'rb') as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        limit = len(mm) if hi is None else hi
+        pos = lo
+        while pos < limit:
+            nl = mm.find(b'\n', pos, limit)
+            if nl < 0:
+                # Trailing partial line (a writer is mid-append) or end of range.
+                if hi is None:
+                    break
+                nl = limit
+            line = mm[pos:nl]
+            pos = nl + 1
+            if needle is not None and needle not in line:
+                continue
+            if start_ts is not None or end_ts is not None:
+                ts = line_timestamp(line)
+                if ts is None or (start_ts is not None and ts < start_ts) or (end_ts is not None and ts > end_ts):
+                    continue
+            yield line
+
+
+def _binary_lines(log_path: str, start_ts, end_ts, event: Optional[str]) -> Iterator[bytes]:
+    for body in iter_bodies(log_path):
+        record = decode_body(body)
+        if event is not None and (not isinstance(record, dict) or record.get('event') != event):
+            continue
+        if start_ts is not None or end_ts is not None:
+            try:
+                ts = parse_timestamp(record['timestamp'])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if (start_ts is not None and ts < start_ts) or (end_ts is not None and ts > end_ts):
+                continue
+        yield body_to_line(body).encode('utf-8')
+
+
+def query_events(
+    log_path: Optional[str] = None,
+    start: TimeBound = None,
+    end: TimeBound = None,
+    event: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    for line in iter_matching_lines(log_path or default_log_path(), start, end, event):
+        yield json.loads(line)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Query the feedback event log by time range.')
+    parser.add_argument('log', nargs='?', default=None, help='Event log file or segment directory (default: ACME_FEEDBACK_LOG).')
+    parser.add_argument('--since', help='Inclusive ISO-8601 lower bound (UTC if no offset).')
+    parser.add_argument('--until', help='Inclusive ISO-8601 upper bound (UTC if no offset).')
+    parser.add_argument('--event', help='Only events of this type, e.g. customer_feedback_submitted.')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    out = sys.stdout.buffer
+    for line in iter_matching_lines(args.log or default_log_path(), args.since, args.until, args.event):
+        out.write(line + b'\n')
+    out.flush()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Single-writer process for the feedback event log.
+
+Intake workers that set ``ACME_FEEDBACK_SINK`` to the sink's Unix socket send
+their events there (one JSON line each) instead of opening the log file
+themselves; the sink is the only process appending to the log, so it can
+batch freely. Lines that are not a JSON object are dropped and counted.
+
+    python -m eight_disciplines.eventsink --socket /run/acme_events.sock --log feedback_events.jsonl
+    ACME_FEEDBACK_SINK=/run/acme_events.sock python acme_customer_feedback.py ...
+"""
+import argparse
+import json
+import os
+import signal
+import socketserver
+import threading
+from typing import Optional
+
+from eight_disciplines.eventlog import FeedbackEventLog, default_log_path
+from eight_disciplines.segments import open_event_log
+from eight_disciplines.sinkclient import EventSinkClient, sink_socket_from_env
+
+
+class _SinkHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            self.server.accept_line(line)
+
+
+class EventSinkServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, socket_path: str, event_log: FeedbackEventLog):
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        self.socket_path = socket_path
+        self.event_log = event_log
+        self.records = 0
+        self.invalid_lines = 0
+        self._count_lock = threading.Lock()
+        super().__init__(socket_path, _SinkHandler)
+
+    def accept_line(self, line: bytes) -> None:
+        try:
+            payload = json.loads(line)
+        except ValueError:
+            payload = None
+        if not isinstance(payload, dict):
+            with self._count_lock:
+                self.invalid_lines += 1
+            return
+        self.event_log.write(payload)
+        with self._count_lock:
+            self.records += 1
+
+    def service_actions(self):
+        # Ages out buffered records while workers are quiet.
+        self.event_log.flush()
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def serve(socket_path: str, event_log: Optional[FeedbackEventLog] = None) -> None:
+    """Serve until interrupted, then flush and close the log."""
+    if event_log is None:
+        event_log = open_event_log(default_log_path())
+    server = EventSinkServer(socket_path, event_log)
+    try:
+        server.serve_forever(poll_interval=event_log.flush_interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        event_log.close()
+
+
+def _exit_on_sigterm(signum, frame):
+    raise SystemExit(0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Single writer for the feedback event log.')
+    parser.add_argument('--socket', default=sink_socket_from_env() or 'acme_events.sock', help='Socket to listen on (default: ACME_FEEDBACK_SINK).')
+    parser.add_argument('--log', help='Event log to write (default: ACME_FEEDBACK_LOG).')
+    args = parser.parse_args(argv)
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+    event_log = None
+    if args.log:
+        event_log = open_event_log(args.log)
+    serve(args.socket, event_log)
+
+
+if __name__ == '__main__':
+    main()
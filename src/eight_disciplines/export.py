@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Bulk export of scrum reports in constant memory.
+
+Input is JSONL: defaults documents (as for ``--batch``), or ``--batch`` /
+``--format json`` result documents, whose ``report`` is used. Every report is
+written to the output as soon as it is rendered, followed by a newline, so
+each one reads exactly as ``--format scrum`` (or ``plain``) prints it.
+
+    python -m eight_disciplines.export issues.jsonl --output reports.txt
+    python acme_customer_feedback.py --batch issues.jsonl | python -m eight_disciplines.export - --format plain
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, Iterable, Iterator, Optional, TextIO
+
+from eight_disciplines.acme_customer_feedback import build_eight_disciplines
+from eight_disciplines.reportgenerator import (
+    SCRUM_REPORT_FOOTER,
+    SCRUM_REPORT_HEADER,
+    ReportGenerator,
+    render_scrum_reports,
+)
+from eight_disciplines.survey_tools import get_eight_disciplines_inputs, get_issue
+
+
+def report_from_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """The 8D report for one input record (a defaults or result document)."""
+    if isinstance(record.get('report'), dict):
+        return record['report']
+    _, eight_d_data = get_eight_disciplines_inputs(record, interactive=False)
+    return build_eight_disciplines(get_issue(record), eight_d_data).generate_machine_readable_report()
+
+
+def iter_reports(lines: Iterable[str], errors: Optional[TextIO] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Reports for a JSONL stream; unusable lines and ``--batch`` error records
+    are reported to ``errors`` and skipped.
+    """
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            if errors is not None:
+                errors.write(f'line {line_no}: invalid JSON: {exc}\n')
+            continue
+        if not isinstance(record, dict):
+            if errors is not None:
+                errors.write(f'line {line_no}: expected a JSON object\n')
+            continue
+        if 'error' in record:
+            # A --batch error record for one of its own input lines.
+            if errors is not None:
+                errors.write(f'line {line_no}: --batch error: {record["error"]}\n')
+            continue
+        yield report_from_record(record)
+
+
+def export_reports(reports: Iterable[Dict[str, Any]], out: TextIO, *, framed: bool = True, workers: int = 1) -> int:
+    """
+    Write the scrum report of every report to ``out``; ``framed`` adds the
+    ``--format scrum`` header and footer. With ``workers`` > 1 rendering is
+    fanned out via ``render_scrum_reports`` (still in bounded memory).
+    """
+    count = 0
+    if workers > 1:
+        for text in render_scrum_reports(reports, workers=workers):
+            if framed:
+                out.write(SCRUM_REPORT_HEADER)
+                out.write(text)
+                out.write('\n' + SCRUM_REPORT_FOOTER + '\n')
+            else:
+                out.write(text + '\n')
+            count += 1
+    else:
+        for report in reports:
+            ReportGenerator(report).write_scrum_report(out, framed=framed)
+            out.write('\n')
+            count += 1
+    out.flush()
+    return count
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Export scrum reports for a JSONL stream of issues.')
+    parser.add_argument('input', nargs='?', default='-', help='Defaults or --batch result JSONL (default: stdin).')
+    parser.add_argument('--output', help='Write here instead of stdout.')
+    parser.add_argument('--format', choices=['scrum', 'plain'], default='scrum', help='scrum adds the report header/footer, as the CLI does.')
+    parser.add_argument('--workers', type=int, default=1, help='Render in a process pool of this size.')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    source = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8')
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        count = export_reports(iter_reports(source, sys.stderr), out, framed=args.format == 'scrum', workers=args.workers)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    if args.output:
+        print(f'{count} reports written to {args.output}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
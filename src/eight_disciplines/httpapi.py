@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Minimal asyncio HTTP/1.1 service for the 8D workflow (stdlib only).
+
+Every POST endpoint takes a defaults document as its JSON body, the same
+shape as ``customer_defaults.json``:
+
+    POST /workflow-status   -> the ``--format json`` document
+    POST /scrum-report      -> text/plain scrum report (as ``--format scrum``)
+    POST /congratulations   -> text/plain congratulations letter
+    POST /feedback          -> {"feedback": str, "rating": int|null}, appended to the event log
+                               (repeats are suppressed with ACME_FEEDBACK_DEDUP_DB; see dedup)
+    GET  /health            -> {"status": "ok"}
+"""
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from http import HTTPStatus
+from typing import Any, Dict, Optional, Tuple
+
+from eight_disciplines.acme_customer_feedback import build_eight_disciplines, evaluate_defaults, log_feedback
+from eight_disciplines.dedup import FeedbackDeduplicator, open_deduplicator
+from eight_disciplines.eventlog import FeedbackEventLog
+from eight_disciplines.segments import open_event_log
+from eight_disciplines.survey_tools import CustomerFeedback, get_eight_disciplines_inputs, get_issue
+from eight_disciplines.timing import record_timings, span
+
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+KEEP_ALIVE_TIMEOUT = 15.0
+
+
+class HTTPError(Exception):
+    def __init__(self, status: HTTPStatus, message: Optional[str] = None):
+        super().__init__(message or status.phrase)
+        self.status = status
+        self.message = message or status.phrase
+
+
+def _eight_d_from_defaults(defaults: Dict[str, Any]):
+    issue = get_issue(defaults)
+    _, eight_d_data = get_eight_disciplines_inputs(defaults, interactive=False)
+    return build_eight_disciplines(issue, eight_d_data)
+
+
+# Rendering runs in the executor; these stay module-level so a process pool can pickle them.
+# Spans are only collected in-process, so --workers renders are not timed.
+def render_scrum(defaults: Dict[str, Any]) -> str:
+    with span('render'):
+        return _eight_d_from_defaults(defaults).inform_scrum()
+
+
+def render_congratulations(defaults: Dict[str, Any]) -> str:
+    with span('render'):
+        return _eight_d_from_defaults(defaults).congratulate_team()
+
+
+class EightDHTTPServer:
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = 64,
+        executor: Optional[Executor] = None,
+        event_log: Optional[FeedbackEventLog] = None,
+        dedup: Optional[FeedbackDeduplicator] = None,
+        flush_interval: float = 0.5,
+    ):
+        self.executor = executor
+        self.event_log = event_log
+        self.dedup = dedup
+        self.flush_interval = flush_interval
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8080, *, backlog: int = 1024) -> Tuple[str, int]:
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._server = await asyncio.start_server(
+            self._handle_connection, host, port, limit=MAX_HEADER_BYTES, backlog=backlog
+        )
+        if self.event_log is not None:
+            self._flusher = asyncio.ensure_future(self._flush_periodically())
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self) -> None:
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self.event_log is not None:
+            self.event_log.close()
+        if self.dedup is not None:
+            self.dedup.close()
+
+    async def _flush_periodically(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await loop.run_in_executor(None, self.event_log.flush)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), KEEP_ALIVE_TIMEOUT)
+                except HTTPError as exc:
+                    await self._respond(writer, exc.status, {'error': exc.message}, keep_alive=False)
+                    return
+                if request is None:
+                    return
+                method, path, version, headers, body = request
+                keep_alive = self._keep_alive(version, headers)
+                async with self._semaphore:
+                    try:
+                        status, payload = await self._dispatch(method, path, body)
+                    except HTTPError as exc:
+                        status, payload = exc.status, {'error': exc.message}
+                    except Exception as exc:  # one bad request must not take the connection handler down
+                        status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': f'{type(exc).__name__}: {exc}'}
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    return
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError as exc:
+            if exc.partial:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, 'incomplete request head')
+            return None
+        except asyncio.LimitOverrunError:
+            raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, version = lines[0].split(' ')
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, 'malformed request line')
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+        if 'chunked' in headers.get('transfer-encoding', '').lower():
+            raise HTTPError(HTTPStatus.LENGTH_REQUIRED, 'chunked bodies are not supported')
+        try:
+            length = int(headers.get('content-length', '0'))
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, 'invalid Content-Length')
+        if length < 0:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, 'invalid Content-Length')
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        body = await reader.readexactly(length) if length else b''
+        return method.upper(), target.split('?', 1)[0], version, headers, body
+
+    @staticmethod
+    def _keep_alive(version: str, headers: Dict[str, str]) -> bool:
+        connection = headers.get('connection', '').lower()
+        if version == 'HTTP/1.0':
+            return connection == 'keep-alive'
+        return connection != 'close'
+
+    @staticmethod
+    def _json_body(body: bytes) -> Dict[str, Any]:
+        try:
+            document = json.loads(body or b'{}')
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, 'body is not valid JSON')
+        if not isinstance(document, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, 'body must be a JSON object')
+        return document
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[HTTPStatus, Any]:
+        if path == '/health':
+            if method != 'GET':
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED)
+            return HTTPStatus.OK, {'status': 'ok'}
+        if path not in ('/workflow-status', '/scrum-report', '/congratulations', '/feedback'):
+            raise HTTPError(HTTPStatus.NOT_FOUND)
+        if method != 'POST':
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED)
+
+        document = self._json_body(body)
+        loop = asyncio.get_running_loop()
+        if path == '/workflow-status':
+            return HTTPStatus.OK, evaluate_defaults(document)
+        if path == '/scrum-report':
+            return HTTPStatus.OK, await loop.run_in_executor(self.executor, render_scrum, document)
+        if path == '/congratulations':
+            return HTTPStatus.OK, await loop.run_in_executor(self.executor, render_congratulations, document)
+        feedback = self._feedback_from(document)
+        # The event log may block on its file lock or disk; keep that off the event loop.
+        # Default thread pool: self.executor may be a process pool, which cannot take the log.
+        logged = await loop.run_in_executor(None, self._log_feedback, feedback)
+        return HTTPStatus.ACCEPTED, {'status': 'accepted' if logged else 'duplicate'}
+
+    def _feedback_from(self, document: Dict[str, Any]) -> CustomerFeedback:
+        feedback = document.get('feedback')
+        rating = document.get('rating')
+        if not isinstance(feedback, str) or not feedback.strip():
+            raise HTTPError(HTTPStatus.BAD_REQUEST, '"feedback" must be a non-empty string')
+        if rating is not None and (not isinstance(rating, int) or isinstance(rating, bool) or not 0 <= rating <= 10):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, '"rating" must be an integer from 0 to 10 or null')
+        if self.event_log is None:
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, 'feedback logging is disabled')
+        return CustomerFeedback(feedback=feedback, rating=rating)
+
+    def _log_feedback(self, feedback: CustomerFeedback) -> bool:
+        with span('log_feedback'):
+            return log_feedback(feedback, self.event_log, self.dedup)
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: HTTPStatus, payload: Any, keep_alive: bool) -> None:
+        if isinstance(payload, str):
+            body = payload.encode('utf-8')
+            content_type = 'text/plain; charset=utf-8'
+        else:
+            body = json.dumps(payload).encode('utf-8')
+            content_type = 'application/json'
+        head = (
+            f'HTTP/1.1 {status.value} {status.phrase}\r\n'
+            f'Content-Type: {content_type}\r\n'
+            f'Content-Length: {len(body)}\r\n'
+            f'Connection: {"keep-alive" if keep_alive else "close"}\r\n'
+            '\r\n'
+        )
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+
+async def _run(args) -> None:
+    executor = ProcessPoolExecutor(max_workers=args.workers) if args.workers else None
+    server = EightDHTTPServer(
+        max_concurrency=args.max_concurrency,
+        executor=executor,
+        event_log=open_event_log(),
+        dedup=open_deduplicator(),
+    )
+    host, port = await server.start(args.host, args.port)
+    print(f'Serving 8D workflow API on http://{host}:{port}', flush=True)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+        if executor is not None:
+            executor.shutdown()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Serve the 8D workflow over HTTP.')
+    parser.add_argument('--host', default=os.getenv('ACME_HTTP_HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(os.getenv('ACME_HTTP_PORT', '8080')))
+    parser.add_argument('--max-concurrency', type=int, default=64, help='Requests processed at once; others wait.')
+    parser.add_argument('--workers', type=int, default=0, help='Render in a process pool of this size (0: thread pool).')
+    parser.add_argument(
+        '--timings',
+        nargs='?',
+        const='-',
+        default=os.getenv('ACME_TIMINGS') or None,
+        metavar='PATH',
+        help='On shutdown, dump per-stage wall/CPU time as JSON to PATH (or stderr for "-").',
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with record_timings(args.timings):
+        try:
+            asyncio.run(_run(args))
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
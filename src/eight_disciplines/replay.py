@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Load generator for the interactive survey flow.
+
+A transcript is one JSON line: the stored ``defaults`` a session starts from,
+the ``answers`` typed at each prompt, whether the customer was asked for a
+``rate``-ing, and optionally the ``result`` defaults the session must end
+with. Replaying feeds the answers through the real prompt functions
+(``get_customer_contact``, ``get_customer_feedback``,
+``get_eight_disciplines_inputs`` and ``prompt_for_rating``) via ``input_fn``,
+so a changed prompt sequence shows up as a failed session rather than a hang.
+
+    python -m eight_disciplines.replay run --sessions 5000 --workers 4        # randomized transcripts
+    python -m eight_disciplines.replay run --transcripts sessions.jsonl --repeat 10
+    python -m eight_disciplines.replay generate --sessions 100 --output sessions.jsonl
+    python -m eight_disciplines.replay record --defaults-file customer_defaults.json --output sessions.jsonl
+
+Randomized answers include invalid y/n and rating replies, so the retry
+loops in ``prompt_yn``/``prompt_for_rating`` are exercised too.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from eight_disciplines.analytics import QuantileSketch
+from eight_disciplines.defaults_store import open_defaults_store
+from eight_disciplines.survey_tools import (
+    get_customer_contact,
+    get_customer_feedback,
+    get_eight_disciplines_inputs,
+    prompt_for_rating,
+)
+from eight_disciplines.synthetic import synthetic_defaults
+
+CHUNK_SIZE = 250
+MAX_ERROR_SAMPLES = 10
+
+_INVALID_YN = ('maybe', 'yep', '?', 'nah')
+_INVALID_RATING = ('ten', '11', '-1', '')
+_TEXT_ANSWERS = ('Late delivery', 'Front desk', 'Yesterday', 'Replace the unit', 'Check the supplier', 'Alex, Blake')
+
+
+class ReplayError(Exception):
+    """A transcript that no longer matches the prompt sequence."""
+
+
+def _discard(_message: str) -> None:
+    pass
+
+
+def _session(defaults: Dict[str, Any], input_fn: Callable[[str], str], print_fn: Callable[[str], None], rate: bool):
+    """The interactive branch of ``customer_service_chatbot``, plus the optional rating."""
+    defaults = get_customer_contact(defaults, input_fn=input_fn, print_fn=print_fn)
+    defaults, _, _ = get_customer_feedback(defaults, input_fn=input_fn, print_fn=print_fn)
+    defaults, _ = get_eight_disciplines_inputs(defaults, interactive=True, input_fn=input_fn, print_fn=print_fn)
+    rating = prompt_for_rating(input_fn=input_fn, print_fn=print_fn) if rate else None
+    return defaults, rating
+
+
+def replay_session(transcript: Dict[str, Any], print_fn: Callable[[str], None] = _discard) -> Dict[str, Any]:
+    """Run one transcript; raises ReplayError when its answers and the prompts disagree."""
+    answers = iter(transcript['answers'])
+
+    def input_fn(prompt: str) -> str:
+        try:
+            return next(answers)
+        except StopIteration:
+            raise ReplayError(f'transcript ran out of answers at prompt {prompt!r}') from None
+
+    defaults, _ = _session(dict(transcript.get('defaults') or {}), input_fn, print_fn, bool(transcript.get('rate')))
+    if next(answers, None) is not None:
+        raise ReplayError('session finished with answers left over')
+    expected = transcript.get('result')
+    if expected is not None and expected != defaults:
+        raise ReplayError('session ended with different defaults than recorded')
+    return defaults
+
+
+def record_session(
+    defaults: Dict[str, Any],
+    input_fn: Callable[[str], str] = input,
+    print_fn: Callable[[str], None] = print,
+    *,
+    rate: bool = False,
+) -> Dict[str, Any]:
+    """Run a session against ``input_fn`` and return its transcript."""
+    answers: List[str] = []
+
+    def recording_input(prompt: str) -> str:
+        answer = input_fn(prompt)
+        answers.append(answer)
+        return answer
+
+    start = dict(defaults)
+    result, _ = _session(dict(defaults), recording_input, print_fn, rate)
+    return {'defaults': start, 'answers': answers, 'rate': rate, 'result': result}
+
+
+def _random_responder(rng: random.Random) -> Callable[[str], str]:
+    def respond(prompt: str) -> str:
+        if prompt.endswith(('(Y/n) ', '(y/N) ')):
+            if rng.random() < 0.1:
+                return rng.choice(_INVALID_YN)
+            return rng.choice(('', 'y', 'n', 'yes', 'no', 'Y'))
+        if 'rate your experience' in prompt:
+            if rng.random() < 0.15:
+                return rng.choice(_INVALID_RATING)
+            return str(rng.randint(0, 10))
+        if 'optional' in prompt and rng.random() < 0.3:
+            return ''
+        return rng.choice(_TEXT_ANSWERS)
+
+    return respond
+
+
+def generate_transcripts(count: int, seed: int = 0, *, start: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Randomized transcripts, recorded by answering the real prompts at random.
+    Transcript ``i`` depends only on ``seed`` and ``i``, so workers can
+    generate disjoint ranges independently.
+    """
+    for i in range(start, start + count):
+        rng = random.Random(seed * 1_000_003 + i)
+        defaults = next(synthetic_defaults(1, rng.randrange(2 ** 32)))
+        # Leave some fields unset so both the "enter" and "confirm" prompts occur.
+        for key in list(defaults):
+            if rng.random() < 0.3:
+                defaults[key] = None
+        yield record_session(defaults, _random_responder(rng), _discard, rate=rng.random() < 0.5)
+
+
+def _replay_chunk(transcripts: List[Dict[str, Any]]) -> Tuple[QuantileSketch, int, List[str]]:
+    sketch = QuantileSketch()
+    failures = 0
+    samples: List[str] = []
+    clock = time.perf_counter
+    for transcript in transcripts:
+        started = clock()
+        try:
+            replay_session(transcript)
+        except Exception as exc:  # one broken session must not end the chunk or the run
+            failures += 1
+            if len(samples) < MAX_ERROR_SAMPLES:
+                samples.append(str(exc) if isinstance(exc, ReplayError) else f'{type(exc).__name__}: {exc}')
+            continue
+        sketch.add((clock() - started) * 1000.0)
+    return sketch, failures, samples
+
+
+def _generate_and_replay(spec: Tuple[int, int, int]) -> Tuple[QuantileSketch, int, List[str]]:
+    seed, start, count = spec
+    return _replay_chunk(list(generate_transcripts(count, seed, start=start)))
+
+
+def _chunks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    chunk: List[Any] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_replay(
+    transcripts: Optional[List[Dict[str, Any]]] = None,
+    *,
+    sessions: int = 1000,
+    seed: int = 0,
+    repeat: int = 1,
+    workers: int = 1,
+    chunk_size: int = CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """
+    Replay ``transcripts`` ``repeat`` times, or ``sessions`` randomized ones
+    generated inside the workers. Latencies cover the prompt logic only
+    (output is discarded); generation time is not counted.
+    """
+    if transcripts is not None:
+        func = _replay_chunk
+        work = list(_chunks((t for _ in range(repeat) for t in transcripts), chunk_size))
+    else:
+        func = _generate_and_replay
+        work = [(seed, start, min(chunk_size, sessions - start)) for start in range(0, sessions, chunk_size)]
+
+    latency = QuantileSketch()
+    failures = 0
+    samples: List[str] = []
+    started = time.perf_counter()
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(func, work))
+    else:
+        results = [func(item) for item in work]
+    busy = 0.0
+    for sketch, chunk_failures, chunk_samples in results:
+        latency.merge(sketch)
+        busy += sketch.total
+        failures += chunk_failures
+        samples.extend(chunk_samples[:MAX_ERROR_SAMPLES - len(samples)])
+    elapsed = time.perf_counter() - started
+
+    total = latency.count + failures
+    return {
+        'sessions': total,
+        'failed': failures,
+        'workers': workers,
+        'elapsed_seconds': elapsed,
+        'sessions_per_sec': total / elapsed if elapsed else None,
+        # Per-worker rate without process start-up and (for generated runs) generation.
+        'replay_sessions_per_sec': latency.count / (busy / 1000.0) * workers if busy else None,
+        'latency_ms': latency.summary(),
+        'errors': samples,
+    }
+
+
+def _read_transcripts(path: str) -> List[Dict[str, Any]]:
+    fh = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8')
+    try:
+        return [json.loads(line) for line in fh if line.strip()]
+    finally:
+        if fh is not sys.stdin:
+            fh.close()
+
+
+def _write_transcripts(transcripts: Iterable[Dict[str, Any]], path: Optional[str], mode: str = 'w') -> int:
+    fh = open(path, mode, encoding='utf-8') if path else sys.stdout
+    count = 0
+    try:
+        for transcript in transcripts:
+            fh.write(json.dumps(transcript) + '\n')
+            count += 1
+    finally:
+        if fh is not sys.stdout:
+            fh.close()
+    return count
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Replay survey sessions through the interactive prompts.')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run = sub.add_parser('run', help='Replay sessions and print throughput and latency as JSON.')
+    run.add_argument('--transcripts', metavar='PATH', help='Transcript JSONL to replay (- for stdin); default: randomized sessions.')
+    run.add_argument('--sessions', type=int, default=1000, help='Randomized sessions to run (without --transcripts).')
+    run.add_argument('--repeat', type=int, default=1, help='Replay the transcript file this many times.')
+    run.add_argument('--seed', type=int, default=0)
+    run.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    run.add_argument('--max-p99-ms', type=float, help='Exit with status 1 when p99 latency exceeds this.')
+
+    generate = sub.add_parser('generate', help='Write randomized transcripts.')
+    generate.add_argument('--sessions', type=int, default=100)
+    generate.add_argument('--seed', type=int, default=0)
+    generate.add_argument('--output', help='Transcript file (default: stdout).')
+
+    record = sub.add_parser('record', help='Answer the prompts yourself and append the transcript.')
+    record.add_argument('--defaults-file', default=os.getenv('ACME_DEFAULTS_FILE', 'customer_defaults.json'), help='Stored defaults to start from (not modified).')
+    record.add_argument('--rate', action='store_true', help='Also ask for a rating.')
+    record.add_argument('--output', required=True, help='Transcript file to append to.')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == 'generate':
+        _write_transcripts(generate_transcripts(args.sessions, args.seed), args.output)
+        return
+    if args.command == 'record':
+        with open_defaults_store(args.defaults_file) as store:
+            defaults = store.load()
+        _write_transcripts([record_session(defaults, rate=args.rate)], args.output, mode='a')
+        return
+
+    transcripts = _read_transcripts(args.transcripts) if args.transcripts else None
+    result = run_replay(transcripts, sessions=args.sessions, seed=args.seed, repeat=args.repeat, workers=args.workers)
+    print(json.dumps(result, indent=2))
+    p99 = result['latency_ms']['p99']
+    if result['failed'] or (args.max_p99_ms is not None and p99 is not None and p99 > args.max_p99_ms):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,10 @@
+import os
 import textwrap
-from typing import Any, Dict, List, Set
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, TextIO
 
 # Issue is considered COMPLETE only if these are provided.
 ISSUE_REQUIRED_FIELDS = (
@@ -16,6 +21,9 @@ def is_issue_complete(issue: Any) -> bool:
     return all(issue.get(k) is not None for k in ISSUE_REQUIRED_FIELDS)
 
 
+_ABSENT = object()
+
+
 def _is_missing(value: Any) -> bool:
     """
     Missingness semantics:
@@ -30,61 +38,112 @@ def _is_missing(value: Any) -> bool:
     return False
 
 
+STEP_PHRASES = {
+    "issue": {
+        "todo": "address the issue gifted to us by our dear customer",
+        "done": "received the issue from our dear customer",
+        "definition_complete": "The issue has been acknowledged"
+    },
+    "plan": {
+        "todo": "create a plan to address the issue",
+        "done": "created a plan to address the issue",
+        "definition_complete": "A plan has been created and approved to address the issue."
+    },
+    "prerequisites": {
+        "todo": "identify the prerequisites needed to carry out the plan",
+        "done": "identified the prerequisites needed to carry out the plan",
+        "definition_complete": "All necessary prerequisites have been identified and are available to carry out the plan."
+    },
+    "team": {
+        "todo": "assemble the team of people with product/process knowledge to carry out the plan",
+        "done": "assembled the team of people with product/process knowledge to carry out the plan",
+        "definition_complete": "A team with the appropriate knowledge and skills has been assembled to carry out the plan."
+    },
+    "problem_description": {
+        "todo": "specify the problem by identifying in quantifiable terms the who, what, where, when, why, how, and how many (5W2H) for the problem",
+        "done": "specified the problem by identifying in quantifiable terms the who, what, where, when, why, how, and how many (5W2H) for the problem.",
+        "definition_complete": "The problem has been described in detail identifying in quantifiable terms the who, what, where, when, why, how, and how many (5W2H) for the problem."
+    },
+    "interim_containment_plan": {
+        "todo": "define and implement containment actions to isolate the problem from any customer",
+        "done": "defined and implemented containment actions to isolate the problem from any customer",
+        "definition_complete": "An interim containment plan has been put in place to isolate the problem from any customers."
+    },
+    "root_causes": {
+        "todo": "determine, identify and verify all applicable causes that could explain why the problem occurred",
+        "done": "determined, identified and verified all applicable causes that could explain why the problem occurred",
+        "definition_complete": "All applicable causes of the problem have been identified and verified, and a clear understanding of why the problem was not noticed at the time it occurred has been determined."
+    },
+    "permanent_corrections": {
+        "todo": "develop a set of permanent corrections to address the root causes",
+        "done": "developed a set of permanent corrections to address the root causes",
+        "definition_complete": "A set of permanent corrections has been developed and implemented to address the root causes of the problem."
+    },
+    "corrective_actions": {
+        "todo": "carry out corrective actions to address the immediate symptoms",
+        "done": "carried out corrective actions to address the immediate symptoms",
+        "definition_complete": "Corrective actions have been taken to address the immediate symptoms of the problem."
+    },
+    "preventive_measures": {
+        "todo": "put in place preventive measures to ensure the problem doesn't recur",
+        "done": "put in place preventive measures to ensure the problem doesn't recur",
+        "definition_complete": "Completed modifications of the management systems, operation systems, practices, and procedures to prevent recurrence of this and all similar problems"
+    }
+}
+
+
+SCRUM_REPORT_HEADER = '----------- SCRUM REPORT -------------\n'
+SCRUM_REPORT_FOOTER = '------- END OF SCRUM REPORT-----------\n'
+
+# Scrum report fragments, compiled once per step and state.
+_DONE_LINES = {step: f"    - We {p['done']}.\n" for step, p in STEP_PHRASES.items()}
+_TODO_LINES = {
+    step: f"    - We need to {p['todo']}.\n       - Definition of complete: {p['definition_complete']}\n"
+    for step, p in STEP_PHRASES.items()
+}
+_REMINDER_LINES = dict(_TODO_LINES, issue=_TODO_LINES["issue"] + "Find out why the issue is missing\n")
+_ISSUE_DETAIL_LABELS = ("       - Expectation: ", "\n       - Reality: ", "\n       - When: ", "\n       - Where: ", "\n       - Request: ")
+
+
+@lru_cache(maxsize=4096)
+def _scrum_layout(done_steps: tuple, missing_steps: tuple) -> tuple:
+    """
+    Static text of the scrum report for one done/missing partition of the steps.
+
+    The returned fragments go between the per-report values: the indented
+    issue text first, then the details of each done step (five values for
+    'issue', one otherwise). Rendering is a single interleaving join.
+    """
+    fragments = ["A customer has an issue:\n"]
+    text = "\nA quick update on our progress.\n"
+    if done_steps:
+        text += "\nHere's what we've accomplished so far:\n\n"
+        for step in done_steps:
+            text += _DONE_LINES[step]
+            if step == "issue":
+                for label in _ISSUE_DETAIL_LABELS:
+                    fragments.append(text + label)
+                    text = ""
+            else:
+                fragments.append(text + "       - ")
+            text = "\n"
+    else:
+        text += "\nWe haven't completed any steps yet. Let's get started with these first steps:\n\n"
+        text += "".join(_TODO_LINES[step] for step in missing_steps)
+    if missing_steps:
+        text += "\nLet's focus on completing the missing steps. Here's a quick reminder of what we need to do:\n\n"
+        text += "".join(_REMINDER_LINES[step] for step in missing_steps)
+    else:
+        text += "\nWe've completed all the steps!"
+    fragments.append(text)
+    return tuple(fragments)
+
+
 class ReportGenerator:
+    phrases = STEP_PHRASES
+
     def __init__(self, report: Dict[str, Any]):
         self.report = report
-        self.phrases = {
-            "issue": {
-                "todo": "address the issue gifted to us by our dear customer",
-                "done": "received the issue from our dear customer",
-                "definition_complete": "The issue has been acknowledged"
-            },
-            "plan": {
-                "todo": "create a plan to address the issue",
-                "done": "created a plan to address the issue",
-                "definition_complete": "A plan has been created and approved to address the issue."
-            },
-            "prerequisites": {
-                "todo": "identify the prerequisites needed to carry out the plan",
-                "done": "identified the prerequisites needed to carry out the plan",
-                "definition_complete": "All necessary prerequisites have been identified and are available to carry out the plan."
-            },
-            "team": {
-                "todo": "assemble the team of people with product/process knowledge to carry out the plan",
-                "done": "assembled the team of people with product/process knowledge to carry out the plan",
-                "definition_complete": "A team with the appropriate knowledge and skills has been assembled to carry out the plan."
-            },
-            "problem_description": {
-                "todo": "specify the problem by identifying in quantifiable terms the who, what, where, when, why, how, and how many (5W2H) for the problem",
-                "done": "specified the problem by identifying in quantifiable terms the who, what, where, when, why, how, and how many (5W2H) for the problem.",
-                "definition_complete": "The problem has been described in detail identifying in quantifiable terms the who, what, where, when, why, how, and how many (5W2H) for the problem."
-            },
-            "interim_containment_plan": {
-                "todo": "define and implement containment actions to isolate the problem from any customer",
-                "done": "defined and implemented containment actions to isolate the problem from any customer",
-                "definition_complete": "An interim containment plan has been put in place to isolate the problem from any customers."
-            },
-            "root_causes": {
-                "todo": "determine, identify and verify all applicable causes that could explain why the problem occurred",
-                "done": "determined, identified and verified all applicable causes that could explain why the problem occurred",
-                "definition_complete": "All applicable causes of the problem have been identified and verified, and a clear understanding of why the problem was not noticed at the time it occurred has been determined."
-            },
-            "permanent_corrections": {
-                "todo": "develop a set of permanent corrections to address the root causes",
-                "done": "developed a set of permanent corrections to address the root causes",
-                "definition_complete": "A set of permanent corrections has been developed and implemented to address the root causes of the problem."
-            },
-            "corrective_actions": {
-                "todo": "carry out corrective actions to address the immediate symptoms",
-                "done": "carried out corrective actions to address the immediate symptoms",
-                "definition_complete": "Corrective actions have been taken to address the immediate symptoms of the problem."
-            },
-            "preventive_measures": {
-                "todo": "put in place preventive measures to ensure the problem doesn't recur",
-                "done": "put in place preventive measures to ensure the problem doesn't recur",
-                "definition_complete": "Completed modifications of the management systems, operation systems, practices, and procedures to prevent recurrence of this and all similar problems"
-            }
-        }
 
     @staticmethod
     def congrats_template(report: dict) -> str:
@@ -97,15 +156,15 @@ class ReportGenerator:
         Returns:
             str: A string containing the congratulatory email template with the relevant details from the report.
         """
-        congratulatory_message = f"Dear {ReportGenerator.join_names(report['team'])},\n\n"
-        congratulatory_message += f"Congratulations on successfully resolving the issue {report['issue']['what_happened']} {report['issue']['where_happened']}! "
-        congratulatory_message += "Your hard work and dedication to developing a solution is truly commendable.\n\n"
-        congratulatory_message += f"The plan you developed to address the issue with {report['plan']} and the following prerequisites: {report['prerequisites']} was effective in solving the problem. Your problem description: {report['problem_description']} and interim containment plan: {report['interim_containment_plan']} helped to prevent the issue from recurring. "
-        congratulatory_message += f"The root causes: {report['root_causes']}, permanent corrections: {report['permanent_corrections']}, corrective actions: {report['corrective_actions']} and preventive measures: {report['preventive_measures']} were well thought out and implemented.\n\n"
-        congratulatory_message += "Again, congratulations on this achievement! Your hard work and dedication to continuous improvement is appreciated by both internal and external customers.\n\n"
-        congratulatory_message += "Sincerely,\n[Your Name]"
-
-        return congratulatory_message
+        return (
+            f"Dear {ReportGenerator.join_names(report['team'])},\n\n"
+            f"Congratulations on successfully resolving the issue {report['issue']['what_happened']} {report['issue']['where_happened']}! "
+            "Your hard work and dedication to developing a solution is truly commendable.\n\n"
+            f"The plan you developed to address the issue with {report['plan']} and the following prerequisites: {report['prerequisites']} was effective in solving the problem. Your problem description: {report['problem_description']} and interim containment plan: {report['interim_containment_plan']} helped to prevent the issue from recurring. "
+            f"The root causes: {report['root_causes']}, permanent corrections: {report['permanent_corrections']}, corrective actions: {report['corrective_actions']} and preventive measures: {report['preventive_measures']} were well thought out and implemented.\n\n"
+            "Again, congratulations on this achievement! Your hard work and dedication to continuous improvement is appreciated by both internal and external customers.\n\n"
+            "Sincerely,\n[Your Name]"
+        )
 
     @staticmethod
     def check_empty_values(report: Dict[str, Any]) -> List[str]:
@@ -169,55 +228,121 @@ class ReportGenerator:
         return all_steps.intersection(nonempty)
 
     def scrum_report(self):
-        missing = self._check_empty_values(self.report)
-        done = self._check_nonempty_values(self.report)
-        issue_text = self.get_issue_text(self.report['issue'])
-        what_happened = self.report['issue'].get('what_happened', 'Unknown')
-        when_happened = self.report['issue'].get('when_happened', 'Unknown')
-        where_happened = self.report['issue'].get('where_happened', 'Unknown')
-        expecting_to_happen = self.report['issue'].get('expecting_to_happen', 'Unknown')
-        resolution_request = self.report['issue'].get('resolution_request', 'Unknown')
-        report_string = f"A customer has an issue:\n{textwrap.indent(issue_text, ' ' * 4)}\n"
-        report_string += "A quick update on our progress.\n"
-        done_descriptions = []
-        missing_descriptions = []
-        for key in self.phrases:
-            if key in done:
-                done_descriptions.append(key)
-            elif key in missing:
-                missing_descriptions.append(key)
-        if done_descriptions:
-            report_string += "\nHere's what we've accomplished so far:\n\n"
-            for d in done_descriptions:
-                did = self.phrases[d]['done']
-                detail = self.report[d]
-                report_string += f"    - We {did}.\n"
-                if d == 'issue':
-                    report_string += f"       - Expectation: {expecting_to_happen}\n"
-                    report_string += f"       - Reality: {what_happened}\n"
-                    report_string += f"       - When: {when_happened}\n"
-                    report_string += f"       - Where: {where_happened}\n"
-                    report_string += f"       - Request: {resolution_request}\n"
-                elif d == 'team':
-                    report_string += f"       - {self.join_names(detail)}\n"
+        return "".join(self._scrum_parts())
+
+    def iter_scrum_report(self, *, framed: bool = False) -> Iterator[str]:
+        """
+        The scrum report as successive text fragments; joined they equal
+        ``scrum_report()``, or ``EightDisciplines.inform_scrum()`` when
+        ``framed``.
+        """
+        if framed:
+            yield SCRUM_REPORT_HEADER
+        yield from self._scrum_parts()
+        if framed:
+            yield "\n" + SCRUM_REPORT_FOOTER
+
+    def write_scrum_report(self, out: TextIO, *, framed: bool = False) -> None:
+        """Write the scrum report to ``out`` without building it as one string."""
+        out.writelines(self.iter_scrum_report(framed=framed))
+
+    def _scrum_parts(self) -> List[str]:
+        report = self.report
+        issue = report['issue']
+        what_happened = issue.get('what_happened', 'Unknown')
+        when_happened = issue.get('when_happened', 'Unknown')
+        where_happened = issue.get('where_happened', 'Unknown')
+        expecting_to_happen = issue.get('expecting_to_happen', 'Unknown')
+        resolution_request = issue.get('resolution_request', 'Unknown')
+        issue_text = (
+            f"    - {what_happened}\n"
+            f"      - When: {when_happened}\n"
+            f"      - Where: {where_happened}\n"
+            f"      - Expecting to happen: {expecting_to_happen}\n"
+            f"      - Resolution request: {resolution_request}\n"
+        )
+        if len(issue_text.splitlines()) != 5:
+            # A value spans several lines; indent it exactly like get_issue_text() output.
+            issue_text = textwrap.indent(self.get_issue_text(issue), ' ' * 4)
+
+        # One pass over the steps partitions them into done/missing and
+        # collects the detail values that go between the layout fragments.
+        args = [issue_text]
+        done_steps = []
+        missing_steps = []
+        for step in self.phrases:
+            value = report.get(step, _ABSENT)
+            if value is None:
+                missing_steps.append(step)
+            elif value is _ABSENT:
+                continue
+            elif step == 'issue':
+                if is_issue_complete(value):
+                    done_steps.append(step)
+                    args += (expecting_to_happen, what_happened, when_happened, where_happened, resolution_request)
                 else:
-                    report_string += f"       - {detail}\n"
-        else:
-            report_string += "\nWe haven't completed any steps yet. Let's get started with these first steps:\n\n"
-            for d in missing_descriptions:
-                todo = self.phrases[d]['todo']
-                definition_complete = self.phrases[d]['definition_complete']
-                report_string += f"    - We need to {todo}.\n"
-                report_string += f"       - Definition of complete: {definition_complete}\n"
-        if missing_descriptions:
-            report_string += "\nLet's focus on completing the missing steps. Here's a quick reminder of what we need to do:\n\n"
-            for d in missing_descriptions:
-                definition_complete = self.phrases[d]['definition_complete']
-                todo = self.phrases[d]['todo']
-                report_string += f"    - We need to {todo}.\n"
-                report_string += f"       - Definition of complete: {definition_complete}\n"
-                if d == 'issue':
-                    report_string += "Find out why the issue is missing\n"
-        else:
-            report_string += "\nWe've completed all the steps!"
-        return report_string
+                    missing_steps.append(step)
+            elif isinstance(value, dict) and _is_missing(value):
+                missing_steps.append(step)
+            else:
+                done_steps.append(step)
+                args.append(self.join_names(value) if step == 'team' else value)
+
+        fragments = _scrum_layout(tuple(done_steps), tuple(missing_steps))
+        parts = [None] * (2 * len(args) + 1)
+        parts[::2] = fragments
+        parts[1::2] = map(format, args)
+        return parts
+
+
+def _render_scrum_chunk(reports: List[Dict[str, Any]]) -> List[str]:
+    return [ReportGenerator(report).scrum_report() for report in reports]
+
+
+def render_scrum_reports(
+    reports: Iterable[Dict[str, Any]],
+    *,
+    workers: Optional[int] = None,
+    chunk_size: int = 256,
+    serial_threshold: int = 1024,
+) -> Iterator[str]:
+    """
+    Render scrum reports for many report dicts, yielding text in input order.
+
+    Reports are fanned out in chunks of ``chunk_size`` across a process pool of
+    ``workers`` processes (default: CPU count). At most ``2 * workers`` chunks
+    are in flight, so arbitrarily long inputs are rendered in bounded memory.
+    Inputs with fewer than ``serial_threshold`` reports, or ``workers=1``, are
+    rendered in the calling process.
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be at least 1')
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    it = iter(reports)
+    head = list(islice(it, serial_threshold))
+    if workers <= 1 or len(head) < serial_threshold:
+        for report in head:
+            yield ReportGenerator(report).scrum_report()
+        for report in it:
+            yield ReportGenerator(report).scrum_report()
+        return
+
+    def chunks() -> Iterator[List[Dict[str, Any]]]:
+        for start in range(0, len(head), chunk_size):
+            yield head[start:start + chunk_size]
+        while True:
+            chunk = list(islice(it, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks():
+            pending.append(executor.submit(_render_scrum_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        for future in pending:
+            yield from future.result()
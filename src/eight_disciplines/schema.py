@@ -0,0 +1,22 @@
+"""Field layout of a customer defaults document, shared by its stores and encodings."""
+
+DEFAULT_FIELDS = (
+    'name',
+    'phone_number',
+    'email',
+    'feedback',
+    'what_happened',
+    'when_happened',
+    'where_happened',
+    'expecting_to_happen',
+    'resolution_request',
+    'plan',
+    'prerequisites',
+    'team',
+    'problem_description',
+    'interim_containment_plan',
+    'root_causes',
+    'permanent_corrections',
+    'corrective_actions',
+    'preventive_measures',
+)
@@ -0,0 +1,462 @@
+"""
+Segmented feedback event log: a directory of numbered JSONL segments plus a
+``manifest.json`` describing them.
+
+The active segment is a plain ``segment-NNNNNN.jsonl``. Once it reaches
+``max_bytes`` or ``max_age`` seconds (counted from the wall-clock ``created``
+time in its manifest entry, so the age survives restarts and one-shot
+writers) it is sealed, a new segment is started
+and the sealed one is compressed in the background (``gzip`` -> ``.jsonl.gz``,
+``lzma`` -> ``.jsonl.xz``). The manifest records every segment's file name,
+record count and first/last timestamp, so time-range readers skip sealed
+segments without opening them.
+
+``open_event_log`` takes the rotation settings from ``ACME_FEEDBACK_SEGMENT_BYTES``,
+``ACME_FEEDBACK_SEGMENT_AGE`` (seconds) and ``ACME_FEEDBACK_SEGMENT_COMPRESSION``
+(``gzip``, ``lzma`` or ``none``).
+"""
+import gzip
+import json
+import lzma
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import IO, Any, Dict, Iterator, Optional
+
+from eight_disciplines.binformat import BINARY_SUFFIX, BinaryEventLog
+from eight_disciplines.eventlog import FeedbackEventLog, TimeBound, default_log_path, line_timestamp, parse_timestamp
+from eight_disciplines.sinkclient import EventSinkClient, sink_socket_from_env
+
+try:
+    import fcntl
+except ImportError:  # not on Windows; then one writer process per directory
+    fcntl = None
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_LOCK_NAME = 'manifest.lock'
+MANIFEST_VERSION = 1
+SEGMENT_PREFIX = 'segment-'
+SEGMENT_SUFFIX = '.jsonl'
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+COMPRESSORS = {
+    'gzip': ('.gz', gzip.open),
+    'lzma': ('.xz', lzma.open),
+}
+
+
+def _segment_name(seq: int) -> str:
+    return f'{SEGMENT_PREFIX}{seq:06d}{SEGMENT_SUFFIX}'
+
+
+def _open_segment(path: str) -> IO[bytes]:
+    for ext, opener in COMPRESSORS.values():
+        if path.endswith(ext):
+            return opener(path, 'rb')
+    return open(path, 'rb')
+
+
+def read_manifest(directory: str) -> Dict[str, Any]:
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME), 'r', encoding='utf-8') as fh:
+            manifest = json.load(fh)
+    except FileNotFoundError:
+        return {'version': MANIFEST_VERSION, 'segments': []}
+    if manifest.get('version') != MANIFEST_VERSION:
+        raise ValueError(f'unsupported segment manifest version {manifest.get("version")!r}')
+    return manifest
+
+
+def _write_manifest(directory: str, manifest: Dict[str, Any]) -> None:
+    path = os.path.join(directory, MANIFEST_NAME)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        json.dump(manifest, fh, indent=1)
+    os.replace(tmp_path, path)
+
+
+def _scan_segment(path: str) -> Dict[str, Any]:
+    """Record count and exact time range of a plain segment (used when sealing it)."""
+    records, first, last = 0, None, None
+    with open(path, 'rb') as fh:
+        for line in fh:
+            if not line.endswith(b'\n'):
+                break
+            records += 1
+            ts = line_timestamp(line)
+            if ts is not None:
+                first = ts if first is None or ts < first else first
+                last = ts if last is None or ts > last else last
+    return {
+        'records': records,
+        'first': first.isoformat() if first else None,
+        'last': last.isoformat() if last else None,
+    }
+
+
+class SegmentedEventLog(FeedbackEventLog):
+    """
+    ``FeedbackEventLog`` that rotates into numbered segments.
+
+    Rotation is checked whenever a batch is flushed. ``compression`` is
+    ``'gzip'``, ``'lzma'`` or None; sealed segments are compressed on a single
+    background thread and the manifest is updated once each one is done.
+
+    Several processes may write to one directory. Every manifest change is
+    made under an exclusive ``flock`` on ``manifest.lock`` against a fresh read
+    of the file, and batches are appended under a shared lock, so a segment is
+    never sealed while a batch is being written to it. Sealing rescans the
+    segment, which makes the record count and time range of sealed segments
+    exact whatever each writer counted; writers that find their segment sealed
+    move on to the new active one. Without ``fcntl`` (Windows) only one writer
+    process per directory is supported; run ``eight_disciplines.eventsink``
+    in front of the log instead.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age: Optional[float] = None,
+        compression: Optional[str] = 'gzip',
+        **kwargs,
+    ):
+        if compression is not None and compression not in COMPRESSORS:
+            raise ValueError(f'compression must be one of {", ".join(COMPRESSORS)} or None')
+        if max_bytes < 1:
+            raise ValueError('max_bytes must be at least 1')
+        self.directory = directory or default_log_path()
+        os.makedirs(self.directory, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compression = compression
+        self._manifest_lock = threading.Lock()
+        self._lock_file = open(os.path.join(self.directory, MANIFEST_LOCK_NAME), 'a')
+        self._manifest_key = None
+        # Records buffered in this process, then records written per segment
+        # but not yet merged into the manifest.
+        self._batch = _new_stats()
+        self._unsaved: Dict[int, Dict[str, Any]] = {}
+        self._compressor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='segment-compress')
+
+        with self._locked_manifest() as manifest:
+            segments = manifest['segments']
+            if not segments or segments[-1]['sealed']:
+                segments.append(self._new_entry(segments[-1]['seq'] + 1 if segments else 1))
+                self._store_manifest(manifest)
+            elif 'created' not in segments[-1]:
+                # Manifests written before segment ages were recorded.
+                segments[-1]['created'] = time.time()
+                self._store_manifest(manifest)
+        self._set_active(segments[-1])
+        # Segments sealed but not yet compressed when their writer stopped.
+        if compression:
+            for entry in segments[:-1]:
+                if entry['name'].endswith(SEGMENT_SUFFIX):
+                    self._compressor.submit(self._compress, entry['seq'])
+        super().__init__(os.path.join(self.directory, segments[-1]['name']), **kwargs)
+
+    @staticmethod
+    def _new_entry(seq: int) -> Dict[str, Any]:
+        return {
+            'seq': seq,
+            'name': _segment_name(seq),
+            'sealed': False,
+            'records': 0,
+            'first': None,
+            'last': None,
+            'created': time.time(),
+        }
+
+    def _set_active(self, entry: Dict[str, Any]) -> None:
+        self._active_seq = entry['seq']
+        self._created_at = entry['created']
+
+    @contextmanager
+    def _flocked(self, shared: bool = False) -> Iterator[None]:
+        # flock is per open file, so threads of this process also need the thread lock.
+        with self._manifest_lock:
+            if fcntl is None:
+                yield
+                return
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    @contextmanager
+    def _locked_manifest(self) -> Iterator[Dict[str, Any]]:
+        """The on-disk manifest, read under the exclusive lock; save it with ``_store_manifest``."""
+        with self._flocked():
+            self._manifest = read_manifest(self.directory)
+            self._manifest_key = self._manifest_stat()
+            yield self._manifest
+
+    def _store_manifest(self, manifest: Dict[str, Any]) -> None:
+        _write_manifest(self.directory, manifest)
+        self._manifest = manifest
+        self._manifest_key = self._manifest_stat()
+
+    def _manifest_stat(self):
+        try:
+            st = os.stat(os.path.join(self.directory, MANIFEST_NAME))
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _follow_rotation(self) -> None:
+        """Move to the current active segment if another writer sealed ours (shared lock held)."""
+        key = self._manifest_stat()
+        if key != self._manifest_key:
+            # Every manifest write is a rename, so an unchanged stat means an unchanged manifest.
+            self._manifest = read_manifest(self.directory)
+            self._manifest_key = key
+        active = self._manifest['segments'][-1]
+        if active['seq'] != self._active_seq:
+            self._switch_to(active)
+
+    def _switch_to(self, entry: Dict[str, Any]) -> None:
+        self._file.close()
+        self._set_active(entry)
+        self.path = os.path.join(self.directory, entry['name'])
+        self._file = self._open_file()
+
+    def _append_locked(self, payload: Dict[str, Any], line: bytes) -> None:
+        super()._append_locked(payload, line)
+        _add_record(self._batch, payload.get('timestamp'))
+
+    def _flush_locked(self) -> None:
+        size = self._write_batch_locked()
+        too_big = size >= self.max_bytes
+        too_old = self.max_age is not None and time.time() - self._created_at >= self.max_age
+        if size and (too_big or too_old):
+            self._seal(self._active_seq)
+
+    def _write_batch_locked(self) -> int:
+        """Append the pending batch to the current active segment; returns the segment's size."""
+        with self._flocked(shared=True):
+            self._follow_rotation()
+            super()._flush_locked()
+            if self._batch['records']:
+                _merge_stats(self._unsaved.setdefault(self._active_seq, _new_stats()), self._batch)
+                self._batch = _new_stats()
+            return os.fstat(self._file.fileno()).st_size
+
+    def _seal(self, seq: int) -> None:
+        with self._locked_manifest() as manifest:
+            active = manifest['segments'][-1]
+            if active['seq'] != seq:
+                return  # another writer sealed it first
+            active.update(_scan_segment(os.path.join(self.directory, active['name'])))
+            active['sealed'] = True
+            manifest['segments'].append(self._new_entry(seq + 1))
+            self._store_manifest(manifest)
+            self._unsaved.pop(seq, None)
+        self._switch_to(manifest['segments'][-1])
+        if self.compression:
+            self._compressor.submit(self._compress, seq)
+
+    def _save_manifest(self) -> None:
+        """Merge this writer's record counts for unsealed segments into the manifest."""
+        if not self._unsaved:
+            return
+        with self._locked_manifest() as manifest:
+            for entry in manifest['segments']:
+                stats = self._unsaved.get(entry['seq'])
+                if stats is not None and not entry['sealed']:
+                    _merge_entry(entry, stats)
+            self._store_manifest(manifest)
+            self._unsaved.clear()
+
+    def rotate(self) -> None:
+        """Seal the active segment now (if it holds any records)."""
+        with self._lock:
+            if self._file.closed:
+                raise ValueError('rotate on closed event log')
+            if self._write_batch_locked():
+                self._seal(self._active_seq)
+
+    def _compress(self, seq: int) -> None:
+        ext, opener = COMPRESSORS[self.compression]
+        source = os.path.join(self.directory, _segment_name(seq))
+        target = source + ext
+        # The open, locked temporary file claims the segment for this writer.
+        with open(target + '.tmp', 'ab') as claim:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(claim.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return  # another writer is compressing it
+            if os.path.exists(target):
+                # Compressed by another writer, or before a crash.
+                os.remove(target + '.tmp')
+            else:
+                claim.truncate(0)
+                with open(source, 'rb') as src, opener(claim, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+                os.replace(target + '.tmp', target)
+        with self._locked_manifest() as manifest:
+            for entry in manifest['segments']:
+                if entry['seq'] == seq and entry['name'] != os.path.basename(target):
+                    entry['name'] = os.path.basename(target)
+                    self._store_manifest(manifest)
+        # Readers holding the old manifest fall back to the compressed name.
+        try:
+            os.remove(source)
+        except FileNotFoundError:
+            pass
+
+    def close(self) -> None:
+        super().close()
+        self._compressor.shutdown(wait=True)
+        self._save_manifest()
+        self._lock_file.close()
+
+
+def _new_stats() -> Dict[str, Any]:
+    return {'records': 0, 'first': None, 'last': None}
+
+
+def _add_record(stats: Dict[str, Any], ts: Any) -> None:
+    stats['records'] += 1
+    if ts is None:
+        return
+    try:
+        parsed = parse_timestamp(ts)
+    except (TypeError, ValueError):
+        return
+    if stats['first'] is None or parsed < stats['first']:
+        stats['first'] = parsed
+    if stats['last'] is None or parsed > stats['last']:
+        stats['last'] = parsed
+
+
+def _merge_stats(stats: Dict[str, Any], other: Dict[str, Any]) -> None:
+    stats['records'] += other['records']
+    if other['first'] is not None and (stats['first'] is None or other['first'] < stats['first']):
+        stats['first'] = other['first']
+    if other['last'] is not None and (stats['last'] is None or other['last'] > stats['last']):
+        stats['last'] = other['last']
+
+
+def _merge_entry(entry: Dict[str, Any], stats: Dict[str, Any]) -> None:
+    """Add a writer's stats (datetimes) to a manifest entry (ISO strings)."""
+    merged = {
+        'records': entry['records'],
+        'first': parse_timestamp(entry['first']) if entry['first'] else None,
+        'last': parse_timestamp(entry['last']) if entry['last'] else None,
+    }
+    _merge_stats(merged, stats)
+    entry['records'] = merged['records']
+    entry['first'] = merged['first'].isoformat() if merged['first'] else None
+    entry['last'] = merged['last'].isoformat() if merged['last'] else None
+
+
+def segment_options_from_env() -> Dict[str, Any]:
+    """``SegmentedEventLog`` keyword arguments set by ``ACME_FEEDBACK_SEGMENT_*``."""
+    options: Dict[str, Any] = {}
+    max_bytes = os.getenv('ACME_FEEDBACK_SEGMENT_BYTES')
+    if max_bytes:
+        options['max_bytes'] = int(max_bytes)
+    max_age = os.getenv('ACME_FEEDBACK_SEGMENT_AGE')
+    if max_age:
+        options['max_age'] = None if max_age.lower() == 'none' else float(max_age)
+    compression = os.getenv('ACME_FEEDBACK_SEGMENT_COMPRESSION')
+    if compression:
+        options['compression'] = None if compression.lower() == 'none' else compression
+    return options
+
+
+def open_event_log(path: Optional[str] = None, **kwargs) -> FeedbackEventLog:
+    """
+    Writer for ``path`` (default ``ACME_FEEDBACK_LOG``): a SegmentedEventLog
+    when it names a directory (an existing one, or any path ending in a
+    separator; rotation settings from ``segment_options_from_env`` unless
+    given), a BinaryEventLog for ``.bin`` files, otherwise a single-file
+    FeedbackEventLog. With no ``path`` and ``ACME_FEEDBACK_SINK`` set, records
+    go to that event sink process instead.
+    """
+    if path is None:
+        sink = sink_socket_from_env()
+        if sink:
+            return EventSinkClient(sink, **kwargs)
+    path = path or default_log_path()
+    if os.path.isdir(path) or path.endswith(os.sep):
+        return SegmentedEventLog(path, **{**segment_options_from_env(), **kwargs})
+    if path.endswith(BINARY_SUFFIX):
+        return BinaryEventLog(path, **kwargs)
+    return FeedbackEventLog(path, **kwargs)
+
+
+def _overlaps(entry: Dict[str, Any], start, end) -> bool:
+    if entry['first'] is None or entry['last'] is None:
+        return True
+    if start is not None and parse_timestamp(entry['last']) < start:
+        return False
+    if end is not None and parse_timestamp(entry['first']) > end:
+        return False
+    return True
+
+
+def _segment_path(directory: str, name: str) -> str:
+    path = os.path.join(directory, name)
+    if os.path.exists(path) or not name.endswith(SEGMENT_SUFFIX):
+        return path
+    for ext, _ in COMPRESSORS.values():
+        if os.path.exists(path + ext):
+            return path + ext
+    return path
+
+
+def iter_segment_lines(
+    directory: Optional[str] = None,
+    start: TimeBound = None,
+    end: TimeBound = None,
+    event: Optional[str] = None,
+) -> Iterator[bytes]:
+    """
+    Raw lines (without the newline) of every segment in order, as one stream.
+    Sealed segments whose manifest time range misses ``[start, end]`` are
+    skipped unopened; the rest are filtered line by line like
+    ``eventquery.iter_matching_lines``.
+    """
+    directory = directory or default_log_path()
+    start_ts = parse_timestamp(start) if start is not None else None
+    end_ts = parse_timestamp(end) if end is not None else None
+    needle = b'"event": ' + json.dumps(event).encode('utf-8') if event is not None else None
+
+    for entry in read_manifest(directory)['segments']:
+        if entry['sealed'] and not _overlaps(entry, start_ts, end_ts):
+            continue
+        try:
+            fh = _open_segment(_segment_path(directory, entry['name']))
+        except FileNotFoundError:
+            continue
+        with fh:
+            for line in fh:
+                if not line.endswith(b'\n'):
+                    break  # trailing partial line of the active segment
+                line = line[:-1]
+                if needle is not None and needle not in line:
+                    continue
+                if start_ts is not None or end_ts is not None:
+                    ts = line_timestamp(line)
+                    if ts is None or (start_ts is not None and ts < start_ts) or (end_ts is not None and ts > end_ts):
+                        continue
+                yield line
+
+
+def iter_segment_events(
+    directory: Optional[str] = None,
+    start: TimeBound = None,
+    end: TimeBound = None,
+    event: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    for line in iter_segment_lines(directory, start, end, event):
+        yield json.loads(line)
+
@@ -0,0 +1,67 @@
+"""
+Worker side of the event sink (see ``eventsink``): a client that sends each
+record to the sink's Unix socket instead of appending to the log itself.
+"""
+import os
+import socket
+import threading
+from typing import Any, Dict, Optional
+
+from eight_disciplines.eventlog import encode_event, feedback_event
+from eight_disciplines.survey_tools import CustomerFeedback
+
+
+def sink_socket_from_env() -> Optional[str]:
+    return os.getenv('ACME_FEEDBACK_SINK') or None
+
+
+class EventSinkClient:
+    """
+    Stand-in for ``FeedbackEventLog`` in worker processes: every record is
+    sent to the sink as one line, and the sink does the buffering.
+    """
+
+    def __init__(self, socket_path: str, *, timeout: Optional[float] = 30.0, **_log_options):
+        self.socket_path = socket_path
+        self._lock = threading.Lock()
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            # Blocking connect: with a timeout set, a full backlog fails with EAGAIN.
+            self._sock.connect(socket_path)
+        except OSError:
+            self._sock.close()
+            raise
+        self._sock.settimeout(timeout)
+
+    @property
+    def closed(self) -> bool:
+        return self._sock.fileno() == -1
+
+    def write(self, payload: Dict[str, Any]) -> None:
+        data = encode_event(payload).encode('utf-8')
+        with self._lock:
+            if self.closed:
+                raise ValueError('write to closed event log')
+            self._sock.sendall(data)
+
+    def log(self, feedback: CustomerFeedback) -> None:
+        self.write(feedback_event(feedback))
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        with self._lock:
+            if self.closed:
+                return
+            try:
+                self._sock.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+            self._sock.close()
+
+    def __enter__(self) -> 'EventSinkClient':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Last emitted report and workflow status per issue, for ``--delta`` runs.
+
+A ``--delta`` run compares its report and ``compute_workflow_status`` result
+with the snapshot of the previous run of the same issue and emits only the
+transitions: steps newly done, newly unblocked (available now, not before),
+newly blocked, reopened (done before, missing now) and updated (done both
+times, value changed). In JSON output an issue that did not change emits
+nothing at all.
+
+Snapshots live in a small SQLite table. An issue is keyed on a 16-byte
+BLAKE2b hash of the customer (email, else name) and the issue's what / when /
+where; a document with none of these has no key and gets no snapshot.
+``ACME_REPORT_SNAPSHOTS`` names the database.
+
+    python -m eight_disciplines.snapshots report_snapshots.db    # print the snapshot count
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_SNAPSHOT_DB = 'report_snapshots.db'
+ISSUE_KEY_FIELDS = ('what_happened', 'when_happened', 'where_happened')
+NO_ISSUE_KEY_ERROR = 'no customer or issue details to key a snapshot on'
+TRANSITIONS = ('newly_done', 'newly_unblocked', 'newly_blocked', 'reopened', 'updated')
+_TRANSITION_LABELS = {
+    'newly_done': 'Newly done',
+    'newly_unblocked': 'Newly unblocked',
+    'newly_blocked': 'Newly blocked',
+    'reopened': 'Reopened',
+    'updated': 'Updated',
+}
+_NO_STATUS = {'done': [], 'available': [], 'blocked': [], 'doing': None}
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS report_snapshots ('
+    'issue_key TEXT PRIMARY KEY, report TEXT NOT NULL, status TEXT NOT NULL, updated_at REAL NOT NULL'
+    ') WITHOUT ROWID'
+)
+
+Snapshot = Tuple[Dict[str, Any], Dict[str, Any]]
+
+
+def issue_key(defaults: Dict[str, Any]) -> Optional[str]:
+    """
+    Stable key of the issue a defaults document describes, or None when the
+    document names neither a customer nor any issue detail (all such
+    documents would otherwise share one snapshot).
+    """
+    owner = defaults.get('email') or defaults.get('name') or ''
+    details = [defaults.get(field) for field in ISSUE_KEY_FIELDS]
+    if not owner and not any(details):
+        return None
+    canonical = json.dumps([owner, *details], separators=(',', ':'))
+    return hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(',', ':'))
+
+
+def status_delta(previous: Optional[Snapshot], report: Dict[str, Any], status: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Transitions from ``previous`` (a report/status pair, or None for the first
+    run, which counts as nothing done yet) to ``report``/``status``. Step lists
+    keep the order of the status lists they come from.
+    """
+    prev_report, prev_status = previous if previous is not None else ({}, _NO_STATUS)
+    prev_done = set(prev_status['done'])
+    prev_available = set(prev_status['available'])
+    prev_blocked = set(prev_status['blocked'])
+    done = set(status['done'])
+    reopened = [step for step in prev_status['done'] if step not in done]
+    # A reopened step is available again, but it was never blocked: report it once, as reopened.
+    not_unblocked = prev_available.union(reopened)
+    return {
+        'first_run': previous is None,
+        'newly_done': [step for step in status['done'] if step not in prev_done],
+        'newly_unblocked': [step for step in status['available'] if step not in not_unblocked],
+        'newly_blocked': [step for step in status['blocked'] if step not in prev_blocked],
+        'reopened': reopened,
+        'updated': [step for step in status['done'] if step in prev_done and report.get(step) != prev_report.get(step)],
+        'doing_step': status['doing'],
+    }
+
+
+def has_transitions(delta: Dict[str, Any]) -> bool:
+    return any(delta[name] for name in TRANSITIONS)
+
+
+def render_delta(delta: Optional[Dict[str, Any]]) -> str:
+    """Plain-text form of a delta (None: unchanged), for the ``scrum`` and ``plain`` formats."""
+    if delta is None or not has_transitions(delta):
+        return 'No changes since the last run.'
+    lines = ['First run for this issue:' if delta['first_run'] else 'Changes since the last run:']
+    for name in TRANSITIONS:
+        if delta[name]:
+            lines.append(f'{_TRANSITION_LABELS[name]}:')
+            lines.extend(f'- {step}' for step in delta[name])
+    if delta['doing_step'] is not None:
+        lines.append(f"Doing: {delta['doing_step']}")
+    return '\n'.join(lines)
+
+
+class ReportSnapshotStore:
+    """
+    Persistent per-issue snapshots consulted by ``--delta`` runs. Safe to
+    share between threads; concurrent processes serialise on SQLite's write lock.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(_SCHEMA)
+
+    def get(self, key: str) -> Optional[Snapshot]:
+        with self._lock:
+            row = self.conn.execute('SELECT report, status FROM report_snapshots WHERE issue_key = ?', (key,)).fetchone()
+        return None if row is None else (json.loads(row[0]), json.loads(row[1]))
+
+    def record(self, key: str, report: Dict[str, Any], status: Dict[str, Any], now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Replace the snapshot of ``key`` and return the delta from the previous
+        one, or None when report and status are unchanged (nothing is written).
+        """
+        report_text = _canonical(report)
+        status_text = _canonical(status)
+        now = time.time() if now is None else now
+        with self._lock:
+            conn = self.conn
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute('SELECT report, status FROM report_snapshots WHERE issue_key = ?', (key,)).fetchone()
+                if row is not None and row[0] == report_text and row[1] == status_text:
+                    conn.execute('COMMIT')
+                    return None
+                conn.execute(
+                    'INSERT INTO report_snapshots (issue_key, report, status, updated_at) VALUES (?, ?, ?, ?) '
+                    'ON CONFLICT (issue_key) DO UPDATE SET report = excluded.report, status = excluded.status, '
+                    'updated_at = excluded.updated_at',
+                    (key, report_text, status_text, now),
+                )
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+        previous = None if row is None else (json.loads(row[0]), json.loads(row[1]))
+        return {'issue_key': key, **status_delta(previous, report, status)}
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute('SELECT COUNT(*) FROM report_snapshots').fetchone()[0]
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> 'ReportSnapshotStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def snapshot_db_from_env() -> str:
+    return os.getenv('ACME_REPORT_SNAPSHOTS') or DEFAULT_SNAPSHOT_DB
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Show the number of stored report snapshots.')
+    parser.add_argument('db', nargs='?', default=snapshot_db_from_env(), help='Snapshot database (default: ACME_REPORT_SNAPSHOTS).')
+    args = parser.parse_args(argv)
+    with ReportSnapshotStore(args.db) as store:
+        print(json.dumps({'snapshots': store.count()}))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,8 @@
+import os
+import sys
 from dataclasses import asdict, dataclass, field
-from typing import Any, Callable, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
 
 
 def _normalize_optional(value: Any) -> Optional[str]:
@@ -34,6 +37,60 @@ def _has_list_value(value: Any) -> bool:
     return _normalize_optional_list(value) is not None
 
 
+# Shared normalization for bulk loads. Team strings, names, dates and
+# locations recur across thousands of issues: those fields are interned so
+# repeats share one object, and split team lists are kept in a bounded LRU
+# cache. Free text is left alone; stripping it is cheaper than any lookup and
+# it rarely repeats verbatim.
+NORMALIZE_CACHE_SIZE = int(os.getenv('ACME_NORMALIZE_CACHE_SIZE', '8192'))
+INTERN_MAX_LENGTH = 64
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _cached_names(value) -> Optional[tuple]:
+    names = _normalize_optional_list(list(value) if isinstance(value, tuple) else value)
+    return None if names is None else tuple(map(sys.intern, names))
+
+
+def normalize_text(value: Any) -> Optional[str]:
+    """_normalize_optional() with short results interned."""
+    if value is None:
+        return None
+    text = (value if type(value) is str else str(value)).strip()
+    if not text:
+        return None
+    return sys.intern(text) if len(text) <= INTERN_MAX_LENGTH else text
+
+
+def normalize_names(value: Any) -> Optional[list[str]]:
+    """Cached equivalent of _normalize_optional_list(); each call returns a new list."""
+    if type(value) is str:
+        key = value
+    elif type(value) is list and all(type(item) is str for item in value):
+        key = tuple(value)
+    else:
+        return _normalize_optional_list(value)
+    names = _cached_names(key)
+    return None if names is None else list(names)
+
+
+def normalization_stats() -> Dict[str, int]:
+    """Hit/miss/eviction counts of the names cache since the last clear."""
+    info = _cached_names.cache_info()
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        # Every miss inserts one entry, so whatever is no longer held was evicted.
+        'evictions': info.misses - info.currsize,
+        'size': info.currsize,
+        'maxsize': info.maxsize,
+    }
+
+
+def clear_normalization_cache() -> None:
+    _cached_names.cache_clear()
+
+
 @dataclass
 class CustomerFeedback:
     feedback: str
@@ -49,7 +106,7 @@ class CustomerContact:
     @staticmethod
     def from_defaults(defaults: dict) -> "CustomerContact":
         return CustomerContact(
-            name=_normalize_optional(defaults.get("name")),
+            name=normalize_text(defaults.get("name")),
             phone_number=_normalize_optional(defaults.get("phone_number", defaults.get("phone"))),
             email=_normalize_optional(defaults.get("email")),
         )
@@ -72,10 +129,10 @@ class CustomerIssue:
     def from_defaults(defaults: dict) -> "CustomerIssue":
         return CustomerIssue(
             what_happened=_normalize_optional(defaults.get("what_happened")),
-            when_happened=_normalize_optional(defaults.get("when_happened")),
-            where_happened=_normalize_optional(defaults.get("where_happened")),
+            when_happened=normalize_text(defaults.get("when_happened")),
+            where_happened=normalize_text(defaults.get("where_happened")),
             expecting_to_happen=_normalize_optional(defaults.get("expecting_to_happen")),
-            resolution_request=_normalize_optional(defaults.get("resolution_request")),
+            resolution_request=normalize_text(defaults.get("resolution_request")),
         )
 
     def to_defaults(self, defaults: dict) -> dict:
@@ -103,7 +160,7 @@ class EightDisciplineInputs:
         return EightDisciplineInputs(
             plan=_normalize_optional(defaults.get('plan')),
             prerequisites=_normalize_optional(defaults.get('prerequisites')),
-            team=_normalize_optional_list(defaults.get('team')),
+            team=normalize_names(defaults.get('team')),
             problem_description=_normalize_optional(defaults.get('problem_description')),
             interim_containment_plan=_normalize_optional(defaults.get('interim_containment_plan')),
             root_causes=_normalize_optional(defaults.get('root_causes')),
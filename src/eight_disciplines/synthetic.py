@@ -0,0 +1,83 @@
+"""Seeded synthetic customer issues and partially completed 8D reports."""
+import random
+from typing import Any, Dict, Iterator, List, Optional
+
+from eight_disciplines.defaults_store import empty_defaults
+
+EIGHT_D_STEPS = (
+    'plan',
+    'prerequisites',
+    'team',
+    'problem_description',
+    'interim_containment_plan',
+    'root_causes',
+    'permanent_corrections',
+    'corrective_actions',
+    'preventive_measures',
+)
+
+_FIRST_NAMES = ('Alex', 'Blake', 'Casey', 'Devon', 'Emery', 'Finley', 'Harper', 'Jordan', 'Morgan', 'Riley')
+_PLACES = ('Front porch', 'Warehouse 3', 'Checkout page', 'Mobile app', 'Store #12', 'Call centre')
+_PROBLEMS = ('Package arrived damaged', 'Order never shipped', 'Charged twice', 'Wrong item delivered', 'App crashed at login')
+
+
+def synthetic_defaults(count: int, seed: int = 0, *, complete_issue_ratio: float = 0.9) -> Iterator[Dict[str, Any]]:
+    """
+    Yield ``count`` defaults documents in the ``customer_defaults.json`` shape.
+
+    Each issue is complete with probability ``complete_issue_ratio`` and its 8D
+    work has progressed through a random prefix of the steps, with the
+    occasional gap, so every workflow state shows up at scale. The same seed
+    always yields the same documents.
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        defaults = empty_defaults()
+        defaults['name'] = f'{rng.choice(_FIRST_NAMES)} Customer{i}'
+        defaults['email'] = f'customer{i}@example.com'
+        if rng.random() < 0.5:
+            defaults['phone_number'] = f'555-{rng.randrange(10000):04d}'
+
+        problem = rng.choice(_PROBLEMS)
+        defaults['what_happened'] = problem
+        defaults['when_happened'] = f'2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}'
+        defaults['where_happened'] = rng.choice(_PLACES)
+        defaults['expecting_to_happen'] = f'No "{problem.lower()}"'
+        if rng.random() < 0.7:
+            defaults['resolution_request'] = rng.choice(('Refund', 'Replacement', 'Call me back'))
+        if rng.random() >= complete_issue_ratio:
+            defaults[rng.choice(('when_happened', 'where_happened', 'expecting_to_happen'))] = None
+
+        progress = rng.randint(0, len(EIGHT_D_STEPS))
+        for step in EIGHT_D_STEPS[:progress]:
+            if rng.random() < 0.05:
+                continue
+            if step == 'team':
+                defaults['team'] = ', '.join(rng.sample(_FIRST_NAMES, rng.randint(1, 4)))
+            else:
+                defaults[step] = f'{step.replace("_", " ").capitalize()} for case {i % 997}'
+        yield defaults
+
+
+def report_from_defaults(defaults: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a ``generate_machine_readable_report()``-shaped dict without normalisation."""
+    team: Optional[List[str]] = defaults.get('team')
+    if isinstance(team, str):
+        team = [name.strip() for name in team.split(',')]
+    report: Dict[str, Any] = {
+        'issue': {
+            'what_happened': defaults.get('what_happened'),
+            'when_happened': defaults.get('when_happened'),
+            'where_happened': defaults.get('where_happened'),
+            'expecting_to_happen': defaults.get('expecting_to_happen'),
+            'resolution_request': defaults.get('resolution_request'),
+        },
+    }
+    for step in EIGHT_D_STEPS:
+        report[step] = team if step == 'team' else defaults.get(step)
+    return report
+
+
+def synthetic_reports(count: int, seed: int = 0, **kwargs) -> Iterator[Dict[str, Any]]:
+    for defaults in synthetic_defaults(count, seed, **kwargs):
+        yield report_from_defaults(defaults)
@@ -0,0 +1,156 @@
+"""
+Flat, fixed-column rows of the ``--format json`` document, for ``--format
+ndjson`` and ``--format csv``.
+
+Columns, in order: ``feedback_submitted``, ``doing_step``, the issue fields
+(``issue_what_happened``, ...), one column per 8D step holding its value, and
+one ``<step>_status`` column per step of ``step_order`` (``done``,
+``available`` or ``blocked``). The layout is computed once per encoder:
+NDJSON lines are filled into a prebuilt template (keys already encoded) and
+CSV rows go through one ``csv.writer`` (RFC 4180: ``\r\n`` line ends, so
+fields holding either character are quoted); values are encoded compactly,
+in column order, without re-sorting.
+"""
+import csv
+import json
+from dataclasses import fields
+from json.encoder import encode_basestring_ascii
+from typing import Any, Dict, Iterable, List, Sequence, TextIO, Tuple
+
+from eight_disciplines.survey_tools import CustomerIssue
+
+ROW_FORMATS = ('ndjson', 'csv')
+ISSUE_FIELDS = tuple(f.name for f in fields(CustomerIssue))
+STEP_STATES = ('done', 'available', 'blocked')
+_COMPACT = json.JSONEncoder(separators=(',', ':'))
+_NESTED = (list, dict)
+_STATUS_CACHE_SIZE = 1024
+
+
+def _value_json(value: Any, _string=encode_basestring_ascii, _encode=_COMPACT.encode) -> str:
+    # Strings, None and lists of strings (team) are nearly every report value;
+    # JSONEncoder.encode() builds a fresh iterencoder per call, so skip it for them.
+    if value.__class__ is str:
+        return _string(value)
+    if value is None:
+        return 'null'
+    if value.__class__ is list:
+        try:
+            return '[' + ','.join(map(_string, value)) + ']'
+        except TypeError:
+            pass
+    return _encode(value)
+
+
+class StatusRowEncoder:
+    """
+    Rows for the status documents of one step order. The status columns
+    depend only on ``done_steps`` and ``available_steps``, which repeat from
+    report to report, so their rendered text is cached per combination.
+    """
+
+    def __init__(self, order: Sequence[str]):
+        self.order = tuple(order)
+        self.value_steps = tuple(step for step in self.order if step != 'issue')
+        self.status_columns = tuple(f'{step}_status' for step in self.order)
+        self.columns: Tuple[str, ...] = (
+            ('feedback_submitted', 'doing_step')
+            + tuple(f'issue_{name}' for name in ISSUE_FIELDS)
+            + self.value_steps
+            + self.status_columns
+        )
+        head = self.columns[:-len(self.status_columns)]
+        self._ndjson_head = '{' + ','.join(f'{_value_json(column)}:%s' for column in head)
+        self._status_cache: Dict[Tuple[str, tuple, tuple], Any] = {}
+
+    def states(self, payload: Dict[str, Any]) -> List[str]:
+        """``done``, ``available`` or ``blocked`` for every step of ``order``."""
+        status = dict.fromkeys(self.order, 'blocked')
+        status.update(dict.fromkeys(payload['available_steps'], 'available'))
+        status.update(dict.fromkeys(payload['done_steps'], 'done'))
+        return [status[step] for step in self.order]
+
+    def values(self, payload: Dict[str, Any]) -> List[Any]:
+        """Column values of one status document, in ``columns`` order."""
+        report = payload['report']
+        issue = report.get('issue') or {}
+        return [
+            payload['feedback_submitted'],
+            payload['doing_step'],
+            *map(issue.get, ISSUE_FIELDS),
+            *map(report.get, self.value_steps),
+            *self.states(payload),
+        ]
+
+    def _cached_status(self, payload: Dict[str, Any], row_format: str) -> Any:
+        # ndjson: the encoded tail of the object; csv: the list of status cells.
+        key = (row_format, tuple(payload['done_steps']), tuple(payload['available_steps']))
+        cached = self._status_cache.get(key)
+        if cached is None:
+            if len(self._status_cache) >= _STATUS_CACHE_SIZE:
+                self._status_cache.clear()
+            states = self.states(payload)
+            if row_format == 'csv':
+                cached = states
+            else:
+                cached = ''.join(f',{_value_json(c)}:{_value_json(s)}' for c, s in zip(self.status_columns, states)) + '}'
+            self._status_cache[key] = cached
+        return cached
+
+    def ndjson(self, payload: Dict[str, Any]) -> str:
+        """
+        One compact JSON object, keys in column order (no trailing newline);
+        equal to ``json.dumps(dict(zip(columns, values(payload))), separators=(',', ':'))``.
+        """
+        report = payload['report']
+        issue = report.get('issue') or {}
+        return self._ndjson_head % (
+            'true' if payload['feedback_submitted'] else 'false',
+            _value_json(payload['doing_step']),
+            *map(_value_json, map(issue.get, ISSUE_FIELDS)),
+            *map(_value_json, map(report.get, self.value_steps)),
+        ) + self._cached_status(payload, 'ndjson')
+
+    def csv_cells(self, payload: Dict[str, Any]) -> List[Any]:
+        """
+        The cells of one CSV row: booleans as ``true``/``false``, lists and
+        dicts as compact JSON, None as an empty cell.
+        """
+        report = payload['report']
+        issue = report.get('issue') or {}
+        return [
+            'true' if payload['feedback_submitted'] else 'false',
+            payload['doing_step'],
+            *map(issue.get, ISSUE_FIELDS),
+            *[_value_json(value) if value.__class__ in _NESTED else value for value in map(report.get, self.value_steps)],
+            *self._cached_status(payload, 'csv'),
+        ]
+
+
+class StatusRowWriter:
+    """Writes status documents to ``out`` as NDJSON lines or CSV rows (header first)."""
+
+    def __init__(self, out: TextIO, row_format: str, order: Sequence[str]):
+        if row_format not in ROW_FORMATS:
+            raise ValueError(f'row_format must be one of {", ".join(ROW_FORMATS)}')
+        self.encoder = StatusRowEncoder(order)
+        self.out = out
+        self.row_format = row_format
+        if row_format == 'csv':
+            self._csv = csv.writer(out)
+            self._csv.writerow(self.encoder.columns)
+
+    def write(self, payload: Dict[str, Any]) -> None:
+        encoder = self.encoder
+        if self.row_format == 'csv':
+            self._csv.writerow(encoder.csv_cells(payload))
+        else:
+            self.out.write(encoder.ndjson(payload) + '\n')
+
+    def write_many(self, payloads: Iterable[Dict[str, Any]]) -> None:
+        if self.row_format == 'csv':
+            self._csv.writerows(map(self.encoder.csv_cells, payloads))
+        else:
+            write, ndjson = self.out.write, self.encoder.ndjson
+            for payload in payloads:
+                write(ndjson(payload) + '\n')
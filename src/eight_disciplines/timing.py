@@ -0,0 +1,134 @@
+"""
+Named timing spans around the pipeline stages.
+
+Disabled by default: ``span()`` then returns a shared no-op context manager,
+so instrumented code pays one function call and an empty ``with``. While
+enabled (the CLIs do this for ``--timings`` or ``ACME_TIMINGS``) every span
+adds its wall time and CPU time (``time.thread_time``, i.e. the calling
+thread's) to a per-name total.
+
+    ACME_TIMINGS=- python acme_customer_feedback.py --non-interactive   # JSON on stderr
+    python acme_customer_feedback.py --batch issues.jsonl --timings timings.json
+"""
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> '_NullSpan':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('_timings', '_name', '_wall', '_cpu')
+
+    def __init__(self, timings: 'Timings', name: str):
+        self._timings = timings
+        self._name = name
+
+    def __enter__(self) -> '_Span':
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._timings.add(self._name, time.perf_counter() - self._wall, time.thread_time() - self._cpu)
+
+
+class Timings:
+    """Per-stage totals: number of spans, wall seconds and CPU seconds."""
+
+    def __init__(self):
+        self._totals: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    def span(self, name: str) -> _Span:
+        return _Span(self, name)
+
+    def add(self, name: str, wall: float, cpu: float) -> None:
+        with self._lock:
+            totals = self._totals.get(name)
+            if totals is None:
+                self._totals[name] = [1, wall, cpu]
+            else:
+                totals[0] += 1
+                totals[1] += wall
+                totals[2] += cpu
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            totals = {name: list(values) for name, values in self._totals.items()}
+        return {
+            'elapsed_seconds': time.perf_counter() - self._started,
+            'stages': {
+                name: {'count': int(count), 'wall_seconds': wall, 'cpu_seconds': cpu}
+                for name, (count, wall, cpu) in totals.items()
+            },
+        }
+
+    def dump(self, destination: str = '-') -> None:
+        """Write the totals as JSON to ``destination`` (a path, or ``-`` for stderr)."""
+        text = json.dumps(self.as_dict(), indent=2) + '\n'
+        if destination == '-':
+            sys.stderr.write(text)
+            sys.stderr.flush()
+        else:
+            with open(destination, 'w', encoding='utf-8') as fh:
+                fh.write(text)
+
+
+_active: Optional[Timings] = None
+
+
+def span(name: str):
+    """Context manager timing one stage; a no-op unless timings are enabled."""
+    timings = _active
+    if timings is None:
+        return _NULL_SPAN
+    return _Span(timings, name)
+
+
+def enable() -> Timings:
+    """Start collecting (discarding any previous totals) and return the collector."""
+    global _active
+    _active = Timings()
+    return _active
+
+
+def disable() -> None:
+    global _active
+    _active = None
+
+
+def active() -> Optional[Timings]:
+    return _active
+
+
+@contextmanager
+def record_timings(destination: Optional[str]) -> Iterator[Optional[Timings]]:
+    """
+    Collect timings for the duration of the block and dump them to
+    ``destination`` on the way out; does nothing when ``destination`` is None.
+    """
+    if destination is None:
+        yield None
+        return
+    timings = enable()
+    try:
+        yield timings
+    finally:
+        disable()
+        timings.dump(destination)
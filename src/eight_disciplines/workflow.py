@@ -0,0 +1,235 @@
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from eight_disciplines.reportgenerator import _is_missing, is_issue_complete
+
+
+def is_step_done(step: str, value: Any) -> bool:
+    """Step-level completeness, same rules as ReportGenerator.check_nonempty_values()."""
+    if step == 'issue':
+        return is_issue_complete(value)
+    return not _is_missing(value)
+
+
+class WorkflowGraph:
+    """
+    Step dependency graph compiled once from ``step_order`` and ``step_prereqs``.
+
+    Steps are numbered by their position in ``order`` (prerequisites that are
+    not in ``order`` are appended), so a set of steps is an int bitmask and
+    "first in order" is the lowest set bit. Self-references such as
+    ``'issue': ['issue']`` are kept for gating but ignored for the
+    topological order.
+    """
+
+    def __init__(self, order: Iterable[str], prereqs: Dict[str, List[str]]):
+        steps = list(dict.fromkeys(order))
+        for step, reqs in prereqs.items():
+            for name in [step, *reqs]:
+                if name not in steps:
+                    steps.append(name)
+        self.steps = tuple(steps)
+        self.index = {step: i for i, step in enumerate(self.steps)}
+        self.prereqs = tuple(
+            tuple(self.index[r] for r in dict.fromkeys(prereqs.get(step, [])))
+            for step in self.steps
+        )
+        dependents: List[List[int]] = [[] for _ in self.steps]
+        for i, reqs in enumerate(self.prereqs):
+            for r in reqs:
+                dependents[r].append(i)
+        self.dependents = tuple(tuple(d) for d in dependents)
+        self.topological_order = self._topological_order()
+        self.prereq_masks = tuple(sum(1 << r for r in reqs) for reqs in self.prereqs)
+        self.all_mask = (1 << len(self.steps)) - 1
+        self._available_table: Optional[array] = None
+
+    def _topological_order(self) -> tuple:
+        pending = [sum(1 for r in reqs if r != i) for i, reqs in enumerate(self.prereqs)]
+        ready = [i for i, count in enumerate(pending) if count == 0]
+        result = []
+        while ready:
+            i = ready.pop(0)
+            result.append(self.steps[i])
+            for dep in self.dependents[i]:
+                if dep != i:
+                    pending[dep] -= 1
+                    if pending[dep] == 0:
+                        ready.append(dep)
+        if len(result) != len(self.steps):
+            cyclic = [s for s in self.steps if s not in result]
+            raise ValueError(f'step prerequisites contain a cycle through: {", ".join(cyclic)}')
+        return tuple(result)
+
+    def names(self, mask: int) -> List[str]:
+        """Step names for the bits set in ``mask``, in workflow order."""
+        result = []
+        while mask:
+            low = mask & -mask
+            result.append(self.steps[low.bit_length() - 1])
+            mask ^= low
+        return result
+
+    def track(self, report: Dict[str, Any]) -> 'WorkflowState':
+        return WorkflowState(self, report)
+
+    # -- Progress as a single int -------------------------------------------
+    #
+    # Bit i of a progress value is set when step i is done. Reports built by
+    # generate_machine_readable_report() contain every step, so the steps
+    # still to do are simply the clear bits; pass ``present`` for reports
+    # that only carry some of the steps.
+
+    def encode(self, report: Dict[str, Any]) -> int:
+        """Progress bits for ``report``; fields outside the graph are ignored."""
+        done = 0
+        index = self.index
+        for step, value in report.items():
+            i = index.get(step)
+            if i is not None and is_step_done(step, value):
+                done |= 1 << i
+        return done
+
+    def present_mask(self, report: Dict[str, Any]) -> int:
+        return sum(1 << self.index[step] for step in report if step in self.index)
+
+    def available_mask(self, done: int, present: Optional[int] = None) -> int:
+        """Missing steps whose prerequisites are all done."""
+        if present is None and self._available_table is not None:
+            return self._available_table[done]
+        missing = (self.all_mask if present is None else present) & ~done
+        available = 0
+        masks = self.prereq_masks
+        while missing:
+            low = missing & -missing
+            if not masks[low.bit_length() - 1] & ~done:
+                available |= low
+            missing ^= low
+        return available
+
+    def status_masks(self, done: int, present: Optional[int] = None) -> Tuple[int, int, int, int]:
+        """``(missing, available, blocked, doing)`` masks; ``doing`` has at most one bit."""
+        missing = (self.all_mask if present is None else present) & ~done
+        available = self.available_mask(done, present)
+        return missing, available, missing & ~available, available & -available
+
+    def decode(self, done: int, present: Optional[int] = None) -> Dict[str, object]:
+        """Same shape as compute_workflow_status()."""
+        missing, available, blocked, doing = self.status_masks(done, present)
+        return {
+            'done': self.names(done & (self.all_mask if present is None else present)),
+            'missing': self.names(missing),
+            'available': self.names(available),
+            'blocked': self.names(blocked),
+            'doing': self.steps[doing.bit_length() - 1] if doing else None,
+        }
+
+    @property
+    def typecode(self) -> str:
+        """Smallest unsigned ``array`` typecode that holds a progress value."""
+        for code in ('B', 'H', 'I', 'L', 'Q'):
+            if len(self.steps) <= array(code).itemsize * 8:
+                return code
+        raise ValueError(f'{len(self.steps)} steps do not fit a 64-bit progress value')
+
+    def build_lookup_table(self, max_steps: int = 16) -> array:
+        """
+        Precompute ``available_mask(done)`` for every progress value, so that
+        fully-present reports need a single index per evaluation. Only built
+        for graphs of at most ``max_steps`` steps (2**steps entries).
+        """
+        if len(self.steps) > max_steps:
+            raise ValueError(f'lookup table for {len(self.steps)} steps would need 2**{len(self.steps)} entries')
+        if self._available_table is None:
+            self._available_table = array(self.typecode, map(self.available_mask, range(self.all_mask + 1)))
+        return self._available_table
+
+    def encode_many(self, reports: Iterable[Dict[str, Any]]) -> array:
+        return array(self.typecode, map(self.encode, reports))
+
+    def available_many(self, progress: Iterable[int]) -> array:
+        """Availability masks for many fully-present progress values."""
+        if self._available_table is None and len(self.steps) <= 16:
+            self.build_lookup_table()
+        if self._available_table is not None:
+            return array(self.typecode, map(self._available_table.__getitem__, progress))
+        return array(self.typecode, map(self.available_mask, progress))
+
+
+class WorkflowState:
+    """
+    Incrementally maintained workflow status of one issue.
+
+    ``update()`` touches only the changed step and its direct dependents;
+    ``doing`` and the membership checks are constant time. Report fields that
+    are not steps of the graph are ignored.
+    """
+
+    __slots__ = ('graph', 'present', 'done', 'available', '_unmet')
+
+    def __init__(self, graph: WorkflowGraph, report: Optional[Dict[str, Any]] = None):
+        self.graph = graph
+        self.present = 0
+        self.done = 0
+        self.available = 0
+        # Number of distinct prerequisites of each step that are not done yet.
+        self._unmet = [len(reqs) for reqs in graph.prereqs]
+        for step, value in (report or {}).items():
+            if step in graph.index:
+                self.update(step, value)
+
+    def update(self, step: str, value: Any) -> None:
+        graph = self.graph
+        i = graph.index[step]
+        bit = 1 << i
+        self.present |= bit
+        now_done = is_step_done(step, value)
+        if now_done != bool(self.done & bit):
+            self.done ^= bit
+            delta = -1 if now_done else 1
+            unmet = self._unmet
+            for dep in graph.dependents[i]:
+                unmet[dep] += delta
+                self._refresh(dep)
+        self._refresh(i)
+
+    def _refresh(self, i: int) -> None:
+        bit = 1 << i
+        if self.present & bit and not self.done & bit and self._unmet[i] == 0:
+            self.available |= bit
+        else:
+            self.available &= ~bit
+
+    @property
+    def missing(self) -> int:
+        return self.present & ~self.done
+
+    @property
+    def blocked(self) -> int:
+        return self.missing & ~self.available
+
+    @property
+    def doing(self) -> Optional[str]:
+        if not self.available:
+            return None
+        return self.graph.steps[(self.available & -self.available).bit_length() - 1]
+
+    def is_done(self, step: str) -> bool:
+        return bool(self.done >> self.graph.index[step] & 1)
+
+    def is_available(self, step: str) -> bool:
+        return bool(self.available >> self.graph.index[step] & 1)
+
+    def is_blocked(self, step: str) -> bool:
+        return bool(self.blocked >> self.graph.index[step] & 1)
+
+    def as_status(self) -> Dict[str, object]:
+        """Same shape as compute_workflow_status()."""
+        names = self.graph.names
+        return {
+            'done': names(self.done),
+            'missing': names(self.missing),
+            'available': names(self.available),
+            'blocked': names(self.blocked),
+            'doing': self.doing,
+        }
@@ -0,0 +1,91 @@
+import io
+import json
+import random
+import unittest
+from collections import Counter
+
+from eight_disciplines.acme_customer_feedback import EightDisciplines, compute_workflow_status, step_order, step_prereqs
+from eight_disciplines.analytics import PortfolioAggregator, QuantileSketch
+from eight_disciplines.eventlog import encode_event, feedback_event
+from eight_disciplines.survey_tools import CustomerFeedback
+from eight_disciplines.synthetic import synthetic_reports
+
+ISSUE = {'what_happened': 'x', 'when_happened': 'y', 'where_happened': 'z', 'expecting_to_happen': 'w'}
+
+
+class TestQuantileSketch(unittest.TestCase):
+    def test_quantiles_within_relative_accuracy(self):
+        rng = random.Random(3)
+        values = [rng.expovariate(1 / 3600) for _ in range(20000)] + [0.0] * 100
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+        values.sort()
+        for q in (0.1, 0.5, 0.9, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            self.assertAlmostEqual(sketch.quantile(q), exact, delta=exact * 0.011 + 1e-9)
+        self.assertEqual(sketch.quantile(0), 0.0)
+
+    def test_bins_are_bounded_and_merge(self):
+        left, right = QuantileSketch(max_bins=64), QuantileSketch(max_bins=64)
+        for i in range(1, 5000):
+            left.add(float(i))
+            right.add(float(i) * 1000)
+        self.assertLessEqual(len(left.bins), 64)
+        left.merge(right)
+        self.assertLessEqual(len(left.bins), 64)
+        self.assertEqual(left.count, 9998)
+        self.assertAlmostEqual(left.quantile(1), 4999000.0)
+
+
+class TestPortfolioAggregator(unittest.TestCase):
+    def test_step_counts_match_compute_workflow_status(self):
+        order = step_order(EightDisciplines(None))
+        prereqs = step_prereqs()
+        reports = list(synthetic_reports(500, seed=11, complete_issue_ratio=0.6))
+        aggregator = PortfolioAggregator()
+        aggregator.consume_reports(json.dumps({'report': r, 'timestamp': '2025-01-01T00:00:00+00:00'}) for r in reports)
+
+        expected = {step: Counter() for step in order}
+        stages = Counter()
+        blocked_by = Counter()
+        for report in reports:
+            status = compute_workflow_status(report, order, prereqs)
+            for name in ('done', 'missing', 'available', 'blocked'):
+                for step in status[name]:
+                    expected[step][name] += 1
+            if status['doing']:
+                expected[status['doing']]['doing'] += 1
+            stages[status['doing'] or ('blocked' if status['missing'] else 'complete')] += 1
+            for step in status['blocked']:
+                blocked_by.update(r for r in prereqs[step] if r not in status['done'])
+
+        summary = aggregator.summary()
+        self.assertEqual(summary['reports'], 500)
+        for step in order:
+            for name in PortfolioAggregator.COUNTS:
+                self.assertEqual(summary['steps'][step][name], expected[step][name], (step, name))
+        self.assertEqual(summary['stages'], dict(stages))
+        self.assertEqual(summary['blocked_by'], dict(blocked_by))
+        self.assertEqual(sum(s['count'] for s in summary['age_seconds_by_stage'].values()), 500)
+
+    def test_event_log_lines(self):
+        lines = [
+            encode_event(feedback_event(CustomerFeedback(feedback=json.dumps(ISSUE), rating=None), '2025-01-01T00:00:00+00:00')),
+            encode_event(feedback_event(CustomerFeedback(feedback='Lovely service', rating=9))),
+            'not json\n',
+            '\n',
+        ]
+        aggregator = PortfolioAggregator()
+        aggregator.consume_events(io.StringIO(''.join(lines)))
+        summary = aggregator.summary()
+        self.assertEqual(summary['events'], {'customer_feedback_submitted': 2})
+        self.assertEqual(summary['invalid_lines'], 1)
+        self.assertEqual(summary['reports'], 1)
+        self.assertEqual(summary['steps']['issue']['done'], 1)
+        self.assertEqual(summary['ratings']['count'], 1)
+        self.assertEqual(summary['ratings']['p50'], 9)
+
+
+if __name__ == '__main__':
+    unittest.main()
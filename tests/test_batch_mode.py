@@ -0,0 +1,59 @@
+import io
+import json
+import unittest
+from argparse import Namespace
+from contextlib import redirect_stdout
+import os
+import tempfile
+
+from eight_disciplines.acme_customer_feedback import customer_service_chatbot, iter_batch_results, run_batch
+
+
+COMPLETE_ISSUE = {
+    'what_happened': 'Package arrived damaged',
+    'when_happened': '2025-01-10',
+    'where_happened': 'Front porch',
+    'expecting_to_happen': 'Package should be intact',
+    'resolution_request': 'Replacement item',
+}
+
+
+class TestBatchMode(unittest.TestCase):
+    def test_batch_results_match_single_run_json(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            defaults = dict(COMPLETE_ISSUE, team='Alex, Blake', plan='Replace item')
+            defaults_file = os.path.join(tmpdir, 'defaults.json')
+            with open(defaults_file, 'w', encoding='utf-8') as fh:
+                json.dump(defaults, fh)
+            os.environ['ACME_FEEDBACK_LOG'] = os.path.join(tmpdir, 'feedback.jsonl')
+            args = Namespace(use_defaults=False, non_interactive=True, format='json', defaults_file=defaults_file)
+            out = io.StringIO()
+            with redirect_stdout(out):
+                customer_service_chatbot(args)
+            single = json.loads(out.getvalue())
+
+        results = list(iter_batch_results([json.dumps(defaults)]))
+        self.assertEqual(results, [single])
+
+    def test_run_batch_emits_one_line_per_input_and_reports_bad_lines(self):
+        lines = [
+            json.dumps(COMPLETE_ISSUE),
+            '',
+            '{not json',
+            json.dumps({'name': 'Sam'}),
+        ]
+        out = io.StringIO()
+        count = run_batch(io.StringIO('\n'.join(lines) + '\n'), out, chunk_size=2)
+
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(count, 3)
+        self.assertEqual(len(records), 3)
+        self.assertTrue(records[0]['feedback_submitted'])
+        self.assertEqual(records[1]['line'], 3)
+        self.assertIn('error', records[1])
+        self.assertFalse(records[2]['feedback_submitted'])
+        self.assertIsNone(records[2]['doing_step'])
+
+
+if __name__ == '__main__':
+    unittest.main()
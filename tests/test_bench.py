@@ -0,0 +1,40 @@
+import unittest
+
+from eight_disciplines.acme_customer_feedback import EightDisciplines, compute_workflow_status, step_order, step_prereqs
+from eight_disciplines.bench import compare_results, run_benchmarks
+from eight_disciplines.synthetic import synthetic_defaults, synthetic_reports
+
+
+class TestSyntheticData(unittest.TestCase):
+    def test_generator_is_seeded(self):
+        self.assertEqual(list(synthetic_defaults(50, seed=7)), list(synthetic_defaults(50, seed=7)))
+        self.assertNotEqual(list(synthetic_defaults(50, seed=7)), list(synthetic_defaults(50, seed=8)))
+
+    def test_reports_cover_many_workflow_states(self):
+        order = step_order(EightDisciplines(None))
+        doing = {
+            compute_workflow_status(report, order, step_prereqs())['doing']
+            for report in synthetic_reports(500, seed=1)
+        }
+        self.assertIn(None, doing)
+        self.assertGreater(len(doing), 5)
+
+
+class TestBench(unittest.TestCase):
+    def test_run_produces_json_results(self):
+        results = run_benchmarks(20, repeat=1, names=['compute_workflow_status', 'log_feedback_buffered'])
+        self.assertEqual(results['meta']['scale'], 20)
+        self.assertEqual(set(results['results']), {'compute_workflow_status', 'log_feedback_buffered'})
+        self.assertGreater(results['results']['compute_workflow_status']['per_op_us'], 0)
+
+    def test_compare_flags_regressions_beyond_threshold(self):
+        baseline = {'results': {'a': {'per_op_us': 10.0}, 'b': {'per_op_us': 10.0}, 'gone': {'per_op_us': 1.0}}}
+        current = {'results': {'a': {'per_op_us': 10.5}, 'b': {'per_op_us': 13.0}}}
+        rows = {row['name']: row for row in compare_results(baseline, current, threshold=0.1)}
+        self.assertFalse(rows['a']['regression'])
+        self.assertTrue(rows['b']['regression'])
+        self.assertNotIn('gone', rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
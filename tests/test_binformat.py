@@ -0,0 +1,91 @@
+import json
+import os
+import tempfile
+import unittest
+
+from eight_disciplines import binformat
+from eight_disciplines.defaults_store import JsonDefaultsStore, empty_defaults
+from eight_disciplines.eventlog import encode_event, feedback_event
+from eight_disciplines.eventquery import iter_matching_lines
+from eight_disciplines.segments import open_event_log
+from eight_disciplines.survey_tools import CustomerFeedback
+
+
+def _event(text, rating=None, timestamp='2025-01-10T12:00:00+00:00'):
+    return feedback_event(CustomerFeedback(feedback=text, rating=rating), timestamp)
+
+
+class TestBinaryFormat(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.dir, name)
+
+    def test_jsonl_round_trip_is_lossless(self):
+        defaults = dict(empty_defaults(), name='Ann', team=['Ann', 'Bo'], plan={'steps': [1, 2]}, custom='x')
+        lines = [
+            encode_event(_event(json.dumps({'what_happened': 'Broken'}), rating=4)),
+            encode_event(_event('café ✓')),
+            encode_event(dict(_event('other'), event='something_else')),
+            json.dumps(defaults) + '\n',
+            encode_event(_event('big rating', rating=2 ** 40)),  # not int32: kept verbatim
+            '{"event": "x", "timestamp": "t", "feedback": 1}\n',  # unsorted keys: kept verbatim
+            '[1, 2, 3]\n',
+        ]
+        source, binary, back = self._path('in.jsonl'), self._path('out.bin'), self._path('back.jsonl')
+        with open(source, 'w', encoding='utf-8') as fh:
+            fh.writelines(lines)
+
+        self.assertEqual(binformat.convert_to_binary(source, binary), len(lines))
+        self.assertTrue(binformat.is_binary(binary))
+        tags = [body[0] for body in binformat.iter_bodies(binary)]
+        self.assertEqual(tags[:4], [binformat.TAG_EVENT] * 3 + [binformat.TAG_DEFAULTS])
+        self.assertEqual(tags[4:], [binformat.TAG_RAW] * 3)
+
+        binformat.convert_to_jsonl(binary, back)
+        with open(back, 'r', encoding='utf-8') as fh:
+            self.assertEqual(fh.readlines(), lines)
+        self.assertEqual(list(binformat.iter_records(binary)), list(binformat.iter_records(source)))
+
+    def test_truncated_tail_is_ignored(self):
+        path = self._path('events.bin')
+        with open(path, 'wb') as fh:
+            fh.write(binformat.MAGIC)
+            fh.write(binformat.encode_record(_event('one')))
+            fh.write(binformat.encode_record(_event('two'))[:-3])
+        self.assertEqual([e['feedback']['feedback'] for e in binformat.iter_records(path)], ['one'])
+
+    def test_binary_event_log_is_queryable(self):
+        path = self._path('events.bin')
+        with open_event_log(path, batch_size=2) as log:
+            self.assertIsInstance(log, binformat.BinaryEventLog)
+            log.write(_event('early', timestamp='2025-01-01T00:00:00+00:00'))
+            log.write(_event('late', rating=5, timestamp='2025-02-01T00:00:00+00:00'))
+        with open_event_log(path) as log:
+            log.write(_event('later', timestamp='2025-03-01T00:00:00+00:00'))
+
+        events = list(binformat.iter_records(path))
+        self.assertEqual([e['feedback']['feedback'] for e in events], ['early', 'late', 'later'])
+        self.assertEqual(events[1]['feedback']['rating'], 5)
+        lines = list(iter_matching_lines(path, start='2025-01-15', end='2025-02-15'))
+        self.assertEqual(lines, [encode_event(events[1]).rstrip('\n').encode('utf-8')])
+
+    def test_defaults_store_reads_either_format(self):
+        defaults = dict(empty_defaults(), name='Ann', team=['Ann', 'Bo'], what_happened='Broken')
+        store = JsonDefaultsStore(self._path('customer_defaults.bin'))
+        store.save(defaults)
+        self.assertTrue(binformat.is_binary(store.path))
+        self.assertEqual(store.load(), defaults)
+
+        json_store = JsonDefaultsStore(self._path('customer_defaults.json'))
+        json_store.save(defaults)
+        self.assertEqual(json_store.load(), defaults)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import sys
+import unittest
+
+from eight_disciplines.acme_customer_feedback import compute_workflow_status, evaluate_defaults, step_prereqs
+from eight_disciplines.compact import (
+    IssueColumns,
+    SlottedCustomerContact,
+    SlottedCustomerIssue,
+    SlottedEightDisciplineInputs,
+)
+from eight_disciplines.survey_tools import CustomerContact, CustomerIssue, EightDisciplineInputs
+
+DEFAULTS = {
+    'name': ' Sam ',
+    'phone': '555-5555',
+    'email': 'sam@example.com',
+    'what_happened': 'Package arrived damaged',
+    'when_happened': '2025-01-10',
+    'where_happened': 'Front porch',
+    'expecting_to_happen': 'Package should be intact',
+    'resolution_request': '',
+    'plan': 'Replace item',
+    'team': 'Alex, Blake',
+    'root_causes': '   ',
+}
+
+
+class TestSlottedModels(unittest.TestCase):
+    def test_slotted_models_match_dataclasses(self):
+        pairs = [
+            (SlottedCustomerContact, CustomerContact),
+            (SlottedCustomerIssue, CustomerIssue),
+            (SlottedEightDisciplineInputs, EightDisciplineInputs),
+        ]
+        for slotted_type, dataclass_type in pairs:
+            slotted = slotted_type.from_defaults(DEFAULTS)
+            model = dataclass_type.from_defaults(DEFAULTS)
+            self.assertEqual(slotted.to_dict(), model.__dict__)
+            self.assertEqual(slotted.to_dataclass(), model)
+            self.assertEqual(slotted_type.from_dataclass(model), slotted)
+            self.assertFalse(hasattr(slotted, '__dict__'))
+
+    def test_contact_to_defaults_drops_legacy_phone_key(self):
+        defaults = dict(DEFAULTS)
+        SlottedCustomerContact.from_defaults(defaults).to_defaults(defaults)
+        self.assertNotIn('phone', defaults)
+        self.assertEqual(defaults['phone_number'], '555-5555')
+
+    def test_unknown_fields_are_rejected(self):
+        with self.assertRaises(TypeError):
+            SlottedCustomerIssue(colour='red')
+
+
+class TestIssueColumns(unittest.TestCase):
+    def test_rows_rebuild_reports_and_share_strings(self):
+        documents = [dict(DEFAULTS, what_happened=f'Package {i} arrived damaged') for i in range(3)]
+        table = IssueColumns.from_defaults(documents)
+
+        self.assertEqual(len(table), 3)
+        for row, defaults in zip(table, documents):
+            expected = evaluate_defaults(dict(defaults))
+            self.assertEqual(row.report(), expected['report'])
+            status = compute_workflow_status(row.report(), list(row.report()), step_prereqs())
+            self.assertEqual(status['doing'], expected['doing_step'])
+
+        teams = table.column('team')
+        self.assertIs(teams[0][0], teams[2][0])
+        self.assertIs(table.column('where_happened')[0], sys.intern('Front porch'))
+        self.assertEqual(table[-1]['team'], ['Alex', 'Blake'])
+        with self.assertRaises(IndexError):
+            table[3]
+
+
+if __name__ == '__main__':
+    unittest.main()
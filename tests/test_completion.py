@@ -0,0 +1,57 @@
+import unittest
+
+from eight_disciplines import completion
+from eight_disciplines.completion import completion_matrix
+from eight_disciplines.reportgenerator import ReportGenerator
+from eight_disciplines.synthetic import synthetic_reports
+
+EDGE_REPORTS = [
+    {'issue': {'what_happened': 'x', 'when_happened': 'y', 'where_happened': 'z', 'expecting_to_happen': 'w'}},
+    {'issue': {'what_happened': 'x', 'when_happened': None, 'where_happened': 'z', 'expecting_to_happen': 'w'}},
+    {'issue': None, 'plan': {'a': None, 'b': {'c': None}}},
+    {'plan': {'a': None, 'b': {'c': 'set'}}, 'team': []},
+    {'team': None, 'root_causes': 0, 'extra': ''},
+    {},
+]
+
+
+class TestCompletionMatrix(unittest.TestCase):
+    def _check(self, reports, backend):
+        matrix = completion_matrix(reports, backend=backend)
+        for j, report in enumerate(reports):
+            self.assertEqual(set(matrix.done_steps(j)), ReportGenerator.check_nonempty_values(report))
+            self.assertEqual(set(matrix.missing_steps(j)), set(ReportGenerator.check_empty_values(report)))
+        expected_done = {step: 0 for step in matrix.steps}
+        for report in reports:
+            for step in ReportGenerator.check_nonempty_values(report):
+                expected_done[step] += 1
+        self.assertEqual(matrix.done_counts(), expected_done)
+
+    def test_bitset_matches_report_generator(self):
+        self._check(EDGE_REPORTS, 'bitset')
+        self._check(list(synthetic_reports(300, seed=4, complete_issue_ratio=0.5)), 'bitset')
+
+    @unittest.skipUnless(completion.np is not None, 'NumPy not installed')
+    def test_numpy_matches_bitset(self):
+        self._check(EDGE_REPORTS, 'numpy')
+        reports = list(synthetic_reports(300, seed=4))
+        bits = completion_matrix(reports, backend='bitset')
+        arrays = completion_matrix(reports, backend='numpy')
+        self.assertEqual(arrays.done.shape, (len(bits.steps), 300))
+        self.assertEqual(arrays.done_counts(), bits.done_counts())
+        self.assertEqual(arrays.missing_counts(), bits.missing_counts())
+
+    def test_explicit_steps_and_absent_keys(self):
+        matrix = completion_matrix([{'plan': 'p'}, {}], steps=['plan', 'team'], backend='bitset')
+        self.assertEqual(matrix.done, [0b01, 0])
+        self.assertEqual(matrix.present, [0b01, 0])
+        self.assertFalse(matrix.is_missing('team', 0))
+        self.assertEqual(completion_matrix([], backend='bitset').done_counts(), {})
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            completion_matrix([], backend='gpu')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import io
+import json
+import os
+import tempfile
+import threading
+import unittest
+from argparse import Namespace
+from contextlib import redirect_stdout
+
+from eight_disciplines.acme_customer_feedback import customer_service_chatbot
+from eight_disciplines.daemon import DaemonClient, DaemonServer, RequestHandler
+from eight_disciplines.eventlog import FeedbackEventLog
+
+DEFAULTS = {
+    'name': 'Sam',
+    'what_happened': 'Package arrived damaged',
+    'when_happened': '2025-01-10',
+    'where_happened': 'Front porch',
+    'expecting_to_happen': 'Package should be intact',
+    'team': 'Alex, Blake',
+    'plan': 'Replace item',
+}
+
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.tmpdir.name, 'daemon.sock')
+        self.log_path = os.path.join(self.tmpdir.name, 'feedback.jsonl')
+        self.event_log = FeedbackEventLog(self.log_path, batch_size=100)
+        self.server = DaemonServer(self.socket_path, RequestHandler(self.event_log))
+        self.thread = threading.Thread(target=self.server.serve_forever, kwargs={'poll_interval': 0.05})
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.thread.join()
+        self.server.server_close()
+        self.event_log.close()
+        self.tmpdir.cleanup()
+
+    def test_response_matches_cli_json_output(self):
+        defaults_file = os.path.join(self.tmpdir.name, 'defaults.json')
+        with open(defaults_file, 'w', encoding='utf-8') as fh:
+            json.dump(DEFAULTS, fh)
+        os.environ['ACME_FEEDBACK_LOG'] = os.path.join(self.tmpdir.name, 'cli.jsonl')
+        out = io.StringIO()
+        with redirect_stdout(out):
+            customer_service_chatbot(Namespace(use_defaults=False, non_interactive=True, format='json', defaults_file=defaults_file))
+        expected = json.loads(out.getvalue())
+
+        with DaemonClient(self.socket_path, timeout=5) as client:
+            by_value = client.request({'defaults': dict(DEFAULTS)})
+            by_file = client.request({'defaults_file': defaults_file})
+
+        self.assertEqual(by_value, expected)
+        self.assertEqual(by_file, expected)
+
+        self.event_log.flush()
+        with open(self.log_path, 'r', encoding='utf-8') as fh:
+            self.assertEqual(len(fh.readlines()), 2)
+
+    def test_bad_requests_get_errors_without_dropping_connection(self):
+        with DaemonClient(self.socket_path, timeout=5) as client:
+            self.assertIn('error', client.request({'nothing': True}))
+            self.assertIn('error', client.request(['not', 'an', 'object']))
+            self.assertFalse(client.request({'defaults': {}})['feedback_submitted'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import io
+import json
+import os
+import tempfile
+import threading
+import unittest
+from argparse import Namespace
+from contextlib import redirect_stdout
+from unittest import mock
+
+from eight_disciplines.acme_customer_feedback import customer_service_chatbot, log_feedback
+from eight_disciplines.dedup import FeedbackDeduplicator, content_hash
+from eight_disciplines.survey_tools import CustomerFeedback
+
+DEFAULTS = {
+    'what_happened': 'Package arrived damaged',
+    'when_happened': '2025-01-10',
+    'where_happened': 'Front porch',
+    'expecting_to_happen': 'Package should be intact',
+}
+
+
+class TestFeedbackDeduplicator(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.tmpdir.name, 'dedup.db')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_hash_ignores_json_key_order(self):
+        a = CustomerFeedback(feedback=json.dumps({'a': 1, 'b': 2}), rating=None)
+        b = CustomerFeedback(feedback='{"b": 2,  "a": 1}', rating=None)
+        self.assertEqual(content_hash(a), content_hash(b))
+        self.assertNotEqual(content_hash(a), content_hash(CustomerFeedback(feedback=a.feedback, rating=5)))
+
+    def test_window_and_counters_persist(self):
+        feedback = CustomerFeedback(feedback='same', rating=None)
+        with FeedbackDeduplicator(self.db, window=60) as dedup:
+            self.assertTrue(dedup.should_log(feedback, now=1000))
+            self.assertFalse(dedup.should_log(feedback, now=1030))
+        with FeedbackDeduplicator(self.db, window=60) as dedup:
+            self.assertFalse(dedup.should_log(feedback, now=1059))
+            self.assertTrue(dedup.should_log(feedback, now=1060))
+            self.assertEqual(dedup.suppressed_count(feedback), 2)
+            self.assertEqual(dedup.stats(), {'logged': 2, 'suppressed': 2, 'unique': 1})
+
+        with FeedbackDeduplicator(self.db, window=None) as dedup:
+            self.assertFalse(dedup.should_log(feedback, now=10 ** 9))
+
+    def test_failed_write_is_not_suppressed(self):
+        feedback = CustomerFeedback(feedback='retry me', rating=4)
+        broken_log = mock.Mock()
+        broken_log.log.side_effect = OSError('No space left on device')
+        working_log = mock.Mock()
+        with FeedbackDeduplicator(self.db) as dedup:
+            with self.assertRaises(OSError):
+                log_feedback(feedback, broken_log, dedup)
+            self.assertTrue(log_feedback(feedback, working_log, dedup))
+            self.assertFalse(log_feedback(feedback, working_log, dedup))
+            self.assertEqual(dedup.stats(), {'logged': 1, 'suppressed': 1, 'unique': 1})
+        working_log.log.assert_called_once_with(feedback)
+
+    def test_release_restores_an_expired_hash(self):
+        feedback = CustomerFeedback(feedback='again', rating=None)
+        with FeedbackDeduplicator(self.db, window=60) as dedup:
+            self.assertIsNotNone(dedup.reserve(feedback, now=1000))
+            reservation = dedup.reserve(feedback, now=2000)
+            self.assertEqual(reservation.previous, 1000)
+            dedup.release(reservation)
+            self.assertIsNone(dedup.reserve(feedback, now=1030))
+            self.assertEqual(dedup.stats(), {'logged': 1, 'suppressed': 1, 'unique': 1})
+
+    def test_concurrent_writers_let_one_submission_through(self):
+        feedback = CustomerFeedback(feedback='race', rating=1)
+        dedups = [FeedbackDeduplicator(self.db) for _ in range(8)]
+        barrier = threading.Barrier(len(dedups))
+        results = []
+
+        def submit(dedup):
+            barrier.wait()
+            results.append(dedup.reserve(feedback) is not None)
+
+        threads = [threading.Thread(target=submit, args=(dedup,)) for dedup in dedups]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for dedup in dedups:
+            dedup.close()
+        self.assertEqual(sorted(results), [False] * 7 + [True])
+
+    def test_cli_reruns_log_a_complete_issue_once(self):
+        defaults_file = os.path.join(self.tmpdir.name, 'defaults.json')
+        log_file = os.path.join(self.tmpdir.name, 'feedback.jsonl')
+        with open(defaults_file, 'w', encoding='utf-8') as fh:
+            json.dump(DEFAULTS, fh)
+        env = {'ACME_FEEDBACK_LOG': log_file, 'ACME_FEEDBACK_DEDUP_DB': self.db}
+        args = Namespace(use_defaults=True, non_interactive=True, format='json', defaults_file=defaults_file)
+        with mock.patch.dict(os.environ, env), redirect_stdout(io.StringIO()):
+            for _ in range(3):
+                customer_service_chatbot(args)
+
+        with open(log_file, 'r', encoding='utf-8') as fh:
+            self.assertEqual(len(fh.readlines()), 1)
+        with FeedbackDeduplicator(self.db) as dedup:
+            self.assertEqual(dedup.stats()['suppressed'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,184 @@
+import io
+import json
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import unittest
+from argparse import Namespace
+from contextlib import redirect_stdout
+from unittest import mock
+
+from eight_disciplines.acme_customer_feedback import customer_service_chatbot, load_defaults, save_defaults
+from eight_disciplines.defaults_store import (
+    DEFAULT_FIELDS,
+    JsonDefaultsStore,
+    ShardedDefaultsStore,
+    SqliteDefaultsStore,
+    merge_defaults,
+    open_defaults_store,
+    parse_sqlite_location,
+)
+
+
+def _set_own_key(path, worker):
+    store = JsonDefaultsStore(path)
+    for i in range(20):
+        defaults = store.load()
+        defaults[f'worker_{worker}'] = i
+        store.save(defaults)
+
+
+class TestDefaultsStore(unittest.TestCase):
+    def test_location_selects_store(self):
+        self.assertIsInstance(open_defaults_store('customer_defaults.json'), JsonDefaultsStore)
+        self.assertEqual(
+            parse_sqlite_location('sqlite:///var/lib/acme.db?customer=c1&issue=i9'),
+            ('/var/lib/acme.db', {'customer': 'c1', 'issue': 'i9'}),
+        )
+        self.assertEqual(parse_sqlite_location('sqlite://acme.db'), ('acme.db', {}))
+
+    def test_plus_addressed_email_is_kept(self):
+        self.assertEqual(
+            parse_sqlite_location('sqlite://acme.db?email=jo+acme@example.com&customer=a%20b'),
+            ('acme.db', {'email': 'jo+acme@example.com', 'customer': 'a b'}),
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = os.path.join(tmpdir, 'defaults.db')
+            save_defaults({'name': 'Jo', 'email': 'jo+acme@example.com'}, f'sqlite://{db}?customer=jo+acme@example.com')
+            self.assertEqual(load_defaults(f'sqlite://{db}?email=jo+acme@example.com')['name'], 'Jo')
+            shard = os.path.join(tmpdir, 'shards')
+            save_defaults({'name': 'Jo'}, f'shard://{shard}?customer=jo+acme@example.com')
+            self.assertEqual(open_defaults_store(f'shard://{shard}?customer=jo+acme@example.com').customer, 'jo+acme@example.com')
+
+    def test_sqlite_rows_are_per_customer_and_roundtrip(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = os.path.join(tmpdir, 'defaults.db')
+            sam = dict.fromkeys(DEFAULT_FIELDS)
+            sam.update(name='Sam', email='sam@example.com', team=['Alex', 'Blake'], custom_note='kept')
+            save_defaults(sam, f'sqlite://{db}?customer=sam')
+
+            self.assertEqual(load_defaults(f'sqlite://{db}?customer=sam'), sam)
+            self.assertIsNone(load_defaults(f'sqlite://{db}?customer=kim')['name'])
+            self.assertEqual(load_defaults(f'sqlite://{db}?email=sam@example.com')['name'], 'Sam')
+
+            with sqlite3.connect(db) as conn:
+                mode = conn.execute('PRAGMA journal_mode').fetchone()[0]
+            self.assertEqual(mode, 'wal')
+
+    def test_update_field_touches_one_field(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = os.path.join(tmpdir, 'defaults.db')
+            with SqliteDefaultsStore(db, customer='sam', issue_id='42') as store:
+                store.update_field('plan', 'Ship a replacement')
+                store.update_field('name', 'Sam')
+                self.assertEqual(store.find_by_email('nobody@example.com'), [])
+                defaults = store.load()
+                self.assertEqual(defaults['plan'], 'Ship a replacement')
+                self.assertEqual(defaults['name'], 'Sam')
+                with self.assertRaises(KeyError):
+                    store.update_field('not_a_field', 'x')
+
+    def test_chatbot_runs_against_sqlite_store(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            location = f"sqlite://{os.path.join(tmpdir, 'defaults.db')}?customer=sam"
+            defaults = dict.fromkeys(DEFAULT_FIELDS)
+            defaults.update(
+                what_happened='Package arrived damaged',
+                when_happened='2025-01-10',
+                where_happened='Front porch',
+                expecting_to_happen='Package should be intact',
+                team='Alex, Blake',
+            )
+            save_defaults(defaults, location)
+            os.environ['ACME_FEEDBACK_LOG'] = os.path.join(tmpdir, 'feedback.jsonl')
+            args = Namespace(use_defaults=False, non_interactive=True, format='json', defaults_file=location)
+
+            out = io.StringIO()
+            with redirect_stdout(out):
+                customer_service_chatbot(args)
+
+            self.assertTrue(json.loads(out.getvalue())['feedback_submitted'])
+            self.assertEqual(load_defaults(location)['team'], ['Alex', 'Blake'])
+
+
+class TestSafeSaves(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'customer_defaults.json')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_merge_keeps_changes_made_by_others(self):
+        base = {'name': 'Sam', 'plan': None, 'team': None}
+        current = {'name': 'Sam', 'plan': 'Theirs', 'team': None}
+        ours = {'name': 'Samuel', 'plan': None, 'team': ['Alex']}
+        self.assertEqual(merge_defaults(current, ours, base), {'name': 'Samuel', 'plan': 'Theirs', 'team': ['Alex']})
+        self.assertEqual(merge_defaults(current, ours), ours)
+        self.assertEqual(merge_defaults({'a': 1, 'b': 2}, {'a': 1}, {'a': 1, 'b': 2}), {'a': 1})
+
+    def test_interleaved_sessions_do_not_lose_answers(self):
+        save_defaults(dict.fromkeys(DEFAULT_FIELDS), self.path)
+        first, second = JsonDefaultsStore(self.path), JsonDefaultsStore(self.path)
+        a, b = first.load(), second.load()
+        a['plan'] = 'Replace item'
+        b['root_causes'] = 'Weak packaging'
+        first.save(a)
+        second.save(b)
+        stored = load_defaults(self.path)
+        self.assertEqual((stored['plan'], stored['root_causes']), ('Replace item', 'Weak packaging'))
+
+    def test_failed_write_leaves_previous_file(self):
+        save_defaults({'name': 'Sam'}, self.path)
+        with mock.patch('eight_disciplines.defaults_store.os.replace', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                save_defaults({'name': 'Kim'}, self.path)
+        self.assertEqual(load_defaults(self.path), {'name': 'Sam'})
+        self.assertEqual(sorted(os.listdir(self.tmpdir.name)), ['customer_defaults.json', 'customer_defaults.json.lock'])
+
+    def test_save_is_fsynced_around_the_rename(self):
+        calls = []
+        real_fsync, real_replace = os.fsync, os.replace
+
+        def fsync(fd):
+            calls.append('fsync')
+            real_fsync(fd)
+
+        def replace(src, dst):
+            calls.append(('replace', os.path.dirname(src) == self.tmpdir.name, os.path.basename(dst)))
+            real_replace(src, dst)
+
+        with mock.patch('eight_disciplines.defaults_store.os.fsync', fsync), mock.patch('eight_disciplines.defaults_store.os.replace', replace):
+            save_defaults({'name': 'Sam'}, self.path)
+        self.assertEqual(calls, ['fsync', ('replace', True, 'customer_defaults.json'), 'fsync'])
+        self.assertEqual(load_defaults(self.path), {'name': 'Sam'})
+
+    def test_processes_updating_one_file_merge(self):
+        context = multiprocessing.get_context('fork' if hasattr(os, 'fork') else 'spawn')
+        processes = [context.Process(target=_set_own_key, args=(self.path, worker)) for worker in range(6)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(60)
+        self.assertEqual([process.exitcode for process in processes], [0] * 6)
+        stored = load_defaults(self.path)
+        self.assertEqual({key: stored[key] for key in stored if key.startswith('worker_')}, {f'worker_{worker}': 19 for worker in range(6)})
+
+    def test_sharded_layout_gives_each_customer_a_file(self):
+        root = os.path.join(self.tmpdir.name, 'shards')
+        save_defaults({'name': 'Sam'}, f'shard://{root}?customer=sam')
+        save_defaults({'name': 'Kim'}, f'shard://{root}?customer=kim&issue=7')
+        self.assertEqual(load_defaults(f'shard://{root}?customer=sam')['name'], 'Sam')
+        self.assertEqual(load_defaults(f'shard://{root}?customer=kim&issue=7')['name'], 'Kim')
+        self.assertIsNone(load_defaults(f'shard://{root}?customer=kim')['name'])
+
+        store = open_defaults_store(f'shard://{root}?customer=sam')
+        self.assertIsInstance(store, ShardedDefaultsStore)
+        relative = os.path.relpath(store.path, root).split(os.sep)
+        self.assertEqual(len(relative), 3)
+        self.assertTrue(relative[2].startswith(relative[0] + relative[1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from eight_disciplines.acme_customer_feedback import log_feedback
+from eight_disciplines.eventlog import FeedbackEventLog
+from eight_disciplines.survey_tools import CustomerFeedback
+
+
+def _read_lines(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as fh:
+        return fh.readlines()
+
+
+class TestFeedbackEventLog(unittest.TestCase):
+    def test_records_are_buffered_until_batch_size(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'events.jsonl')
+            event_log = FeedbackEventLog(path, batch_size=3, flush_interval=3600)
+            log_feedback(CustomerFeedback(feedback='a', rating=1), event_log)
+            log_feedback(CustomerFeedback(feedback='b', rating=2), event_log)
+            self.assertEqual(_read_lines(path), [])
+
+            log_feedback(CustomerFeedback(feedback='c', rating=3), event_log)
+            self.assertEqual(len(_read_lines(path)), 3)
+
+            log_feedback(CustomerFeedback(feedback='d', rating=None), event_log)
+            event_log.close()
+            lines = _read_lines(path)
+            self.assertEqual([json.loads(line)['feedback']['feedback'] for line in lines], ['a', 'b', 'c', 'd'])
+            self.assertTrue(event_log.closed)
+
+    def test_time_window_triggers_flush(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'events.jsonl')
+            with FeedbackEventLog(path, batch_size=1000, flush_interval=0) as event_log:
+                event_log.log(CustomerFeedback(feedback='late', rating=None))
+                self.assertEqual(len(_read_lines(path)), 1)
+
+    def test_quiet_writer_flushes_within_the_window(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'events.jsonl')
+            with FeedbackEventLog(path, batch_size=1000, flush_interval=0.05) as event_log:
+                event_log.log(CustomerFeedback(feedback='quiet', rating=None))
+                self.assertEqual(_read_lines(path), [])
+                deadline = time.monotonic() + 5
+                while not _read_lines(path) and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                self.assertEqual(len(_read_lines(path)), 1)
+
+    def test_idle_flush_does_not_fsync(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'events.jsonl')
+            with mock.patch('os.fsync') as fsync:
+                with FeedbackEventLog(path, batch_size=1000, flush_interval=3600, durability='batch') as event_log:
+                    event_log.flush()
+                    self.assertEqual(fsync.call_count, 0)
+                    event_log.log(CustomerFeedback(feedback='x', rating=5))
+                    event_log.flush()
+                    event_log.flush()
+                    self.assertEqual(fsync.call_count, 1)
+
+    def test_record_durability_writes_every_record(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'events.jsonl')
+            with FeedbackEventLog(path, batch_size=1000, flush_interval=3600, durability='record') as event_log:
+                event_log.log(CustomerFeedback(feedback='x', rating=5))
+                self.assertEqual(len(_read_lines(path)), 1)
+
+    def test_rejects_unknown_durability_and_closed_writes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'events.jsonl')
+            with self.assertRaises(ValueError):
+                FeedbackEventLog(path, durability='sometimes')
+            event_log = FeedbackEventLog(path)
+            event_log.close()
+            with self.assertRaises(ValueError):
+                event_log.log(CustomerFeedback(feedback='x', rating=None))
+
+
+if __name__ == '__main__':
+    unittest.main()
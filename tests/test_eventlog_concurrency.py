@@ -0,0 +1,141 @@
+import gzip
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import unittest
+from collections import Counter
+
+from eight_disciplines.eventlog import FeedbackEventLog, feedback_event
+from eight_disciplines.eventsink import EventSinkClient, EventSinkServer
+from eight_disciplines.segments import SegmentedEventLog, iter_segment_events, open_event_log, read_manifest
+from eight_disciplines.survey_tools import CustomerFeedback
+
+PROCESSES = 8
+RECORDS = 150
+# Larger than a pipe or stdio buffer, so unlocked batches would be split.
+PAYLOAD = 'x' * 20_000
+
+
+def _hammer_file(path, worker):
+    with FeedbackEventLog(path, batch_size=1 + worker % 4, flush_interval=3600) as event_log:
+        for i in range(RECORDS):
+            event_log.log(CustomerFeedback(feedback=f'{worker}:{i}:{PAYLOAD}', rating=worker))
+
+
+def _hammer_sink(socket_path, worker):
+    with EventSinkClient(socket_path) as event_log:
+        for i in range(RECORDS):
+            event_log.log(CustomerFeedback(feedback=f'{worker}:{i}:{PAYLOAD}', rating=worker))
+
+
+def _hammer_segments(directory, worker):
+    # Odd workers reopen the log per record, as one-shot CLI runs do.
+    day = f'2025-02-{worker + 1:02d}T12:00:00+00:00'
+    if worker % 2:
+        for i in range(RECORDS // 5):
+            with SegmentedEventLog(directory, max_bytes=4000, batch_size=1) as event_log:
+                event_log.write(feedback_event(CustomerFeedback(feedback=f'{worker}:{i}', rating=worker), day))
+        return
+    with SegmentedEventLog(directory, max_bytes=4000, batch_size=3) as event_log:
+        for i in range(RECORDS // 5):
+            event_log.write(feedback_event(CustomerFeedback(feedback=f'{worker}:{i}', rating=worker), day))
+
+
+def _run_processes(target, arg):
+    context = multiprocessing.get_context('fork' if hasattr(os, 'fork') else 'spawn')
+    processes = [context.Process(target=target, args=(arg, worker)) for worker in range(PROCESSES)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+    return [process.exitcode for process in processes]
+
+
+class TestMultiProcessAppends(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'events.jsonl')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def assert_complete_log(self):
+        per_worker = Counter()
+        with open(self.path, 'rb') as fh:
+            for line in fh:
+                self.assertTrue(line.endswith(b'\n'))
+                feedback = json.loads(line)['feedback']
+                worker, _, payload = feedback['feedback'].split(':', 2)
+                self.assertEqual(payload, PAYLOAD)
+                self.assertEqual(int(worker), feedback['rating'])
+                per_worker[int(worker)] += 1
+        self.assertEqual(per_worker, {worker: RECORDS for worker in range(PROCESSES)})
+
+    def test_concurrent_writers_never_interleave(self):
+        self.assertEqual(_run_processes(_hammer_file, self.path), [0] * PROCESSES)
+        self.assert_complete_log()
+
+    def test_workers_feeding_a_single_writer_sink(self):
+        socket_path = os.path.join(self.tmpdir.name, 'sink.sock')
+        server = EventSinkServer(socket_path, FeedbackEventLog(self.path, batch_size=64))
+        thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05})
+        thread.start()
+        try:
+            self.assertEqual(_run_processes(_hammer_sink, socket_path), [0] * PROCESSES)
+            with EventSinkClient(socket_path) as client:
+                client.write(['not', 'an', 'object'])
+            # Clients have closed; wait for the handlers to drain their sockets.
+            deadline = time.monotonic() + 30
+            while (server.records, server.invalid_lines) != (PROCESSES * RECORDS, 1) and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            server.shutdown()
+            thread.join()
+            server.server_close()
+            server.event_log.close()
+        self.assertEqual(server.records, PROCESSES * RECORDS)
+        self.assert_complete_log()
+        self.assertFalse(os.path.exists(socket_path))
+
+    def test_concurrent_segmented_writers_keep_the_manifest_exact(self):
+        directory = os.path.join(self.tmpdir.name, 'events')
+        self.assertEqual(_run_processes(_hammer_segments, directory), [0] * PROCESSES)
+        with SegmentedEventLog(directory, max_bytes=4000):
+            pass  # finishes compressing anything left over
+        entries = read_manifest(directory)['segments']
+        sealed = [e for e in entries if e['sealed']]
+        self.assertGreater(len(sealed), 3)
+        self.assertEqual(len({e['seq'] for e in entries}), len(entries))
+        self.assertTrue(all(e['name'].endswith('.jsonl.gz') for e in sealed))
+        self.assertFalse([name for name in os.listdir(directory) if name.endswith('.tmp')])
+
+        events = list(iter_segment_events(directory))
+        self.assertEqual(len(events), PROCESSES * (RECORDS // 5))
+        for entry in sealed:
+            with gzip.open(os.path.join(directory, entry['name']), 'rb') as fh:
+                self.assertEqual(sum(1 for _ in fh), entry['records'])
+        for worker in range(PROCESSES):
+            day = f'2025-02-{worker + 1:02d}'
+            found = Counter(e['feedback']['rating'] for e in iter_segment_events(directory, f'{day}T00:00:00', f'{day}T23:59:59'))
+            self.assertEqual(found, {worker: RECORDS // 5})
+
+    def test_open_event_log_uses_sink_from_environment(self):
+        socket_path = os.path.join(self.tmpdir.name, 'sink.sock')
+        server = EventSinkServer(socket_path, FeedbackEventLog(self.path))
+        os.environ['ACME_FEEDBACK_SINK'] = socket_path
+        try:
+            with open_event_log() as event_log:
+                self.assertIsInstance(event_log, EventSinkClient)
+            with open_event_log(self.path) as event_log:
+                self.assertIsInstance(event_log, FeedbackEventLog)
+        finally:
+            del os.environ['ACME_FEEDBACK_SINK']
+            server.server_close()
+            server.event_log.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from eight_disciplines.eventquery import EventLogIndex, iter_matching_lines, query_events
+
+BASE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _write_log(path, count, start=0):
+    with open(path, 'a', encoding='utf-8') as fh:
+        for i in range(start, start + count):
+            payload = {
+                'timestamp': (BASE + timedelta(minutes=i)).isoformat(),
+                'event': 'customer_feedback_submitted' if i % 3 else 'other_event',
+                'feedback': {'feedback': f'record {i}', 'rating': None},
+            }
+            fh.write(json.dumps(payload, sort_keys=True) + '\n')
+
+
+class TestEventQuery(unittest.TestCase):
+    def test_range_query_matches_full_scan(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log = os.path.join(tmpdir, 'events.jsonl')
+            _write_log(log, 500)
+            index = EventLogIndex.open(log, stride=1024)
+            self.assertGreater(len(index.offsets), 10)
+
+            start = BASE + timedelta(minutes=123)
+            end = BASE + timedelta(minutes=321)
+            got = [json.loads(line) for line in iter_matching_lines(log, start, end, 'customer_feedback_submitted', index=index)]
+
+            with open(log, 'r', encoding='utf-8') as fh:
+                expected = [
+                    record for record in map(json.loads, fh)
+                    if record['event'] == 'customer_feedback_submitted'
+                    and start <= datetime.fromisoformat(record['timestamp']) <= end
+                ]
+            self.assertEqual(got, expected)
+
+    def test_index_is_persisted_and_extended(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log = os.path.join(tmpdir, 'events.jsonl')
+            _write_log(log, 100)
+            first = EventLogIndex.open(log, stride=512)
+            self.assertTrue(os.path.exists(log + '.idx'))
+
+            _write_log(log, 100, start=100)
+            grown = EventLogIndex.open(log, stride=512)
+            self.assertEqual(grown.offsets[:len(first.offsets)], first.offsets)
+            self.assertGreater(len(grown.offsets), len(first.offsets))
+
+            late = list(query_events(log, start='2025-01-01T03:10:00+00:00'))
+            self.assertEqual([r['feedback']['feedback'] for r in late], [f'record {i}' for i in range(190, 200)])
+
+    def test_missing_log_yields_nothing(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.assertEqual(list(query_events(os.path.join(tmpdir, 'missing.jsonl'))), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from eight_disciplines.acme_customer_feedback import build_eight_disciplines, evaluate_defaults
+from eight_disciplines.export import export_reports, iter_reports, main, report_from_record
+from eight_disciplines.reportgenerator import ReportGenerator
+from eight_disciplines.survey_tools import get_eight_disciplines_inputs, get_issue
+from eight_disciplines.synthetic import synthetic_defaults, synthetic_reports
+
+
+def _eight_d(defaults):
+    _, eight_d_data = get_eight_disciplines_inputs(defaults, interactive=False)
+    return build_eight_disciplines(get_issue(defaults), eight_d_data)
+
+
+class TestStreamingRender(unittest.TestCase):
+    def test_fragments_join_to_existing_text(self):
+        for report in synthetic_reports(200, seed=4):
+            generator = ReportGenerator(report)
+            self.assertEqual(''.join(generator.iter_scrum_report()), generator.scrum_report())
+            out = io.StringIO()
+            generator.write_scrum_report(out)
+            self.assertEqual(out.getvalue(), generator.scrum_report())
+
+    def test_framed_fragments_match_inform_scrum(self):
+        for defaults in synthetic_defaults(50, seed=5):
+            eight_d = _eight_d(defaults)
+            out = io.StringIO()
+            eight_d.write_scrum(out)
+            self.assertEqual(out.getvalue(), eight_d.inform_scrum())
+            self.assertTrue(out.getvalue().startswith('----------- SCRUM REPORT -------------\n'))
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        self.documents = list(synthetic_defaults(30, seed=6))
+        self.expected = ''.join(_eight_d(d).inform_scrum() + '\n' for d in self.documents)
+
+    def test_export_matches_cli_scrum_output(self):
+        lines = [json.dumps(d) for d in self.documents]
+        out = io.StringIO()
+        self.assertEqual(export_reports(iter_reports(lines), out), 30)
+        self.assertEqual(out.getvalue(), self.expected)
+
+        parallel = io.StringIO()
+        export_reports(iter_reports(lines), parallel, workers=2)
+        self.assertEqual(parallel.getvalue(), self.expected)
+
+    def test_batch_results_and_bad_lines(self):
+        results = [json.dumps(evaluate_defaults(dict(d))) for d in self.documents[:3]]
+        errors = io.StringIO()
+        batch_error = json.dumps({'line': 4, 'error': 'invalid JSON: x'})
+        reports = list(iter_reports(results + ['not json', '[1]', '', batch_error], errors))
+        self.assertEqual(reports, [report_from_record(json.loads(line)) for line in results])
+        self.assertEqual(errors.getvalue().count('\n'), 3)
+        self.assertIn('line 7: --batch error: invalid JSON: x', errors.getvalue())
+
+        out = io.StringIO()
+        export_reports(reports, out, framed=False)
+        self.assertEqual(out.getvalue(), ''.join(ReportGenerator(r).scrum_report() + '\n' for r in reports))
+
+    def test_cli_writes_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = os.path.join(tmpdir, 'issues.jsonl')
+            target = os.path.join(tmpdir, 'reports.txt')
+            with open(source, 'w', encoding='utf-8') as fh:
+                fh.writelines(json.dumps(d) + '\n' for d in self.documents)
+            main([source, '--output', target])
+            with open(target, 'r', encoding='utf-8') as fh:
+                self.assertEqual(fh.read(), self.expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
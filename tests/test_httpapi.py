@@ -0,0 +1,146 @@
+import asyncio
+import http.client
+import json
+import os
+import socket
+import tempfile
+import threading
+import unittest
+
+from eight_disciplines.acme_customer_feedback import evaluate_defaults
+from eight_disciplines.dedup import FeedbackDeduplicator
+from eight_disciplines.eventlog import FeedbackEventLog
+from eight_disciplines.httpapi import EightDHTTPServer, render_congratulations, render_scrum
+
+DEFAULTS = {
+    'name': 'Sam',
+    'what_happened': 'Package arrived damaged',
+    'when_happened': '2025-01-10',
+    'where_happened': 'Front porch',
+    'expecting_to_happen': 'Package should be intact',
+    'team': 'Alex, Blake',
+    'plan': 'Replace item',
+}
+
+
+class TestHTTPAPI(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.tmpdir.name, 'feedback.jsonl')
+        self.loop = asyncio.new_event_loop()
+        self.server = EightDHTTPServer(max_concurrency=4, event_log=FeedbackEventLog(self.log_path, batch_size=100))
+        self.host, self.port = self.loop.run_until_complete(self.server.start('127.0.0.1', 0))
+        self.thread = threading.Thread(target=self.loop.run_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        asyncio.run_coroutine_threadsafe(self.server.close(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+        self.tmpdir.cleanup()
+
+    def _post(self, conn, path, document):
+        conn.request('POST', path, body=json.dumps(document), headers={'Content-Type': 'application/json'})
+        response = conn.getresponse()
+        return response.status, response.getheader('Content-Type'), response.read().decode('utf-8')
+
+    def test_endpoints_share_one_keep_alive_connection(self):
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=5)
+        try:
+            status, ctype, body = self._post(conn, '/workflow-status', DEFAULTS)
+            self.assertEqual(status, 200)
+            self.assertEqual(ctype, 'application/json')
+            self.assertEqual(json.loads(body), evaluate_defaults(dict(DEFAULTS)))
+            sock = conn.sock
+
+            status, ctype, body = self._post(conn, '/scrum-report', DEFAULTS)
+            self.assertEqual((status, body), (200, render_scrum(dict(DEFAULTS))))
+            self.assertTrue(ctype.startswith('text/plain'))
+
+            status, _, body = self._post(conn, '/congratulations', DEFAULTS)
+            self.assertEqual((status, body), (200, render_congratulations(dict(DEFAULTS))))
+
+            status, _, body = self._post(conn, '/feedback', {'feedback': 'Great help', 'rating': 9})
+            self.assertEqual(status, 202)
+            self.assertIs(conn.sock, sock)
+        finally:
+            conn.close()
+
+        self.server.event_log.flush()
+        with open(self.log_path, 'r', encoding='utf-8') as fh:
+            events = [json.loads(line) for line in fh]
+        self.assertEqual([e['feedback'] for e in events], [{'feedback': 'Great help', 'rating': 9}])
+
+    def test_repeated_feedback_is_deduplicated(self):
+        self.server.dedup = FeedbackDeduplicator(os.path.join(self.tmpdir.name, 'dedup.db'))
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=5)
+        try:
+            replies = [self._post(conn, '/feedback', {'feedback': 'Same again', 'rating': 7}) for _ in range(3)]
+        finally:
+            conn.close()
+        self.assertEqual([(status, json.loads(body)['status']) for status, _, body in replies], [(202, 'accepted'), (202, 'duplicate'), (202, 'duplicate')])
+        self.assertEqual(self.server.dedup.stats(), {'logged': 1, 'suppressed': 2, 'unique': 1})
+
+        self.server.event_log.flush()
+        with open(self.log_path, 'r', encoding='utf-8') as fh:
+            self.assertEqual(len(fh.readlines()), 1)
+
+    def test_errors_keep_the_connection_usable(self):
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=5)
+        try:
+            conn.request('POST', '/workflow-status', body=b'not json')
+            response = conn.getresponse()
+            self.assertEqual(response.status, 400)
+            response.read()
+
+            conn.request('GET', '/scrum-report')
+            response = conn.getresponse()
+            self.assertEqual(response.status, 405)
+            response.read()
+
+            conn.request('GET', '/nope')
+            response = conn.getresponse()
+            self.assertEqual(response.status, 404)
+            response.read()
+
+            status, _, _ = self._post(conn, '/feedback', {'feedback': 'ok', 'rating': 11})
+            self.assertEqual(status, 400)
+
+            conn.request('GET', '/health')
+            response = conn.getresponse()
+            self.assertEqual(json.loads(response.read()), {'status': 'ok'})
+        finally:
+            conn.close()
+
+    def test_invalid_content_length_is_a_bad_request(self):
+        for length in (b'-5', b'abc'):
+            with socket.create_connection((self.host, self.port), timeout=5) as sock:
+                sock.sendall(b'POST /feedback HTTP/1.1\r\nHost: x\r\nContent-Length: ' + length + b'\r\n\r\n{}')
+                response = b''
+                while chunk := sock.recv(4096):
+                    response += chunk
+            self.assertTrue(response.startswith(b'HTTP/1.1 400 '), response)
+            self.assertIn(b'invalid Content-Length', response)
+
+    def test_concurrent_connections(self):
+        results = []
+
+        def client():
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=10)
+            try:
+                for _ in range(5):
+                    results.append(self._post(conn, '/workflow-status', DEFAULTS)[0])
+            finally:
+                conn.close()
+
+        threads = [threading.Thread(target=client) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [200] * 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
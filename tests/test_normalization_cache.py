@@ -0,0 +1,60 @@
+import unittest
+
+from eight_disciplines import survey_tools
+from eight_disciplines.survey_tools import (
+    CustomerIssue,
+    EightDisciplineInputs,
+    _normalize_optional,
+    _normalize_optional_list,
+    clear_normalization_cache,
+    normalization_stats,
+    normalize_names,
+    normalize_text,
+)
+
+VALUES = [None, '', '   ', ' Front porch ', 'x', 42, 0, 'Alice, Bob, , Carol ', ['Alice', ' Bob ', ''], [], ['', None], [' A', 3]]
+
+
+class TestNormalizationCache(unittest.TestCase):
+    def setUp(self):
+        clear_normalization_cache()
+
+    def tearDown(self):
+        clear_normalization_cache()
+
+    def test_same_results_as_uncached_helpers(self):
+        for _ in range(2):
+            for value in VALUES:
+                self.assertEqual(normalize_text(value), _normalize_optional(value))
+                self.assertEqual(normalize_names(value), _normalize_optional_list(value))
+
+    def test_repeated_values_share_objects_and_count_hits(self):
+        first = EightDisciplineInputs.from_defaults({'team': 'Alice, Bob', 'plan': ' Replace item '})
+        second = EightDisciplineInputs.from_defaults({'team': ['Alice', 'Bob '], 'plan': 'Replace item'})
+        self.assertEqual(first.team, second.team)
+        self.assertIs(first.team[0], second.team[0])
+        self.assertIsNot(first.team, second.team)
+        where = [CustomerIssue.from_defaults({'where_happened': f' Front porch{suffix}'.rstrip()}).where_happened for suffix in ('', ' ')]
+        self.assertIs(where[0], where[1])
+
+        EightDisciplineInputs.from_defaults({'team': 'Alice, Bob', 'plan': ' Replace item '})
+        stats = normalization_stats()
+        self.assertEqual(stats['misses'], 2)
+        self.assertEqual(stats['hits'], 1)
+
+    def test_returned_lists_are_private_copies(self):
+        names = normalize_names('Alice, Bob')
+        names.append('Mallory')
+        self.assertEqual(normalize_names('Alice, Bob'), ['Alice', 'Bob'])
+
+    def test_evictions_are_counted(self):
+        maxsize = survey_tools.NORMALIZE_CACHE_SIZE
+        for i in range(maxsize + 10):
+            normalize_names(f'Alice, member {i}')
+        stats = normalization_stats()
+        self.assertEqual(stats['size'], maxsize)
+        self.assertEqual(stats['evictions'], 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
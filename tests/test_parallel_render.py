@@ -0,0 +1,50 @@
+import unittest
+
+from eight_disciplines.reportgenerator import ReportGenerator, render_scrum_reports
+from eight_disciplines.survey_tools import CustomerIssue
+
+STEPS = [
+    'plan',
+    'prerequisites',
+    'team',
+    'problem_description',
+    'interim_containment_plan',
+    'root_causes',
+    'permanent_corrections',
+    'corrective_actions',
+    'preventive_measures',
+]
+
+
+def _report(n):
+    report = {'issue': CustomerIssue(what_happened=f'issue {n}', when_happened='now', where_happened='here', expecting_to_happen='ok').to_dict()}
+    for i, step in enumerate(STEPS):
+        if i < n % (len(STEPS) + 1):
+            report[step] = ['Alex', 'Blake'] if step == 'team' else f'{step} {n}'
+        else:
+            report[step] = None
+    return report
+
+
+class TestParallelRender(unittest.TestCase):
+    def test_process_pool_preserves_input_order(self):
+        reports = [_report(n) for n in range(23)]
+        expected = [ReportGenerator(r).scrum_report() for r in reports]
+
+        rendered = list(render_scrum_reports(iter(reports), workers=2, chunk_size=3, serial_threshold=4))
+
+        self.assertEqual(rendered, expected)
+
+    def test_small_inputs_render_serially(self):
+        reports = [_report(n) for n in range(3)]
+        expected = [ReportGenerator(r).scrum_report() for r in reports]
+        self.assertEqual(list(render_scrum_reports(reports, workers=4)), expected)
+        self.assertEqual(list(render_scrum_reports([], workers=4)), [])
+
+    def test_rejects_invalid_chunk_size(self):
+        with self.assertRaises(ValueError):
+            list(render_scrum_reports([], chunk_size=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+from eight_disciplines.replay import ReplayError, generate_transcripts, record_session, replay_session, run_replay
+
+
+class TestReplay(unittest.TestCase):
+    def test_recorded_session_replays_to_same_defaults(self):
+        answers = iter(['Alice', '', 'a@example.com', 'maybe', 'y', 'Broken', '2025-01-10', 'Porch', 'Intact', '',
+                        'Replace it', '', 'Alex, Blake', '', '', '', '', '', '', 'eleven', '7'])
+        printed = []
+        transcript = record_session({}, lambda _: next(answers), printed.append, rate=True)
+
+        self.assertEqual(transcript['result']['team'], ['Alex', 'Blake'])
+        self.assertIn('Please answer Y or n.', printed)
+        self.assertEqual(replay_session(transcript), transcript['result'])
+
+    def test_mismatched_transcripts_fail(self):
+        transcript = next(generate_transcripts(1, seed=3))
+        with self.assertRaises(ReplayError):
+            replay_session(dict(transcript, answers=transcript['answers'][:-1]))
+        with self.assertRaises(ReplayError):
+            replay_session(dict(transcript, answers=transcript['answers'] + ['extra']))
+        with self.assertRaises(ReplayError):
+            replay_session(dict(transcript, result=dict(transcript['result'], name='Someone else')))
+
+    def test_generated_transcripts_are_deterministic(self):
+        self.assertEqual(list(generate_transcripts(5, seed=1)), list(generate_transcripts(5, seed=1)))
+        self.assertEqual(list(generate_transcripts(2, seed=1, start=3)), list(generate_transcripts(5, seed=1))[3:])
+
+    def test_run_replay_across_workers(self):
+        result = run_replay(sessions=40, seed=2, workers=2, chunk_size=10)
+        self.assertEqual(result['sessions'], 40)
+        self.assertEqual(result['failed'], 0)
+        self.assertEqual(result['latency_ms']['count'], 40)
+        self.assertGreater(result['sessions_per_sec'], 0)
+
+        transcripts = list(generate_transcripts(3, seed=2))
+        broken = dict(transcripts[0], answers=[])
+        result = run_replay(transcripts + [broken], repeat=2)
+        self.assertEqual((result['sessions'], result['failed']), (8, 2))
+        self.assertEqual(len(result['errors']), 2)
+
+    def test_unexpected_errors_count_as_failed_sessions(self):
+        transcripts = list(generate_transcripts(3, seed=4))
+        result = run_replay(transcripts[:1] + [{'defaults': {}}] + transcripts[1:], chunk_size=10)
+        self.assertEqual((result['sessions'], result['failed']), (4, 1))
+        self.assertEqual(result['latency_ms']['count'], 3)
+        self.assertEqual(result['errors'], ["KeyError: 'answers'"])
+
+
+if __name__ == '__main__':
+    unittest.main()
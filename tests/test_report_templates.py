@@ -0,0 +1,137 @@
+import unittest
+
+from eight_disciplines.reportgenerator import ReportGenerator
+
+COMPLETE_REPORT = {
+    'issue': {
+        'what_happened': 'Box crushed',
+        'when_happened': 'Monday',
+        'where_happened': 'Dock 4',
+        'expecting_to_happen': 'Intact box',
+        'resolution_request': 'Refund',
+    },
+    'plan': 'Re-ship',
+    'prerequisites': 'Stock check',
+    'team': ['Ana', 'Bo', 'Cy'],
+    'problem_description': 'Weak carton',
+    'interim_containment_plan': 'Double box',
+    'root_causes': 'Supplier change',
+    'permanent_corrections': 'New spec',
+    'corrective_actions': 'Re-pack stock',
+    'preventive_measures': 'Audit cartons',
+}
+
+COMPLETE_SCRUM = (
+    'A customer has an issue:\n'
+    '    - Box crushed\n'
+    '      - When: Monday\n'
+    '      - Where: Dock 4\n'
+    '      - Expecting to happen: Intact box\n'
+    '      - Resolution request: Refund\n'
+    '\n'
+    'A quick update on our progress.\n'
+    '\n'
+    "Here's what we've accomplished so far:\n"
+    '\n'
+    '    - We received the issue from our dear customer.\n'
+    '       - Expectation: Intact box\n'
+    '       - Reality: Box crushed\n'
+    '       - When: Monday\n'
+    '       - Where: Dock 4\n'
+    '       - Request: Refund\n'
+    '    - We created a plan to address the issue.\n'
+    '       - Re-ship\n'
+    '    - We identified the prerequisites needed to carry out the plan.\n'
+    '       - Stock check\n'
+    '    - We assembled the team of people with product/process knowledge to carry out the plan.\n'
+    '       - Ana, Bo and Cy\n'
+    '    - We specified the problem by identifying in quantifiable terms the who, what, where, when, why, how, and how many (5W2H) for the problem..\n'
+    '       - Weak carton\n'
+    '    - We defined and implemented containment actions to isolate the problem from any customer.\n'
+    '       - Double box\n'
+    '    - We determined, identified and verified all applicable causes that could explain why the problem occurred.\n'
+    '       - Supplier change\n'
+    '    - We developed a set of permanent corrections to address the root causes.\n'
+    '       - New spec\n'
+    '    - We carried out corrective actions to address the immediate symptoms.\n'
+    '       - Re-pack stock\n'
+    "    - We put in place preventive measures to ensure the problem doesn't recur.\n"
+    '       - Audit cartons\n'
+    '\n'
+    "We've completed all the steps!"
+)
+
+COMPLETE_CONGRATS = (
+    'Dear Ana, Bo and Cy,\n'
+    '\n'
+    'Congratulations on successfully resolving the issue Box crushed Dock 4! Your hard work and dedication to developing a solution is truly commendable.\n'
+    '\n'
+    'The plan you developed to address the issue with Re-ship and the following prerequisites: Stock check was effective in solving the problem. Your problem description: Weak carton and interim containment plan: Double box helped to prevent the issue from recurring. The root causes: Supplier change, permanent corrections: New spec, corrective actions: Re-pack stock and preventive measures: Audit cartons were well thought out and implemented.\n'
+    '\n'
+    'Again, congratulations on this achievement! Your hard work and dedication to continuous improvement is appreciated by both internal and external customers.\n'
+    '\n'
+    'Sincerely,\n'
+    '[Your Name]'
+)
+
+MULTILINE_REPORT = {
+    'issue': {
+        'what_happened': 'Line one\nLine two',
+        'when_happened': None,
+        'where_happened': 'Dock 4',
+        'expecting_to_happen': 'Intact box',
+    },
+    'plan': None,
+    'team': None,
+}
+
+MULTILINE_SCRUM = (
+    'A customer has an issue:\n'
+    '    - Line one\n'
+    '    Line two\n'
+    '      - When: None\n'
+    '      - Where: Dock 4\n'
+    '      - Expecting to happen: Intact box\n'
+    '      - Resolution request: Unknown\n'
+    '\n'
+    'A quick update on our progress.\n'
+    '\n'
+    "We haven't completed any steps yet. Let's get started with these first steps:\n"
+    '\n'
+    '    - We need to address the issue gifted to us by our dear customer.\n'
+    '       - Definition of complete: The issue has been acknowledged\n'
+    '    - We need to create a plan to address the issue.\n'
+    '       - Definition of complete: A plan has been created and approved to address the issue.\n'
+    '    - We need to assemble the team of people with product/process knowledge to carry out the plan.\n'
+    '       - Definition of complete: A team with the appropriate knowledge and skills has been assembled to carry out the plan.\n'
+    '\n'
+    "Let's focus on completing the missing steps. Here's a quick reminder of what we need to do:\n"
+    '\n'
+    '    - We need to address the issue gifted to us by our dear customer.\n'
+    '       - Definition of complete: The issue has been acknowledged\n'
+    'Find out why the issue is missing\n'
+    '    - We need to create a plan to address the issue.\n'
+    '       - Definition of complete: A plan has been created and approved to address the issue.\n'
+    '    - We need to assemble the team of people with product/process knowledge to carry out the plan.\n'
+    '       - Definition of complete: A team with the appropriate knowledge and skills has been assembled to carry out the plan.\n'
+)
+
+
+class TestReportTemplates(unittest.TestCase):
+    def test_scrum_report_for_completed_report_is_unchanged(self):
+        self.assertEqual(ReportGenerator(COMPLETE_REPORT).scrum_report(), COMPLETE_SCRUM)
+
+    def test_congrats_template_is_unchanged(self):
+        self.assertEqual(ReportGenerator.congrats_template(COMPLETE_REPORT), COMPLETE_CONGRATS)
+
+    def test_multiline_issue_values_keep_textwrap_indentation(self):
+        self.assertEqual(ReportGenerator(MULTILINE_REPORT).scrum_report(), MULTILINE_SCRUM)
+
+    def test_phrases_are_shared_not_rebuilt(self):
+        first = ReportGenerator(COMPLETE_REPORT)
+        second = ReportGenerator(MULTILINE_REPORT)
+        self.assertIs(first.phrases, second.phrases)
+
+
+if __name__ == '__main__':
+    unittest.main()
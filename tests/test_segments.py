@@ -0,0 +1,135 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+from eight_disciplines import analytics, segments
+from eight_disciplines.acme_customer_feedback import log_feedback
+from eight_disciplines.eventlog import feedback_event
+from eight_disciplines.eventquery import query_events
+from eight_disciplines.segments import SegmentedEventLog, iter_segment_events, iter_segment_lines, open_event_log, read_manifest
+from eight_disciplines.survey_tools import CustomerFeedback
+
+
+def _event(i, day):
+    return feedback_event(CustomerFeedback(feedback=f'feedback {i}', rating=i % 11), f'2025-01-{day:02d}T12:00:00+00:00')
+
+
+class TestSegmentedEventLog(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmpdir.name, 'events')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_size_rotation_and_compression_read_back_as_one_stream(self):
+        with SegmentedEventLog(self.directory, max_bytes=2000, batch_size=4) as log:
+            for i in range(100):
+                log.write(_event(i, 1 + i // 10))
+
+        entries = read_manifest(self.directory)['segments']
+        self.assertGreater(len(entries), 3)
+        sealed = [e for e in entries if e['sealed']]
+        self.assertTrue(all(e['name'].endswith('.jsonl.gz') for e in sealed))
+        self.assertEqual(sum(e['records'] for e in entries), 100)
+        self.assertFalse(any(name.endswith('.jsonl') and name != entries[-1]['name'] for name in os.listdir(self.directory)))
+
+        events = list(iter_segment_events(self.directory))
+        self.assertEqual([e['feedback']['feedback'] for e in events], [f'feedback {i}' for i in range(100)])
+
+    def test_time_range_skips_segments_without_opening_them(self):
+        with SegmentedEventLog(self.directory, compression='lzma') as log:
+            for day in (1, 2, 3):
+                for i in range(5):
+                    log.write(_event(i, day))
+                log.rotate()
+
+        entries = read_manifest(self.directory)['segments']
+        self.assertEqual([e['first'][:10] for e in entries if e['sealed']], ['2025-01-01', '2025-01-02', '2025-01-03'])
+
+        opened = []
+        real_open = segments._open_segment
+
+        def spy(path):
+            opened.append(os.path.basename(path))
+            return real_open(path)
+
+        with mock.patch.object(segments, '_open_segment', spy):
+            lines = list(iter_segment_lines(self.directory, '2025-01-02T00:00:00', '2025-01-02T23:59:59'))
+        self.assertEqual(len(lines), 5)
+        self.assertTrue(all(b'2025-01-02' in line for line in lines))
+        self.assertEqual(opened, [entries[1]['name'], entries[-1]['name']])
+
+    def test_event_readers_accept_a_segment_directory(self):
+        with SegmentedEventLog(self.directory, max_bytes=2000, batch_size=4, compression='gzip') as log:
+            for i in range(60):
+                log.write(_event(i, 1 + i // 10))
+        entries = read_manifest(self.directory)['segments']
+        self.assertTrue(any(e['name'].endswith('.jsonl.gz') for e in entries))
+
+        events = list(query_events(self.directory, '2025-01-02T00:00:00', '2025-01-03T23:59:59'))
+        self.assertEqual([e['feedback']['feedback'] for e in events], [f'feedback {i}' for i in range(10, 30)])
+
+        out = io.StringIO()
+        with redirect_stdout(out):
+            analytics.main(['--events', self.directory])
+        summary = json.loads(out.getvalue())
+        self.assertEqual(summary['events'], {'customer_feedback_submitted': 60})
+        self.assertEqual(summary['ratings']['count'], 60)
+
+    def test_reopen_continues_active_segment(self):
+        with SegmentedEventLog(self.directory, compression=None) as log:
+            log.write(_event(1, 1))
+        with SegmentedEventLog(self.directory, compression=None) as log:
+            log.write(_event(2, 2))
+        entries = read_manifest(self.directory)['segments']
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]['records'], 2)
+        self.assertEqual((entries[0]['first'][:10], entries[0]['last'][:10]), ('2025-01-01', '2025-01-02'))
+
+    def test_open_event_log_and_log_feedback_follow_the_path_kind(self):
+        with open_event_log(os.path.join(self.tmpdir.name, 'plain.jsonl')) as plain:
+            self.assertNotIsInstance(plain, SegmentedEventLog)
+        with mock.patch.dict(os.environ, {'ACME_FEEDBACK_LOG': self.directory + os.sep}):
+            log_feedback(CustomerFeedback(feedback='hello', rating=None))
+            log_feedback(CustomerFeedback(feedback='again', rating=3))
+        self.assertTrue(os.path.isfile(os.path.join(self.directory, 'manifest.json')))
+        events = [json.loads(line) for line in iter_segment_lines(self.directory)]
+        self.assertEqual([e['feedback']['feedback'] for e in events], ['hello', 'again'])
+
+
+    def test_age_rotation_counts_from_the_manifest_across_one_shot_writers(self):
+        env = {
+            'ACME_FEEDBACK_LOG': self.directory + os.sep,
+            'ACME_FEEDBACK_SEGMENT_AGE': '3600',
+            'ACME_FEEDBACK_SEGMENT_COMPRESSION': 'none',
+        }
+        with mock.patch.dict(os.environ, env):
+            log_feedback(CustomerFeedback(feedback='hello', rating=None))
+            log_feedback(CustomerFeedback(feedback='again', rating=3))
+            self.assertEqual(len(read_manifest(self.directory)['segments']), 1)
+
+            manifest = read_manifest(self.directory)
+            manifest['segments'][-1]['created'] -= 7200
+            segments._write_manifest(self.directory, manifest)
+            log_feedback(CustomerFeedback(feedback='late', rating=None))
+
+        entries = read_manifest(self.directory)['segments']
+        self.assertEqual([(e['sealed'], e['records']) for e in entries], [(True, 3), (False, 0)])
+        self.assertTrue(entries[0]['name'].endswith('.jsonl'))
+        self.assertGreater(entries[1]['created'], entries[0]['created'])
+
+    def test_segment_options_from_env(self):
+        self.assertEqual(segments.segment_options_from_env(), {})
+        env = {'ACME_FEEDBACK_SEGMENT_BYTES': '4096', 'ACME_FEEDBACK_SEGMENT_AGE': '60', 'ACME_FEEDBACK_SEGMENT_COMPRESSION': 'lzma'}
+        with mock.patch.dict(os.environ, env), open_event_log(self.directory + os.sep, batch_size=1) as log:
+            self.assertEqual((log.max_bytes, log.max_age, log.compression), (4096, 60.0, 'lzma'))
+        with mock.patch.dict(os.environ, env), open_event_log(self.directory, compression=None) as log:
+            self.assertIsNone(log.compression)
+
+if __name__ == '__main__':
+    unittest.main()
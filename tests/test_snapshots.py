@@ -0,0 +1,175 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from argparse import Namespace
+from contextlib import redirect_stderr, redirect_stdout
+
+from eight_disciplines.acme_customer_feedback import (
+    EightDisciplines,
+    compute_workflow_status,
+    customer_service_chatbot,
+    run_batch,
+    step_order,
+    step_prereqs,
+)
+from eight_disciplines.snapshots import NO_ISSUE_KEY_ERROR, ReportSnapshotStore, has_transitions, issue_key, render_delta, status_delta
+from eight_disciplines.synthetic import synthetic_defaults
+
+ORDER = step_order(EightDisciplines(None))
+PREREQS = step_prereqs()
+
+ISSUE = {
+    'what_happened': 'Package arrived damaged',
+    'when_happened': '2025-01-10',
+    'where_happened': 'Front porch',
+    'expecting_to_happen': 'Package should be intact',
+}
+
+
+def _report(**steps):
+    report = dict.fromkeys(ORDER[1:])
+    report['issue'] = dict(ISSUE)
+    report.update(steps)
+    return report
+
+
+def _status(report):
+    return compute_workflow_status(report, ORDER, PREREQS)
+
+
+class TestStatusDelta(unittest.TestCase):
+    def test_first_run_counts_as_nothing_done(self):
+        report = _report(plan='Replace item')
+        delta = status_delta(None, report, _status(report))
+        self.assertTrue(delta['first_run'])
+        self.assertEqual(delta['newly_done'], ['issue', 'plan'])
+        self.assertEqual(delta['newly_unblocked'], _status(report)['available'])
+        self.assertEqual(delta['reopened'], [])
+
+    def test_transitions(self):
+        before = _report(plan='Replace item', team=['Alex'])
+        after = _report(plan='Replace the item', team=['Alex'], prerequisites='Stock check')
+        delta = status_delta((before, _status(before)), after, _status(after))
+        self.assertFalse(delta['first_run'])
+        self.assertEqual(delta['newly_done'], ['prerequisites'])
+        self.assertEqual(delta['updated'], ['plan'])
+        after_status = _status(after)
+        self.assertEqual(delta['newly_unblocked'], [s for s in after_status['available'] if s not in _status(before)['available']])
+
+        reopened = _report(team=['Alex'])
+        delta = status_delta((before, _status(before)), reopened, _status(reopened))
+        self.assertEqual(delta['reopened'], ['plan'])
+        self.assertIn('plan', _status(reopened)['available'])
+        self.assertNotIn('plan', delta['newly_unblocked'])
+
+    def test_render(self):
+        report = _report(plan='Replace item')
+        text = render_delta(status_delta(None, report, _status(report)))
+        self.assertTrue(text.startswith('First run for this issue:\nNewly done:\n- issue\n- plan'))
+        self.assertEqual(render_delta(None), 'No changes since the last run.')
+
+
+class TestReportSnapshotStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'snapshots.db')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_record_returns_delta_only_on_change(self):
+        report = _report(plan='Replace item')
+        with ReportSnapshotStore(self.path) as store:
+            self.assertTrue(store.record('k', report, _status(report))['first_run'])
+            self.assertIsNone(store.record('k', report, _status(report)))
+            self.assertEqual(store.get('k'), (report, _status(report)))
+        changed = _report(plan='Replace item', team=['Alex'])
+        with ReportSnapshotStore(self.path) as store:
+            delta = store.record('k', changed, _status(changed))
+            self.assertEqual(delta['issue_key'], 'k')
+            self.assertEqual(delta['newly_done'], ['team'])
+            self.assertEqual(store.count(), 1)
+
+    def test_issue_key(self):
+        defaults = dict(ISSUE, email='sam@example.com', plan='x')
+        self.assertEqual(issue_key(defaults), issue_key(dict(ISSUE, email='sam@example.com', team='y')))
+        self.assertNotEqual(issue_key(defaults), issue_key(dict(defaults, email='kim@example.com')))
+        self.assertNotEqual(issue_key(defaults), issue_key(dict(defaults, where_happened='Garage')))
+        self.assertIsNone(issue_key({'plan': 'x', 'email': '', 'what_happened': None}))
+        self.assertIsNotNone(issue_key({'name': 'Sam'}))
+        self.assertIsNotNone(issue_key({'when_happened': '2025-01-10'}))
+
+    def test_batch_reports_documents_without_a_key(self):
+        keyless = {'plan': 'Replace item'}
+        source = '\n'.join(json.dumps(d) for d in (keyless, dict(ISSUE, plan='x'), keyless)) + '\n'
+        with ReportSnapshotStore(self.path) as store:
+            out = io.StringIO()
+            self.assertEqual(run_batch(io.StringIO(source), out, snapshots=store), 3)
+            self.assertEqual(store.count(), 1)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([line.get('line') for line in lines], [1, None, 3])
+        self.assertIn('error', lines[2])
+
+    def test_batch_emits_only_changed_issues(self):
+        documents = list(synthetic_defaults(40, seed=12))
+        source = '\n'.join(json.dumps(d) for d in documents) + '\n'
+        with ReportSnapshotStore(self.path) as store:
+            out = io.StringIO()
+            self.assertEqual(run_batch(io.StringIO(source), out, snapshots=store), 40)
+            first = [json.loads(line) for line in out.getvalue().splitlines()]
+            self.assertTrue(first and all(d['first_run'] for d in first))
+
+            out = io.StringIO()
+            run_batch(io.StringIO(source), out, snapshots=store)
+            self.assertEqual(out.getvalue(), '')
+
+            documents[3]['preventive_measures'] = 'Train the couriers'
+            source = '\n'.join(json.dumps(d) for d in documents) + '\n{bad\n'
+            out = io.StringIO()
+            run_batch(io.StringIO(source), out, snapshots=store)
+            lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[0]['issue_key'], issue_key(documents[3]))
+        self.assertTrue(has_transitions(lines[0]))
+        self.assertEqual(lines[1]['line'], 41)
+
+    def test_single_run_delta(self):
+        defaults_file = os.path.join(self.tmpdir.name, 'defaults.json')
+        with open(defaults_file, 'w', encoding='utf-8') as fh:
+            json.dump(dict(ISSUE, plan='Replace item'), fh)
+        os.environ['ACME_FEEDBACK_LOG'] = os.path.join(self.tmpdir.name, 'feedback.jsonl')
+        try:
+            outputs = []
+            for output_format in ('scrum', 'scrum', 'json'):
+                args = Namespace(use_defaults=False, non_interactive=True, format=output_format, defaults_file=defaults_file, delta=self.path)
+                out = io.StringIO()
+                with redirect_stdout(out):
+                    customer_service_chatbot(args)
+                outputs.append(out.getvalue())
+        finally:
+            del os.environ['ACME_FEEDBACK_LOG']
+        self.assertTrue(outputs[0].startswith('First run for this issue:\n'))
+        self.assertEqual(outputs[1:], ['No changes since the last run.\n', ''])
+
+
+    def test_single_run_delta_without_a_key_fails(self):
+        defaults_file = os.path.join(self.tmpdir.name, 'defaults.json')
+        with open(defaults_file, 'w', encoding='utf-8') as fh:
+            json.dump({'plan': 'Replace item'}, fh)
+        args = Namespace(use_defaults=False, non_interactive=True, format='json', defaults_file=defaults_file, delta=self.path)
+        os.environ['ACME_FEEDBACK_LOG'] = os.path.join(self.tmpdir.name, 'feedback.jsonl')
+        try:
+            with redirect_stdout(io.StringIO()) as out, redirect_stderr(io.StringIO()) as err, self.assertRaises(SystemExit) as raised:
+                customer_service_chatbot(args)
+        finally:
+            del os.environ['ACME_FEEDBACK_LOG']
+        self.assertEqual(raised.exception.code, 2)
+        self.assertEqual(out.getvalue(), '')
+        self.assertIn(NO_ISSUE_KEY_ERROR, err.getvalue())
+        with ReportSnapshotStore(self.path) as store:
+            self.assertEqual(store.count(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
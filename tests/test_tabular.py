@@ -0,0 +1,129 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+from argparse import Namespace
+from contextlib import redirect_stdout
+
+from eight_disciplines.acme_customer_feedback import (
+    EightDisciplines,
+    customer_service_chatbot,
+    evaluate_defaults,
+    run_batch,
+    step_order,
+)
+from eight_disciplines.synthetic import synthetic_defaults
+from eight_disciplines.tabular import ISSUE_FIELDS, StatusRowEncoder, StatusRowWriter
+
+ORDER = step_order(EightDisciplines(None))
+
+
+class TestStatusRowEncoder(unittest.TestCase):
+    def setUp(self):
+        self.encoder = StatusRowEncoder(ORDER)
+        self.payloads = [evaluate_defaults(d) for d in synthetic_defaults(300, seed=8)]
+
+    def test_columns_follow_step_order(self):
+        columns = self.encoder.columns
+        self.assertEqual(columns[:2], ('feedback_submitted', 'doing_step'))
+        self.assertEqual(columns[2:2 + len(ISSUE_FIELDS)], tuple(f'issue_{f}' for f in ISSUE_FIELDS))
+        self.assertEqual(columns[-len(ORDER):], tuple(f'{step}_status' for step in ORDER))
+        self.assertEqual(len(set(columns)), len(columns))
+
+    def test_ndjson_is_compact_json_of_values(self):
+        for payload in self.payloads:
+            line = self.encoder.ndjson(payload)
+            row = dict(zip(self.encoder.columns, self.encoder.values(payload)))
+            self.assertEqual(line, json.dumps(row, separators=(',', ':')))
+            self.assertEqual(list(json.loads(line)), list(self.encoder.columns))
+
+    def test_states_match_status_lists(self):
+        for payload in self.payloads:
+            states = dict(zip(ORDER, self.encoder.states(payload)))
+            self.assertEqual([s for s in ORDER if states[s] == 'done'], sorted(payload['done_steps'], key=ORDER.index))
+            self.assertEqual(
+                {s for s in ORDER if states[s] == 'available'},
+                set(payload['available_steps']) - set(payload['done_steps']),
+            )
+
+    def test_csv_round_trips_through_reader(self):
+        out = io.StringIO()
+        StatusRowWriter(out, 'csv', ORDER).write_many(self.payloads)
+        rows = list(csv.reader(io.StringIO(out.getvalue())))
+        self.assertEqual(tuple(rows[0]), self.encoder.columns)
+        self.assertEqual(len(rows), len(self.payloads) + 1)
+        for row, payload in zip(rows[1:], self.payloads):
+            expected = []
+            for value in self.encoder.values(payload):
+                if isinstance(value, bool):
+                    value = 'true' if value else 'false'
+                elif isinstance(value, (list, dict)):
+                    value = json.dumps(value, separators=(',', ':'))
+                expected.append('' if value is None else value)
+            self.assertEqual(row, expected)
+
+    def test_unusual_values(self):
+        payload = evaluate_defaults(dict(next(synthetic_defaults(1, seed=9)), team=['Zoë, "Z"', 'Ann\nB'], plan=3))
+        line = self.encoder.ndjson(payload)
+        self.assertEqual(json.loads(line)['team'], ['Zoë, "Z"', 'Ann\nB'])
+        self.assertEqual(line, json.dumps(dict(zip(self.encoder.columns, self.encoder.values(payload))), separators=(',', ':')))
+        out = io.StringIO()
+        StatusRowWriter(out, 'csv', ORDER).write(payload)
+        row = list(csv.reader(io.StringIO(out.getvalue())))[1]
+        self.assertEqual(json.loads(row[self.encoder.columns.index('team')]), ['Zoë, "Z"', 'Ann\nB'])
+
+    def test_csv_quotes_line_breaks_in_free_text(self):
+        defaults = dict(next(synthetic_defaults(1, seed=9)), what_happened='line1\nline2', where_happened='a\rb "c"')
+        payload = evaluate_defaults(defaults)
+        out = io.StringIO(newline='')
+        StatusRowWriter(out, 'csv', ORDER).write_many([payload, payload])
+        rows = list(csv.reader(io.StringIO(out.getvalue(), newline='')))
+        self.assertEqual(len(rows), 3)
+        self.assertTrue(all(len(row) == len(self.encoder.columns) for row in rows))
+        self.assertEqual(rows[1][self.encoder.columns.index('issue_what_happened')], 'line1\nline2')
+        self.assertEqual(rows[2][self.encoder.columns.index('issue_where_happened')], 'a\rb "c"')
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            StatusRowWriter(io.StringIO(), 'json', ORDER)
+
+
+class TestRowOutput(unittest.TestCase):
+    def test_batch_rows_and_errors(self):
+        documents = list(synthetic_defaults(5, seed=10))
+        source = '\n'.join([json.dumps(d) for d in documents] + ['{not json', '']) + '\n'
+        encoder = StatusRowEncoder(ORDER)
+        for row_format in ('ndjson', 'csv'):
+            out, errors = io.StringIO(), io.StringIO()
+            self.assertEqual(run_batch(io.StringIO(source), out, chunk_size=2, row_format=row_format, errors=errors), 6)
+            self.assertEqual(json.loads(errors.getvalue())['line'], 6)
+            lines = out.getvalue().splitlines()
+            if row_format == 'csv':
+                self.assertEqual(lines[0], ','.join(encoder.columns))
+                lines = lines[1:]
+            self.assertEqual(len(lines), 5)
+        self.assertEqual(lines[0].split(',')[-1], encoder.states(evaluate_defaults(documents[0]))[-1])
+
+    def test_single_run_matches_batch_row(self):
+        defaults = next(synthetic_defaults(1, seed=11))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            defaults_file = os.path.join(tmpdir, 'defaults.json')
+            with open(defaults_file, 'w', encoding='utf-8') as fh:
+                json.dump(defaults, fh)
+            os.environ['ACME_FEEDBACK_LOG'] = os.path.join(tmpdir, 'feedback.jsonl')
+            try:
+                args = Namespace(use_defaults=False, non_interactive=True, format='ndjson', defaults_file=defaults_file)
+                out = io.StringIO()
+                with redirect_stdout(out):
+                    customer_service_chatbot(args)
+            finally:
+                del os.environ['ACME_FEEDBACK_LOG']
+        batch = io.StringIO()
+        run_batch(io.StringIO(json.dumps(defaults) + '\n'), batch, row_format='ndjson')
+        self.assertEqual(out.getvalue(), batch.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
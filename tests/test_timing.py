@@ -0,0 +1,63 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from argparse import Namespace
+from contextlib import redirect_stdout
+
+from eight_disciplines import timing
+from eight_disciplines.acme_customer_feedback import customer_service_chatbot, run_batch
+
+COMPLETE_ISSUE = {
+    'what_happened': 'Package arrived damaged',
+    'when_happened': '2025-01-10',
+    'where_happened': 'Front porch',
+    'expecting_to_happen': 'Package should be intact',
+}
+
+
+class TestTimingSpans(unittest.TestCase):
+    def tearDown(self):
+        timing.disable()
+
+    def test_disabled_spans_are_shared_no_ops(self):
+        self.assertIsNone(timing.active())
+        self.assertIs(timing.span('a'), timing.span('b'))
+        with timing.span('a'):
+            pass
+
+    def test_spans_accumulate_per_stage(self):
+        timings = timing.enable()
+        for _ in range(3):
+            with timing.span('stage'):
+                sum(range(1000))
+        stage = timings.as_dict()['stages']['stage']
+        self.assertEqual(stage['count'], 3)
+        self.assertGreater(stage['wall_seconds'], 0)
+        self.assertGreaterEqual(stage['cpu_seconds'], 0)
+
+    def test_chatbot_stages_are_dumped_to_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            defaults_file = os.path.join(tmpdir, 'defaults.json')
+            with open(defaults_file, 'w', encoding='utf-8') as fh:
+                json.dump(COMPLETE_ISSUE, fh)
+            os.environ['ACME_FEEDBACK_LOG'] = os.path.join(tmpdir, 'feedback.jsonl')
+            target = os.path.join(tmpdir, 'timings.json')
+            args = Namespace(use_defaults=False, non_interactive=True, format='plain', defaults_file=defaults_file)
+            with timing.record_timings(target), redirect_stdout(io.StringIO()):
+                customer_service_chatbot(args)
+                run_batch(io.StringIO(json.dumps(COMPLETE_ISSUE) + '\n'), io.StringIO())
+            with open(target, 'r', encoding='utf-8') as fh:
+                stages = json.load(fh)['stages']
+
+        self.assertIsNone(timing.active())
+        for name in ('load_defaults', 'log_feedback', 'save_defaults', 'render', 'batch.parse', 'batch.write'):
+            self.assertEqual(stages[name]['count'], 1, name)
+        # Once for the single run, once for the batch line.
+        self.assertEqual(stages['build_report']['count'], 2)
+        self.assertEqual(stages['compute_workflow_status']['count'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import random
+import unittest
+
+from eight_disciplines.acme_customer_feedback import (
+    EightDisciplines,
+    compute_workflow_status,
+    step_order,
+    step_prereqs,
+    workflow_graph,
+)
+from eight_disciplines.workflow import WorkflowGraph
+
+ISSUE_FIELDS = ['what_happened', 'when_happened', 'where_happened', 'expecting_to_happen', 'resolution_request']
+
+
+def _random_value(rng, step):
+    if step == 'issue':
+        return {k: rng.choice([None, 'x']) for k in ISSUE_FIELDS}
+    return rng.choice([None, 'value', {'a': None}, ['Alex']])
+
+
+class TestWorkflowGraph(unittest.TestCase):
+    def test_topological_order_respects_prereqs(self):
+        graph = workflow_graph()
+        position = {step: i for i, step in enumerate(graph.topological_order)}
+        for step, reqs in step_prereqs().items():
+            for req in reqs:
+                if req != step:
+                    self.assertLess(position[req], position[step])
+
+    def test_cycles_are_rejected(self):
+        with self.assertRaises(ValueError):
+            WorkflowGraph(['a', 'b'], {'a': ['b'], 'b': ['a']})
+
+    def test_incremental_updates_match_full_recompute(self):
+        rng = random.Random(42)
+        graph = workflow_graph()
+        order = step_order(EightDisciplines(None))
+        prereqs = step_prereqs()
+        for _ in range(50):
+            report = {step: _random_value(rng, step) for step in order}
+            state = graph.track(report)
+            self.assertEqual(state.as_status(), compute_workflow_status(report, order, prereqs))
+            for _ in range(20):
+                step = rng.choice(order)
+                report[step] = _random_value(rng, step)
+                state.update(step, report[step])
+                expected = compute_workflow_status(report, order, prereqs)
+                self.assertEqual(state.as_status(), expected)
+                self.assertEqual(state.doing, expected['doing'])
+
+    def test_membership_queries(self):
+        graph = workflow_graph()
+        state = graph.track({'issue': {k: 'x' for k in ISSUE_FIELDS}, 'plan': None, 'prerequisites': None})
+        self.assertTrue(state.is_done('issue'))
+        self.assertTrue(state.is_available('plan'))
+        self.assertTrue(state.is_blocked('prerequisites'))
+        self.assertEqual(state.doing, 'plan')
+
+        state.update('plan', 'Ship a replacement')
+        self.assertEqual(state.doing, 'prerequisites')
+
+    def test_progress_bits_decode_to_compute_workflow_status(self):
+        rng = random.Random(7)
+        graph = workflow_graph()
+        order = step_order(EightDisciplines(None))
+        prereqs = step_prereqs()
+        reports = [{step: _random_value(rng, step) for step in order} for _ in range(200)]
+        progress = graph.encode_many(reports)
+        self.assertEqual(progress.typecode, 'H')
+        for report, done in zip(reports, progress):
+            self.assertEqual(graph.decode(done), compute_workflow_status(report, order, prereqs))
+        for done, available in zip(progress, graph.available_many(progress)):
+            self.assertEqual(available, graph.available_mask(done))
+
+        partial = {'issue': {k: 'x' for k in ISSUE_FIELDS}, 'plan': None, 'root_causes': 'x'}
+        self.assertEqual(
+            graph.decode(graph.encode(partial), graph.present_mask(partial)),
+            compute_workflow_status(partial, order, prereqs),
+        )
+
+    def test_lookup_table_is_bounded(self):
+        graph = WorkflowGraph([f's{i}' for i in range(20)], {})
+        with self.assertRaises(ValueError):
+            graph.build_lookup_table()
+        self.assertEqual(graph.typecode, 'I')
+        self.assertEqual(graph.available_many([0, 1]).tolist(), [graph.all_mask, graph.all_mask - 1])
+
+
+if __name__ == '__main__':
+    unittest.main()